@@ -0,0 +1,191 @@
+"""
+Compares HTTP/1.1 connection pooling with HTTP/2 multiplexing under fan-out.
+
+A local stand-in for api.spotify.com answers every request after a fixed
+latency and charges each new connection a handshake delay (standing in for
+the TCP and TLS round trips to the real API). It speaks HTTP/1.1 and, with
+prior knowledge, HTTP/2 over cleartext, so no certificates are needed.
+
+    pip install "spotipy[http2]"
+    python benchmarks/http2_transport.py --requests 500 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import h2.config
+import h2.connection
+import h2.events
+import h2.settings
+import httpx
+
+import spotipy
+from spotipy.transport import AsyncHTTPXTransport, HTTPXTransport
+
+H2_PREFACE = b"PRI * HTTP/2.0\r\n\r\nSM\r\n\r\n"
+BODY = json.dumps({"id": "abc", "name": "stand-in track"}).encode()
+
+
+class StandInServer:
+    """ Serves canned responses over HTTP/1.1 and HTTP/2 and counts the
+        connections clients open.
+    """
+
+    def __init__(self, latency, handshake):
+        self.latency = latency
+        self.handshake = handshake
+        self.connections = 0
+        self.loop = asyncio.new_event_loop()
+        self.server = self.loop.run_until_complete(
+            asyncio.start_server(self._handle, "127.0.0.1", 0)
+        )
+        port = self.server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}/v1/"
+        threading.Thread(target=self.loop.run_forever, daemon=True).start()
+
+    def close(self):
+        self.loop.call_soon_threadsafe(self.server.close)
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        await asyncio.sleep(self.handshake)
+        try:
+            head = await reader.readexactly(len(H2_PREFACE))
+            if head == H2_PREFACE:
+                await self._serve_h2(head, reader, writer)
+            else:
+                await self._serve_h1(head, reader, writer)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _serve_h1(self, buffer, reader, writer):
+        while True:
+            while b"\r\n\r\n" not in buffer:
+                data = await reader.read(65535)
+                if not data:
+                    return
+                buffer += data
+            _, buffer = buffer.split(b"\r\n\r\n", 1)
+            await asyncio.sleep(self.latency)
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                b"Content-Length: %d\r\n\r\n%s" % (len(BODY), BODY)
+            )
+            await writer.drain()
+
+    async def _serve_h2(self, preface, reader, writer):
+        conn = h2.connection.H2Connection(
+            config=h2.config.H2Configuration(client_side=False)
+        )
+        conn.initiate_connection()
+        conn.update_settings({h2.settings.SettingCodes.MAX_CONCURRENT_STREAMS: 100})
+        data = preface
+        while data:
+            for event in conn.receive_data(data):
+                if isinstance(event, h2.events.RequestReceived):
+                    asyncio.ensure_future(self._respond_h2(conn, writer, event.stream_id))
+                elif isinstance(event, h2.events.ConnectionTerminated):
+                    return
+            writer.write(conn.data_to_send())
+            await writer.drain()
+            data = await reader.read(65535)
+
+    async def _respond_h2(self, conn, writer, stream_id):
+        await asyncio.sleep(self.latency)
+        conn.send_headers(stream_id, [
+            (":status", "200"),
+            ("content-type", "application/json"),
+            ("content-length", str(len(BODY))),
+        ])
+        conn.send_data(stream_id, BODY, end_stream=True)
+        writer.write(conn.data_to_send())
+
+
+def _report(name, server, elapsed, latencies):
+    latencies.sort()
+    print(
+        f"{name:<32} {server.connections:>11} {elapsed:>9.2f} "
+        f"{statistics.median(latencies) * 1000:>9.1f} "
+        f"{latencies[int(len(latencies) * 0.95)] * 1000:>9.1f}"
+    )
+
+
+def run_sync(name, server, sp, args):
+    def call(_):
+        start = time.perf_counter()
+        sp.track("abc")
+        return time.perf_counter() - start
+
+    server.connections = 0
+    start = time.perf_counter()
+    with ThreadPoolExecutor(args.concurrency) as executor:
+        latencies = list(executor.map(call, range(args.requests)))
+    _report(name, server, time.perf_counter() - start, latencies)
+    sp._transport.close()
+
+
+def run_async(name, server, sp, args):
+    async def main():
+        semaphore = asyncio.Semaphore(args.concurrency)
+
+        async def call():
+            async with semaphore:
+                start = time.perf_counter()
+                await sp.track("abc")
+                return time.perf_counter() - start
+
+        async with sp:
+            return await asyncio.gather(*(call() for _ in range(args.requests)))
+
+    server.connections = 0
+    start = time.perf_counter()
+    latencies = asyncio.run(main())
+    _report(name, server, time.perf_counter() - start, list(latencies))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=20,
+                        help="time the stand-in takes to answer a request")
+    parser.add_argument("--handshake-ms", type=float, default=30,
+                        help="delay charged to every new connection")
+    args = parser.parse_args()
+
+    # the requests adapter warns about every connection it cannot keep
+    logging.getLogger("urllib3").setLevel(logging.ERROR)
+    server = StandInServer(args.latency_ms / 1000, args.handshake_ms / 1000)
+
+    def make(cls, **kwargs):
+        sp = cls(auth="TOKEN", **kwargs)
+        sp.prefix = server.url
+        return sp
+
+    print(f"{args.requests} requests, {args.concurrency} in flight, "
+          f"{args.latency_ms:g} ms latency, {args.handshake_ms:g} ms per handshake\n")
+    print(f"{'client':<32} {'connections':>11} {'total s':>9} {'p50 ms':>9} {'p95 ms':>9}")
+    run_sync("Spotify, requests (HTTP/1.1)", server, make(spotipy.Spotify), args)
+    run_sync("Spotify, httpx HTTP/2", server, make(
+        spotipy.Spotify,
+        # prior knowledge, as the stand-in has no TLS to negotiate HTTP/2 with
+        transport=HTTPXTransport(client=httpx.Client(http1=False, http2=True)),
+    ), args)
+    run_async("AsyncSpotify, httpx (HTTP/1.1)", server, make(spotipy.AsyncSpotify), args)
+    run_async("AsyncSpotify, httpx HTTP/2", server, make(
+        spotipy.AsyncSpotify,
+        transport=AsyncHTTPXTransport(client=httpx.AsyncClient(http1=False, http2=True)),
+    ), args)
+    server.close()
+
+
+if __name__ == "__main__":
+    main()
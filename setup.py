@@ -8,14 +8,36 @@ memcache_cache_reqs = [
 ]
 
 extra_reqs = {
+    'async': [
+        'aiofiles>=23.1.0',
+        'httpx>=0.24.0'
+    ],
+    'httpx': [
+        'httpx>=0.24.0'
+    ],
+    'http2': [
+        'httpx[http2]>=0.24.0'
+    ],
+    'orjson': [
+        'orjson>=3.9.0'
+    ],
+    'zstd': [
+        'zstandard>=0.21.0'
+    ],
     'memcache': [
         'pymemcache>=3.5.2'
     ],
     'test': [
+        'aiofiles>=23.1.0',
         'autopep8>=2.3.2',
+        'fakeredis[lua]>=2.20.0',
         'flake8>=7.3.0',
         'flake8-use-fstring>=1.4',
-        'isort>=7.0.0'
+        'httpx[http2]>=0.24.0',
+        'isort>=7.0.0',
+        'msgspec>=0.18.0',
+        'orjson>=3.9.0',
+        'zstandard>=0.21.0'
     ]
 }
 
@@ -1,5 +1,17 @@
+from .async_client import *  # noqa
+from .async_oauth2 import *  # noqa
 from .cache_handler import *  # noqa
+from .circuit_breaker import *  # noqa
 from .client import *  # noqa
+from .codec import *  # noqa
+from .concurrency import *  # noqa
 from .exceptions import *  # noqa
+from .hedging import *  # noqa
 from .oauth2 import *  # noqa
+from .pagination import *  # noqa
+from .rate_limit import *  # noqa
+from .response_cache import *  # noqa
+from .scheduling import *  # noqa
+from .timeouts import *  # noqa
+from .transport import *  # noqa
 from .util import *  # noqa
@@ -0,0 +1,468 @@
+""" An asyncio flavour of the Spotify Web API client """
+
+__all__ = ["AsyncSpotify"]
+
+import asyncio
+import contextlib
+import logging
+import time
+
+from spotipy import pagination
+from spotipy.client import Spotify
+from spotipy.concurrency import (AsyncAdaptiveConcurrency, AsyncBatcher,
+                                 AsyncSingleFlight)
+from spotipy.exceptions import SpotifyDeadlineExceededError, SpotifyException
+from spotipy.transport import AsyncHTTPXTransport
+from spotipy.util import resolve_awaitable
+
+logger = logging.getLogger(__name__)
+
+
+@contextlib.asynccontextmanager
+async def _no_limit():
+    yield
+
+
+class AsyncSpotify(Spotify):
+    """
+        Non-blocking client with the same method surface as `Spotify`.
+        Every API method returns an awaitable, so many calls can be in
+        flight on a single event loop. Requires `httpx`
+        (``pip install "spotipy[async]"``).
+
+        Example usage::
+
+            import asyncio
+            import spotipy
+
+            async def main():
+                async with spotipy.AsyncSpotify(auth_manager=...) as sp:
+                    artists = await asyncio.gather(
+                        sp.artist('spotify:artist:3jOstUTkEu2JkjvRdBA5Gu'),
+                        sp.artist('spotify:artist:36QJpDe2go2KgaRleHCDTp'),
+                    )
+                    print(artists)
+
+            asyncio.run(main())
+    """
+
+    def __init__(
+        self,
+        auth=None,
+        requests_session=True,
+        client_credentials_manager=None,
+        oauth_manager=None,
+        auth_manager=None,
+        proxies=None,
+        requests_timeout=5,
+        status_forcelist=None,
+        retries=Spotify.max_retries,
+        status_retries=Spotify.max_retries,
+        backoff_factor=0.3,
+        language=None,
+        transport=None,
+        codec=None,
+        etag_cache=None,
+        response_cache=None,
+        single_flight=False,
+        batch_window=None,
+        rate_limiter=None,
+        adaptive_concurrency=None,
+        scheduler=None,
+        lane=None,
+        tenant=None,
+        deadline=None,
+        adaptive_timeout=None,
+        circuit_breakers=None,
+        hedging=None,
+    ):
+        """
+        Creates an asynchronous Spotify API client.
+
+        :param auth: An access token (optional)
+        :param requests_session:
+            An `httpx.AsyncClient` object or a truthy value to create one.
+            The client is used as a connection pool for all requests.
+        :param client_credentials_manager:
+            SpotifyClientCredentials object
+        :param oauth_manager:
+            SpotifyOAuth object
+        :param auth_manager:
+            SpotifyOauth, SpotifyClientCredentials,
+            or SpotifyImplicitGrant object
+        :param proxies:
+            Definition of proxies (optional), in the same format as for `Spotify`
+        :param requests_timeout:
+            Stop waiting for a response after a given number of seconds
+        :param status_forcelist:
+            Tell the client what type of status codes retries should occur on
+        :param retries:
+            Total number of retries to allow
+        :param status_retries:
+            Number of times to retry on bad status codes
+        :param backoff_factor:
+            A backoff factor to apply between attempts after the second try
+        :param language:
+            The language parameter advertises what language the user prefers to see.
+            See ISO-639-1 language code: https://en.wikipedia.org/wiki/List_of_ISO_639-1_codes
+        :param transport:
+            A `spotipy.transport.AsyncTransport` to send requests with (optional).
+            Takes precedence over `requests_session`.
+        :param codec:
+            The JSON codec for responses and payloads, as for `Spotify`
+        :param etag_cache:
+            A `spotipy.response_cache.ETagCache` (optional), as for `Spotify`
+        :param response_cache:
+            A `spotipy.response_cache.ResponseCache` (optional), as for
+            `Spotify`. Its lookups are awaited if they return awaitables, as
+            those of `spotipy.response_cache.AsyncRedisResponseCache` do.
+        :param single_flight:
+            If True, concurrent identical GET requests share a single call to
+            the API and its result or exception. A
+            `spotipy.concurrency.AsyncSingleFlight` may be passed to share
+            calls between clients.
+        :param batch_window:
+            If set, `track`, `artist`, `album` and `episode` calls made within
+            this many seconds are batched into requests for several entities
+            (optional). With 0, the calls made in the same turn of the event
+            loop are batched, e.g. those of a single `asyncio.gather`.
+        :param rate_limiter:
+            A `spotipy.rate_limit.RateLimiter` (optional), as for `Spotify`.
+            Requests wait for it without blocking the event loop.
+        :param adaptive_concurrency:
+            If True, the number of requests in flight is limited and the
+            limit adapted to the responses, as for `Spotify`. A
+            `spotipy.concurrency.AsyncAdaptiveConcurrency` may be passed
+            instead.
+        :param scheduler:
+            A `spotipy.scheduling.AsyncPriorityScheduler` (optional), as
+            for `Spotify`
+        :param lane:
+            The scheduler lane of the requests of this client, as for
+            `Spotify`
+        :param tenant:
+            The tenant the requests of this client are made for, as for
+            `Spotify`
+        :param deadline:
+            The most seconds a request may take in all, including retries
+            and the waits between them, as for `Spotify`
+        :param adaptive_timeout:
+            Adapt the timeout of each attempt to the latencies observed for
+            its endpoint, as for `Spotify`
+        :param circuit_breakers:
+            Fail requests to an endpoint family fast while too many of its
+            recent requests failed, as for `Spotify`
+        :param hedging:
+            Send slow GET requests again and use the first response, as for
+            `Spotify`. The other request is cancelled.
+        """
+        if transport is None:
+            if requests_session and requests_session is not True:
+                transport = AsyncHTTPXTransport(requests_session)
+            else:
+                # failed connections and bad status codes are retried by
+                # `_send`, within the deadline, as in `Spotify`
+                transport = AsyncHTTPXTransport(proxies=proxies)
+        super().__init__(
+            auth=auth,
+            requests_session=False,
+            client_credentials_manager=client_credentials_manager,
+            oauth_manager=oauth_manager,
+            auth_manager=auth_manager,
+            proxies=proxies,
+            requests_timeout=requests_timeout,
+            status_forcelist=status_forcelist,
+            retries=retries,
+            status_retries=status_retries,
+            backoff_factor=backoff_factor,
+            language=language,
+            transport=transport,
+            codec=codec,
+            etag_cache=etag_cache,
+            response_cache=response_cache,
+            rate_limiter=rate_limiter,
+            single_flight=AsyncSingleFlight() if single_flight is True else single_flight,
+            adaptive_concurrency=(
+                AsyncAdaptiveConcurrency(initial=self.max_concurrent_chunks)
+                if adaptive_concurrency is True else adaptive_concurrency
+            ),
+            scheduler=scheduler,
+            lane=lane,
+            tenant=tenant,
+            deadline=deadline,
+            adaptive_timeout=adaptive_timeout,
+            circuit_breakers=circuit_breakers,
+            hedging=hedging,
+        )
+        self.batcher = None if batch_window is None else AsyncBatcher(batch_window)
+
+    async def close(self):
+        """ Closes the underlying connection pool """
+        await self._transport.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    def _then(self, result, callback):
+        async def chain():
+            return callback(await result)
+        return chain()
+
+    def _completed(self, value):
+        async def completed():
+            return value
+        return completed()
+
+    async def _map_chunks(self, fetch, chunks, max_workers=None):
+        semaphore = asyncio.Semaphore(self._chunk_workers(max_workers))
+
+        async def run(chunk):
+            async with semaphore:
+                return await fetch(chunk)
+
+        return await asyncio.gather(*(run(chunk) for chunk in chunks))
+
+    async def _drive(self, steps):
+        try:
+            call = next(steps)
+            while True:
+                call = steps.send(await resolve_awaitable(call()))
+        except StopIteration as stop:
+            return stop.value
+
+    async def _auth_headers(self):
+        if self._auth:
+            return {"Authorization": f"Bearer {self._auth}"}
+        if not self.auth_manager:
+            return {}
+        try:
+            token = self.auth_manager.get_access_token(as_dict=False)
+        except TypeError:
+            token = self.auth_manager.get_access_token()
+        # asynchronous auth managers (see `spotipy.async_oauth2`) return
+        # an awaitable, synchronous ones the token itself
+        token = await resolve_awaitable(token)
+        return {"Authorization": f"Bearer {token}"}
+
+    def _admission(self):
+        if self.scheduler is None:
+            return _no_limit()
+        return super()._admission()
+
+    async def _attempt(self, method, url, headers, args, endpoint, expires):
+        async with self._admission():
+            # the limiter may be synchronous, like `TokenBucket`
+            delay = await resolve_awaitable(self._throttle())
+            if delay > 0:
+                if not self._within_deadline(expires, delay):
+                    raise SpotifyDeadlineExceededError(url)
+                await asyncio.sleep(delay)
+            async with self.concurrency or _no_limit():
+                timeout = self._attempt_timeout(url, endpoint, expires)
+                started = time.monotonic()
+                try:
+                    response = await self._request(
+                        method, url, endpoint, expires, headers=headers,
+                        proxies=self.proxies, timeout=timeout, **args
+                    )
+                except Exception:
+                    self._record_response(endpoint, None, started)
+                    raise
+                self._record_response(endpoint, response, started)
+        return response
+
+    async def _send_hedge(self, method, url, endpoint, expires, kwargs):
+        async with self._admission():
+            throttle = await resolve_awaitable(self._throttle())
+            if not self._within_deadline(expires, throttle):
+                return None
+            if throttle > 0:
+                await asyncio.sleep(throttle)
+            async with self.concurrency or _no_limit():
+                timeout = self._hedge_timeout(url, endpoint, expires)
+                if timeout is None:
+                    return None
+                logger.debug(f"Hedging {method} {url}")
+                self.hedging.count_hedge()
+                return await self._transport.request(method, url, **dict(kwargs, timeout=timeout))
+
+    async def _request(self, method, url, endpoint, expires, **kwargs):
+        delay = self._hedge_delay(method, endpoint)
+        if delay is None:
+            return await self._transport.request(method, url, **kwargs)
+        primary = asyncio.ensure_future(self._transport.request(method, url, **kwargs))
+        pending = {primary}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=delay)
+            if not done:
+                pending.add(asyncio.ensure_future(
+                    self._send_hedge(method, url, endpoint, expires, kwargs)
+                ))
+            errors = {}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    hedge = future is not primary
+                    if future.exception() is not None:
+                        errors[hedge] = future.exception()
+                    elif future.result() is not None:
+                        if hedge:
+                            self.hedging.count_won()
+                        return future.result()
+            raise errors.get(False) or errors[True]
+        finally:
+            for future in pending:
+                future.cancel()
+
+    async def _send(self, method, url, headers, args):
+        retry = self._retry
+        endpoint = self._endpoint(url)
+        expires = self._expiry()
+        while True:
+            breaker, permit = self._admit_circuit(url, endpoint)
+            try:
+                response = await self._attempt(method, url, headers, args, endpoint, expires)
+            except BaseException as error:
+                self._record_circuit(breaker, permit, error=error)
+                # cancelled or interrupted
+                if not isinstance(error, Exception):
+                    raise
+                retry, delay = self._next_error_retry(retry, method, url, error, expires)
+                if retry is None:
+                    raise
+            else:
+                self._record_circuit(breaker, permit, response)
+                await resolve_awaitable(self._note_rate_limit(response))
+                retry, delay = self._next_retry(retry, method, url, response)
+                if retry is None or not self._within_deadline(expires, delay):
+                    return response
+            await asyncio.sleep(delay)
+
+    async def _internal_call(self, method, url, payload, params, cache=True):
+        url, headers, args = self._prepare_request(url, payload, params)
+        headers.update(await self._auth_headers())
+
+        logger.debug(f"Sending {method} to {url} with Params: "
+                     f"{args.get('params')} Headers: {headers} and Body: {args.get('data')!r}")
+
+        cache_key, ttl, cached = None, 0, None
+        if cache:
+            cache_key, ttl, cached = await self._lookup_response(method, url, args, headers)
+        if cached is not None:
+            return self._handle_response(method, url, args, cached)
+
+        flight_key = self._flight_key(method, url, args, headers)
+        if flight_key is None:
+            response = await self._fetch(method, url, headers, args, cache_key, ttl)
+        else:
+            response = await self.single_flight.do(
+                flight_key,
+                lambda: self._fetch(method, url, headers, args, cache_key, ttl),
+            )
+        return self._handle_response(method, url, args, response)
+
+    async def _fetch(self, method, url, headers, args, cache_key, ttl):
+        key, entry = self._add_conditional_headers(method, url, args, headers)
+        response = await self._send(method, url, headers, args)
+        response = self._revalidate(key, entry, response)
+        await self._store_response(cache_key, ttl, response)
+        return response
+
+    async def _lookup_response(self, method, url, args, headers):
+        key, ttl = self._response_key(method, url, args, headers)
+        if key is None:
+            return None, 0, None
+        body = await resolve_awaitable(self.response_cache.get(key))
+        return key, ttl, self._cached_response(key, url, body)
+
+    async def _store_response(self, key, ttl, response):
+        if key is not None and response.status_code == 200:
+            await resolve_awaitable(self.response_cache.set(key, response.content, ttl))
+
+    async def _load_several(self, path, ids, params):
+        try:
+            entities = (await self._get_several(path, ids, **params))[path]
+        except SpotifyException as e:
+            if e.http_status != 400 or len(ids) == 1:
+                raise
+            return await asyncio.gather(
+                *(self._load_one(path, entity_id, params) for entity_id in ids)
+            )
+        return self._or_not_found(path, ids, entities)
+
+    async def _load_one(self, path, entity_id, params):
+        try:
+            return await self._get(f"{path}/{entity_id}", **params)
+        except SpotifyException as e:
+            return e
+
+    async def next(self, result):
+        """ returns the next result given a paged result
+
+            Parameters:
+                - result - a previously returned paged result
+        """
+        if result["next"]:
+            return await self._get(result["next"])
+        else:
+            return None
+
+    def iter_pages(self, method, *args, **kwargs):
+        """ Returns an async iterator over the pages of a paged result,
+            like `Spotify.iter_pages`
+        """
+        return pagination.aiter_pages(self, method, *args, **kwargs)
+
+    def iter_items(self, method, *args, **kwargs):
+        """ Returns an async iterator over the items of all the pages of a
+            paged result, like `Spotify.iter_items`
+
+            Example::
+
+                async for item in sp.iter_items(sp.playlist_items, playlist_id):
+                    print(item["track"]["name"])
+        """
+        return pagination.aiter_items(self, method, *args, **kwargs)
+
+    async def previous(self, result):
+        """ returns the previous result given a paged result
+
+            Parameters:
+                - result - a previously returned paged result
+        """
+        if result["previous"]:
+            return await self._get(result["previous"])
+        else:
+            return None
+
+    # The playback methods below validate their input and return None
+    # without calling the API if it is invalid, so the result of the
+    # synchronous implementation may or may not be awaitable.
+
+    async def start_playback(
+        self, device_id=None, context_uri=None, uris=None, offset=None, position_ms=None
+    ):
+        return await resolve_awaitable(super().start_playback(
+            device_id, context_uri, uris, offset, position_ms
+        ))
+
+    async def seek_track(self, position_ms, device_id=None):
+        return await resolve_awaitable(super().seek_track(position_ms, device_id))
+
+    async def repeat(self, state, device_id=None):
+        return await resolve_awaitable(super().repeat(state, device_id))
+
+    async def volume(self, volume_percent, device_id=None):
+        return await resolve_awaitable(super().volume(volume_percent, device_id))
+
+    async def shuffle(self, state, device_id=None):
+        return await resolve_awaitable(super().shuffle(state, device_id))
+
+    start_playback.__doc__ = Spotify.start_playback.__doc__
+    seek_track.__doc__ = Spotify.seek_track.__doc__
+    repeat.__doc__ = Spotify.repeat.__doc__
+    volume.__doc__ = Spotify.volume.__doc__
+    shuffle.__doc__ = Spotify.shuffle.__doc__
@@ -0,0 +1,333 @@
+""" Auth managers that request and refresh tokens without blocking the event loop """
+
+__all__ = [
+    "AsyncSpotifyClientCredentials",
+    "AsyncSpotifyOAuth",
+]
+
+import asyncio
+import logging
+import warnings
+
+from spotipy.cache_handler import AsyncCacheFileHandler, CacheFileHandler
+from spotipy.oauth2 import (SpotifyClientCredentials, SpotifyOAuth,
+                            _make_authorization_headers)
+from spotipy.transport import AsyncHTTPXTransport
+from spotipy.util import resolve_awaitable
+
+logger = logging.getLogger(__name__)
+
+
+class _AsyncAuthMixin:
+    """ Sends token requests through an asynchronous transport and makes
+        sure concurrent tasks share a single token request instead of each
+        fetching their own.
+    """
+
+    def _init_async_session(self, requests_session, cache_handler, transport):
+        if transport is not None:
+            self._transport = transport
+        elif requests_session and requests_session is not True:
+            self._transport = AsyncHTTPXTransport(requests_session)
+        else:
+            self._transport = AsyncHTTPXTransport(retries=0, proxies=self.proxies)
+        self._lock = None
+        if cache_handler is None and type(self.cache_handler) is CacheFileHandler:
+            self.cache_handler = AsyncCacheFileHandler(
+                cache_path=self.cache_handler.cache_path,
+                encoder_cls=self.cache_handler.encoder_cls,
+                codec=self.cache_handler.codec,
+            )
+
+    def _token_lock(self):
+        # created lazily, so the lock belongs to the loop that uses it
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    async def _get_cached_token(self):
+        return await resolve_awaitable(self.cache_handler.get_cached_token())
+
+    async def _save_token(self, token_info):
+        await resolve_awaitable(self.cache_handler.save_token_to_cache(token_info))
+
+    async def _post_token_request(self, payload, headers):
+        logger.debug(f"Sending POST request to {self.OAUTH_TOKEN_URL} with Headers: "
+                     f"{headers} and Body: {payload}")
+
+        response = await self._transport.request(
+            "POST",
+            self.OAUTH_TOKEN_URL,
+            data=payload,
+            headers=headers,
+            timeout=self.requests_timeout,
+        )
+        if response.status_code >= 400:
+            raise self._build_oauth_error(response)
+        return response.json()
+
+    async def close(self):
+        """ Closes the underlying connection pool """
+        await self._transport.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+
+class AsyncSpotifyClientCredentials(_AsyncAuthMixin, SpotifyClientCredentials):
+    """
+    Client Credentials Flow Manager for `AsyncSpotify`.
+
+    Works like `SpotifyClientCredentials`, but `get_access_token` is a
+    coroutine. Requires `httpx` and, for the default cache handler,
+    `aiofiles` (``pip install "spotipy[async]"``).
+    """
+
+    def __init__(
+        self,
+        client_id=None,
+        client_secret=None,
+        proxies=None,
+        requests_session=True,
+        requests_timeout=None,
+        cache_handler=None,
+        transport=None
+    ):
+        """
+        Parameters:
+             * client_id: Must be supplied or set as environment variable
+             * client_secret: Must be supplied or set as environment variable
+             * proxies: Optional, proxy URLs by scheme to route through
+             * requests_session: An `httpx.AsyncClient` or a truthy value to create one
+             * requests_timeout: Optional, stop waiting for a response after
+                                 a given number of seconds
+             * cache_handler: An instance of the `CacheHandler` class to handle
+                              getting and saving cached authorization tokens.
+                              Both `AsyncCacheHandler` and synchronous handlers are
+                              supported. Optional, will otherwise use
+                              `AsyncCacheFileHandler`.
+             * transport: Optional, a `spotipy.transport.AsyncTransport` to send
+                          token requests with (takes precedence over `requests_session`)
+        """
+        super().__init__(
+            client_id=client_id,
+            client_secret=client_secret,
+            proxies=proxies,
+            requests_session=False,
+            requests_timeout=requests_timeout,
+            cache_handler=cache_handler,
+        )
+        self._init_async_session(requests_session, cache_handler, transport)
+
+    async def get_access_token(self, as_dict=True, check_cache=True):
+        """
+        If a valid access token is in memory, returns it
+        Else fetches a new token and returns it
+
+            Parameters:
+            - as_dict: (deprecated) a boolean indicating if returning the access token
+                as a token_info dictionary, otherwise it will be returned
+                as a string.
+        """
+        if as_dict:
+            warnings.warn(
+                "You're using 'as_dict = True'."
+                "get_access_token will return the token string directly in future "
+                "versions. Please adjust your code accordingly, or use "
+                "get_cached_token instead.",
+                DeprecationWarning,
+                stacklevel=2,
+            )
+
+        if check_cache:
+            token_info = await self._get_cached_token()
+            if token_info and not self.is_token_expired(token_info):
+                return token_info if as_dict else token_info["access_token"]
+
+        async with self._token_lock():
+            # another task may have fetched a token while we were waiting
+            if check_cache:
+                token_info = await self._get_cached_token()
+                if token_info and not self.is_token_expired(token_info):
+                    return token_info if as_dict else token_info["access_token"]
+
+            token_info = await self._request_access_token()
+            token_info = self._add_custom_values_to_token_info(token_info)
+            await self._save_token(token_info)
+        return token_info if as_dict else token_info["access_token"]
+
+    async def _request_access_token(self):
+        """Gets client credentials access token """
+        payload = {"grant_type": "client_credentials"}
+        headers = _make_authorization_headers(self.client_id, self.client_secret)
+        return await self._post_token_request(payload, headers)
+
+
+class AsyncSpotifyOAuth(_AsyncAuthMixin, SpotifyOAuth):
+    """
+    Authorization Code Flow manager for `AsyncSpotify`.
+
+    Works like `SpotifyOAuth`, but token requests, refreshes and cache
+    access are coroutines. The interactive authorization step (opening a
+    browser and waiting for the redirect) runs in a worker thread.
+    Requires `httpx` and, for the default cache handler, `aiofiles`
+    (``pip install "spotipy[async]"``).
+    """
+
+    def __init__(
+            self,
+            client_id=None,
+            client_secret=None,
+            redirect_uri=None,
+            state=None,
+            scope=None,
+            cache_path=None,
+            username=None,
+            proxies=None,
+            show_dialog=False,
+            requests_session=True,
+            requests_timeout=None,
+            open_browser=True,
+            cache_handler=None,
+            transport=None
+    ):
+        """
+        Parameters:
+             * client_id: Must be supplied or set as environment variable
+             * client_secret: Must be supplied or set as environment variable
+             * redirect_uri: Must be supplied or set as environment variable
+             * state: Optional, no verification is performed
+             * scope: Optional, either a list of scopes or comma separated string of scopes.
+                      e.g, "playlist-read-private,playlist-read-collaborative"
+             * cache_path: (deprecated) Optional, will otherwise be generated
+                           (takes precedence over `username`)
+             * username: (deprecated) Optional or set as environment variable
+                         (will set `cache_path` to `.cache-{username}`)
+             * proxies: Optional, proxy URLs by scheme to route through
+             * show_dialog: Optional, interpreted as boolean
+             * requests_session: An `httpx.AsyncClient` or a truthy value to create one
+             * requests_timeout: Optional, stop waiting for a response after
+                                 a given number of seconds
+             * open_browser: Optional, whether the web browser should be opened to
+                             authorize a user
+             * cache_handler: An instance of the `CacheHandler` class to handle
+                              getting and saving cached authorization tokens.
+                              Both `AsyncCacheHandler` and synchronous handlers are
+                              supported. Optional, will otherwise use
+                              `AsyncCacheFileHandler`.
+             * transport: Optional, a `spotipy.transport.AsyncTransport` to send
+                          token requests with (takes precedence over `requests_session`)
+        """
+        super().__init__(
+            client_id=client_id,
+            client_secret=client_secret,
+            redirect_uri=redirect_uri,
+            state=state,
+            scope=scope,
+            cache_path=cache_path,
+            username=username,
+            proxies=proxies,
+            show_dialog=show_dialog,
+            requests_session=False,
+            requests_timeout=requests_timeout,
+            open_browser=open_browser,
+            cache_handler=cache_handler,
+        )
+        self._init_async_session(requests_session, cache_handler, transport)
+
+    async def validate_token(self, token_info):
+        if token_info is None:
+            return None
+
+        # if scopes don't match, then bail
+        if "scope" not in token_info or not self._is_scope_subset(
+                self.scope, token_info["scope"]
+        ):
+            return None
+
+        if self.is_token_expired(token_info):
+            async with self._token_lock():
+                # another task may have refreshed the token while we were waiting
+                cached_token = await self._get_cached_token()
+                if cached_token and not self.is_token_expired(cached_token):
+                    return cached_token
+                token_info = await self.refresh_access_token(
+                    token_info["refresh_token"]
+                )
+
+        return token_info
+
+    async def get_access_token(self, code=None, as_dict=True, check_cache=True):
+        """ Gets the access token for the app given the code
+
+            Parameters:
+                - code: the response code
+                - as_dict: (deprecated) a boolean indicating if returning the access token
+                            as a token_info dictionary, otherwise it will be returned
+                            as a string.
+        """
+        if as_dict:
+            warnings.warn(
+                "You're using 'as_dict = True'."
+                "get_access_token will return the token string directly in future "
+                "versions. Please adjust your code accordingly, or use "
+                "get_cached_token instead.",
+                DeprecationWarning,
+                stacklevel=2,
+            )
+        if check_cache:
+            token_info = await self.validate_token(await self._get_cached_token())
+            if token_info is not None:
+                return token_info if as_dict else token_info["access_token"]
+
+        if not code:
+            loop = asyncio.get_running_loop()
+            code = await loop.run_in_executor(None, self.get_auth_response)
+
+        payload = {
+            "redirect_uri": self.redirect_uri,
+            "code": code,
+            "grant_type": "authorization_code",
+        }
+        if self.scope:
+            payload["scope"] = self.scope
+        if self.state:
+            payload["state"] = self.state
+
+        token_info = await self._post_token_request(
+            payload, self._make_authorization_headers()
+        )
+        token_info = self._add_custom_values_to_token_info(token_info)
+        await self._save_token(token_info)
+        return token_info if as_dict else token_info["access_token"]
+
+    async def refresh_access_token(self, refresh_token):
+        payload = {
+            "refresh_token": refresh_token,
+            "grant_type": "refresh_token",
+        }
+
+        token_info = await self._post_token_request(
+            payload, self._make_authorization_headers()
+        )
+        token_info = self._add_custom_values_to_token_info(token_info)
+        if "refresh_token" not in token_info:
+            token_info["refresh_token"] = refresh_token
+        await self._save_token(token_info)
+        return token_info
+
+    async def get_cached_token(self):
+        """ Gets the cached token for the app
+
+            .. deprecated::
+            This method is deprecated and may be removed in a future version.
+        """
+        warnings.warn("Calling get_cached_token directly on the AsyncSpotifyOAuth object " +
+                      "will be deprecated. Instead, use:\n\t" +
+                      "await sp.validate_token(await sp.cache_handler.get_cached_token())",
+                      DeprecationWarning
+                      )
+        return await self.validate_token(await self._get_cached_token())
@@ -1,6 +1,9 @@
 __all__ = [
     'CacheHandler',
     'CacheFileHandler',
+    'AsyncCacheHandler',
+    'AsyncCacheFileHandler',
+    'AsyncRedisCacheHandler',
     'DjangoSessionCacheHandler',
     'FlaskSessionCacheHandler',
     'MemoryCacheHandler',
@@ -8,12 +11,12 @@ __all__ = [
     'MemcacheCacheHandler']
 
 import errno
-import json
 import logging
 import os
 
 from redis import RedisError
 
+from spotipy.codec import JSONCodec, get_codec
 from spotipy.util import CLIENT_CREDS_ENV_VARS
 
 logger = logging.getLogger(__name__)
@@ -52,7 +55,8 @@ class CacheFileHandler(CacheHandler):
     def __init__(self,
                  cache_path=None,
                  username=None,
-                 encoder_cls=None):
+                 encoder_cls=None,
+                 codec=None):
         """
         Parameters:
              * cache_path: May be supplied, will otherwise be generated
@@ -61,8 +65,12 @@ class CacheFileHandler(CacheHandler):
                          (will set `cache_path` to `.cache-{username}`)
              * encoder_cls: May be supplied as a means of overwriting the
                         default serializer used for writing tokens to disk
+                        (takes precedence over `codec`)
+             * codec: May be supplied, a `spotipy.codec` codec or the name of
+                      one. Defaults to the fastest installed JSON library.
         """
         self.encoder_cls = encoder_cls
+        self.codec = JSONCodec(encoder_cls) if encoder_cls else get_codec(codec)
         if cache_path:
             self.cache_path = cache_path
         else:
@@ -78,14 +86,14 @@ class CacheFileHandler(CacheHandler):
         try:
             with open(self.cache_path, encoding='utf-8') as f:
                 token_info_string = f.read()
-            token_info = json.loads(token_info_string)
+            token_info = self.codec.loads(token_info_string)
 
         except OSError as error:
             if error.errno == errno.ENOENT:
                 logger.debug(f"cache does not exist at: {self.cache_path}")
             else:
                 logger.warning(f"Couldn't read cache at: {self.cache_path}")
-        except json.JSONDecodeError:
+        except ValueError:
             logger.warning(f"Couldn't decode JSON from cache at: {self.cache_path}")
 
         return token_info
@@ -93,7 +101,7 @@ class CacheFileHandler(CacheHandler):
     def save_token_to_cache(self, token_info):
         try:
             with open(self.cache_path, "w", encoding='utf-8') as f:
-                f.write(json.dumps(token_info, cls=self.encoder_cls))
+                f.write(self.codec.dumps(token_info))
             # https://github.com/spotipy-dev/spotipy/security/advisories/GHSA-pwhh-q4h6-w599
             os.chmod(self.cache_path, 0o600)
         except OSError:
@@ -185,23 +193,26 @@ class RedisCacheHandler(CacheHandler):
     A cache handler that stores the token info in the Redis.
     """
 
-    def __init__(self, redis, key=None):
+    def __init__(self, redis, key=None, codec=None):
         """
         Parameters:
             * redis: Redis object provided by redis-py library
             (https://github.com/redis/redis-py)
             * key: May be supplied, will otherwise be generated
                    (takes precedence over `token_info`)
+            * codec: May be supplied, a `spotipy.codec` codec or the name of
+                     one. Defaults to the fastest installed JSON library.
         """
         self.redis = redis
         self.key = key if key else 'token_info'
+        self.codec = get_codec(codec)
 
     def get_cached_token(self):
         token_info = None
         try:
             token_info = self.redis.get(self.key)
             if token_info:
-                return json.loads(token_info)
+                return self.codec.loads(token_info)
         except RedisError as e:
             logger.warning(f"Error getting token from cache: {e}")
 
@@ -209,7 +220,7 @@ class RedisCacheHandler(CacheHandler):
 
     def save_token_to_cache(self, token_info):
         try:
-            self.redis.set(self.key, json.dumps(token_info))
+            self.redis.set(self.key, self.codec.dumps(token_info))
         except RedisError as e:
             logger.warning(f"Error saving token to cache: {e}")
 
@@ -218,29 +229,118 @@ class MemcacheCacheHandler(CacheHandler):
     """A Cache handler that stores the token info in Memcache using the pymemcache client
     """
 
-    def __init__(self, memcache, key=None) -> None:
+    def __init__(self, memcache, key=None, codec=None) -> None:
         """
         Parameters:
             * memcache: memcache client object provided by pymemcache
             (https://pymemcache.readthedocs.io/en/latest/getting_started.html)
             * key: May be supplied, will otherwise be generated
                    (takes precedence over `token_info`)
+            * codec: May be supplied, a `spotipy.codec` codec or the name of
+                     one. Defaults to the fastest installed JSON library.
         """
         self.memcache = memcache
         self.key = key if key else 'token_info'
+        self.codec = get_codec(codec)
 
     def get_cached_token(self):
         from pymemcache import MemcacheError
         try:
             token_info = self.memcache.get(self.key)
             if token_info:
-                return json.loads(token_info.decode())
+                return self.codec.loads(token_info)
         except MemcacheError as e:
             logger.warning(f"Error getting token to cache: {e}")
 
     def save_token_to_cache(self, token_info):
         from pymemcache import MemcacheError
         try:
-            self.memcache.set(self.key, json.dumps(token_info))
+            self.memcache.set(self.key, self.codec.dumps(token_info))
         except MemcacheError as e:
             logger.warning(f"Error saving token to cache: {e}")
+
+
+class AsyncCacheHandler(CacheHandler):
+    """
+    An abstraction layer for caching authorization tokens without blocking
+    the event loop. Used by the auth managers in `spotipy.async_oauth2`.
+
+    Custom extensions of this class must implement get_cached_token
+    and save_token_to_cache as coroutines with the same input and output
+    structure as the CacheHandler class.
+    """
+
+    async def get_cached_token(self):
+        """
+        Get and return a token_info dictionary object.
+        """
+        raise NotImplementedError()
+
+    async def save_token_to_cache(self, token_info):
+        """
+        Save a token_info dictionary object to the cache and return None.
+        """
+        raise NotImplementedError()
+
+
+class AsyncCacheFileHandler(AsyncCacheHandler, CacheFileHandler):
+    """
+    Handles reading and writing cached Spotify authorization tokens
+    as json files on disk, using the aiofiles library
+    (https://github.com/Tinche/aiofiles)
+    """
+
+    async def get_cached_token(self):
+        import aiofiles
+
+        token_info = None
+
+        try:
+            async with aiofiles.open(self.cache_path, encoding='utf-8') as f:
+                token_info_string = await f.read()
+            token_info = self.codec.loads(token_info_string)
+
+        except OSError as error:
+            if error.errno == errno.ENOENT:
+                logger.debug(f"cache does not exist at: {self.cache_path}")
+            else:
+                logger.warning(f"Couldn't read cache at: {self.cache_path}")
+        except ValueError:
+            logger.warning(f"Couldn't decode JSON from cache at: {self.cache_path}")
+
+        return token_info
+
+    async def save_token_to_cache(self, token_info):
+        import aiofiles
+
+        try:
+            async with aiofiles.open(self.cache_path, "w", encoding='utf-8') as f:
+                await f.write(self.codec.dumps(token_info))
+            # https://github.com/spotipy-dev/spotipy/security/advisories/GHSA-pwhh-q4h6-w599
+            os.chmod(self.cache_path, 0o600)
+        except OSError:
+            logger.warning(f"Couldn't write token to cache at: {self.cache_path}")
+
+
+class AsyncRedisCacheHandler(AsyncCacheHandler, RedisCacheHandler):
+    """
+    A cache handler that stores the token info in Redis using the asyncio
+    client of redis-py (`redis.asyncio.Redis`).
+    """
+
+    async def get_cached_token(self):
+        token_info = None
+        try:
+            token_info = await self.redis.get(self.key)
+            if token_info:
+                return self.codec.loads(token_info)
+        except RedisError as e:
+            logger.warning(f"Error getting token from cache: {e}")
+
+        return token_info
+
+    async def save_token_to_cache(self, token_info):
+        try:
+            await self.redis.set(self.key, self.codec.dumps(token_info))
+        except RedisError as e:
+            logger.warning(f"Error saving token to cache: {e}")
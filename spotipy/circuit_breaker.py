@@ -0,0 +1,197 @@
+""" Circuit breakers failing requests fast while an area of the API is down """
+
+__all__ = [
+    "CLOSED",
+    "HALF_OPEN",
+    "OPEN",
+    "CircuitBreaker",
+    "CircuitBreakers",
+]
+
+import logging
+import threading
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class _Permit:
+
+    def __init__(self, probe, generation):
+        self.probe = probe
+        self.generation = generation
+
+
+class CircuitBreaker:
+    """
+    Tracks the outcome of the latest `window` requests to an area of the
+    API, and opens once at least `min_requests` were made and
+    `failure_rate` of them failed (with a 5xx or without a response).
+
+    While the circuit is open, requests are turned away without being
+    sent. After `reset_timeout` seconds it is half-open: up to `probes`
+    requests are let through at a time, and the circuit closes once
+    `probes` of them succeeded, or opens again as soon as one fails.
+
+    A request asks for a permit with `admit` and reports its outcome with
+    `record` (or `cancel`, if it wasn't sent after all).
+    """
+
+    def __init__(self, failure_rate=0.5, min_requests=10, window=20, reset_timeout=30.0,
+                 probes=1, name="the API", clock=time.monotonic):
+        """
+        Parameters:
+            - failure_rate - the share of failed requests opening the circuit
+            - min_requests - the fewest requests to judge the failure rate on
+            - window - the number of latest requests to judge it on
+            - reset_timeout - the seconds the circuit stays open
+            - probes - the number of probe requests of the half-open circuit
+            - name - the name of the circuit, for logging
+            - clock - returns the current time in seconds
+        """
+        if not 0 < failure_rate <= 1:
+            raise ValueError("failure_rate must be between 0 and 1")
+        self.failure_rate = failure_rate
+        self.min_requests = min_requests
+        self.reset_timeout = reset_timeout
+        self.probes = probes
+        self.name = name
+        self.rejected = 0
+        self.opened = 0
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._outcomes = deque(maxlen=window)
+        self._state = CLOSED
+        self._opened_at = None
+        # outcomes of requests admitted before the latest change of state
+        # are ignored
+        self._generation = 0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+
+    def _set_state(self, state):
+        self._state = state
+        self._generation += 1
+        self._outcomes.clear()
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        if state == OPEN:
+            self._opened_at = self._clock()
+            self.opened += 1
+            logger.warning(f"Opened the circuit of {self.name} for {self.reset_timeout} seconds")
+        elif state == CLOSED:
+            logger.info(f"Closed the circuit of {self.name}")
+
+    def _current_state(self):
+        if self._state == OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+            self._set_state(HALF_OPEN)
+        return self._state
+
+    @property
+    def state(self):
+        """ `CLOSED`, `OPEN` or `HALF_OPEN` """
+        with self._lock:
+            return self._current_state()
+
+    def admit(self):
+        """ Returns a permit to send a request, or None if the circuit is
+            open (or half-open with as many probes as allowed in flight)
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return _Permit(False, self._generation)
+            if state == HALF_OPEN and self._probes_in_flight < self.probes:
+                self._probes_in_flight += 1
+                return _Permit(True, self._generation)
+            self.rejected += 1
+            return None
+
+    def record(self, permit, success):
+        """ Records the outcome of the request sent with `permit` """
+        with self._lock:
+            if permit.generation != self._generation:
+                return
+            if permit.probe:
+                self._probes_in_flight -= 1
+                if not success:
+                    self._set_state(OPEN)
+                    return
+                self._probe_successes += 1
+                if self._probe_successes >= self.probes:
+                    self._set_state(CLOSED)
+                return
+            self._outcomes.append(success)
+            failures = len(self._outcomes) - sum(self._outcomes)
+            if (len(self._outcomes) >= self.min_requests
+                    and failures >= self.failure_rate * len(self._outcomes)):
+                self._set_state(OPEN)
+
+    def cancel(self, permit):
+        """ Gives back the permit of a request that wasn't sent """
+        with self._lock:
+            if permit.probe and permit.generation == self._generation:
+                self._probes_in_flight -= 1
+
+    def stats(self):
+        """ Returns the state of the circuit, the number and failure rate of
+            the requests it judges, the number of requests it turned away and
+            the number of times it opened
+        """
+        with self._lock:
+            requests = len(self._outcomes)
+            return {
+                "state": self._current_state(),
+                "requests": requests,
+                "failure_rate": (requests - sum(self._outcomes)) / requests if requests else 0.0,
+                "rejected": self.rejected,
+                "opened": self.opened,
+            }
+
+
+class CircuitBreakers:
+    """
+    A `CircuitBreaker` for each endpoint family, such as ``me/player`` or
+    ``audio-analysis``, created with the same settings when first used.
+
+    Example usage::
+
+        breakers = CircuitBreakers(failure_rate=0.5, reset_timeout=30)
+        sp = spotipy.Spotify(auth_manager=..., circuit_breakers=breakers)
+        ...
+        breakers.states()  # {"me/player": "open", "tracks": "closed"}
+    """
+
+    def __init__(self, **settings):
+        """
+        Parameters:
+            - settings - the keyword arguments of each `CircuitBreaker`
+        """
+        self.settings = settings
+        self._lock = threading.Lock()
+        self._breakers = {}
+
+    def get(self, family):
+        """ Returns the breaker of an endpoint family """
+        with self._lock:
+            breaker = self._breakers.get(family)
+            if breaker is None:
+                breaker = self._breakers[family] = CircuitBreaker(name=family, **self.settings)
+            return breaker
+
+    def states(self):
+        """ Returns the state of the breaker of each endpoint family used """
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {family: breaker.state for family, breaker in breakers.items()}
+
+    def stats(self):
+        """ Returns the `stats` of the breaker of each endpoint family used """
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {family: breaker.stats() for family, breaker in breakers.items()}
@@ -2,20 +2,59 @@
 
 __all__ = ["Spotify", "SpotifyException"]
 
-import json
+import contextlib
+import contextvars
 import logging
+import queue
 import re
+import threading
+import time
+import urllib.parse as urllibparse
 import warnings
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
-
-from spotipy.exceptions import SpotifyException
+from urllib3.exceptions import InvalidHeader, MaxRetryError
+
+from spotipy import pagination
+from spotipy.circuit_breaker import CircuitBreakers
+from spotipy.codec import get_codec
+from spotipy.concurrency import AdaptiveConcurrency, Batcher, SingleFlight
+from spotipy.exceptions import (SpotifyCircuitOpenError,
+                                SpotifyDeadlineExceededError, SpotifyException)
+from spotipy.hedging import HedgePolicy
+from spotipy.response_cache import make_cache_key
+from spotipy.scheduling import current_lane, current_tenant
+from spotipy.timeouts import AdaptiveTimeout, current_deadline
+from spotipy.transport import RequestsTransport, Response, connection_retry
 from spotipy.util import REQUESTS_SESSION, Retry
 
 logger = logging.getLogger(__name__)
 
 
+class _RetryResponse:
+    """ Exposes the parts of a response that urllib3's `Retry` looks at """
+
+    def __init__(self, response):
+        self.status = response.status_code
+        self.headers = response.headers
+
+    def get_redirect_location(self):
+        return False
+
+
+def _cap_timeout(timeout, seconds):
+    """ Shortens a timeout (seconds, a (connect, read) tuple or None) to at
+        most `seconds`
+    """
+    if timeout is None:
+        return seconds
+    if isinstance(timeout, tuple):
+        return tuple(seconds if t is None else min(t, seconds) for t in timeout)
+    return min(timeout, seconds)
+
+
 class Spotify:
     """
         Example usage::
@@ -32,6 +71,31 @@ class Spotify:
             print(user)
     """
     max_retries = 3
+    # the most IDs the endpoints for several entities accept
+    max_ids_per_request = {
+        "albums": 20,
+        "artists": 50,
+        "audiobooks": 50,
+        "episodes": 50,
+        "shows": 50,
+        "tracks": 50,
+        "me/albums/contains": 20,
+        "me/episodes/contains": 50,
+        "me/following/contains": 50,
+        "me/shows/contains": 50,
+        "me/tracks/contains": 50,
+    }
+    # the most requests in flight at once for the chunks of a long list of IDs
+    max_concurrent_chunks = 4
+    # the most items a request adding, replacing or removing playlist items takes
+    max_playlist_items_per_request = 100
+
+    # the path segments followed by an ID, as in ``albums/{id}``
+    _id_collections = frozenset([
+        "albums", "artists", "audio-analysis", "audio-features", "audiobooks",
+        "categories", "chapters", "episodes", "playlists", "shows", "tracks", "users",
+    ])
+
     default_retry_codes = (429, 500, 502, 503, 504)
     country_codes = [
         "AD",
@@ -136,6 +200,21 @@ class Spotify:
         status_retries=max_retries,
         backoff_factor=0.3,
         language=None,
+        transport=None,
+        codec=None,
+        etag_cache=None,
+        response_cache=None,
+        single_flight=False,
+        batch_window=None,
+        rate_limiter=None,
+        adaptive_concurrency=None,
+        scheduler=None,
+        lane=None,
+        tenant=None,
+        deadline=None,
+        adaptive_timeout=None,
+        circuit_breakers=None,
+        hedging=None,
     ):
         """
         Creates a Spotify API client.
@@ -171,6 +250,76 @@ class Spotify:
         :param language:
             The language parameter advertises what language the user prefers to see.
             See ISO-639-1 language code: https://en.wikipedia.org/wiki/List_of_ISO_639-1_codes
+        :param transport:
+            A `spotipy.transport.Transport` to send requests with (optional),
+            e.g. `Urllib3Transport` to skip the per-request overhead of
+            Requests. Takes precedence over `requests_session`.
+        :param codec:
+            The JSON codec for responses and payloads: a `spotipy.codec` codec
+            or one of "json", "orjson" or "msgspec". Defaults to the fastest
+            installed library.
+        :param etag_cache:
+            A `spotipy.response_cache.ETagCache` (optional). GET requests for
+            resources it holds are sent with If-None-Match, and a
+            304 Not Modified is answered from the cache.
+        :param response_cache:
+            A `spotipy.response_cache.ResponseCache` (optional), e.g.
+            `MemoryResponseCache`. GET requests for cached responses are
+            answered without calling the API.
+        :param single_flight:
+            If True, concurrent identical GET requests (from several threads)
+            share a single call to the API and its result or exception.
+            A `spotipy.concurrency.SingleFlight` may be passed to share calls
+            between clients.
+        :param batch_window:
+            If set, `track`, `artist`, `album` and `episode` calls made by
+            several threads within this many seconds are batched into
+            requests for several entities, like `tracks` (optional).
+        :param rate_limiter:
+            A `spotipy.rate_limit.RateLimiter`, e.g. `TokenBucket(150)`,
+            that every request waits for (optional). A 429 response with a
+            Retry-After pauses it for all the requests using it.
+        :param adaptive_concurrency:
+            If True, the number of requests in flight (from chunked and
+            paged calls, and from all the threads using the client) is
+            limited, and the limit adapted to the responses: raised while
+            they are healthy, cut on 429s, 5xx and slow responses. A
+            `spotipy.concurrency.AdaptiveConcurrency` may be passed to
+            choose its bounds or to share it between clients.
+        :param scheduler:
+            A `spotipy.scheduling.PriorityScheduler` that requests wait for
+            their turn in (optional), so that interactive requests go ahead
+            of queued bulk work. Share it between the clients of an app.
+        :param lane:
+            The scheduler lane of the requests of this client, unless set
+            with `spotipy.scheduling.priority` (by default, the
+            scheduler's default lane).
+        :param tenant:
+            The tenant the requests of this client are made for, e.g. a
+            customer account, unless set with
+            `spotipy.scheduling.for_tenant`. The scheduler shares its turns
+            between the tenants by their weights.
+        :param deadline:
+            The most seconds a request may take in all, including retries
+            and the waits between them (optional). A deadline set with
+            `spotipy.timeouts.deadline` takes precedence.
+        :param adaptive_timeout:
+            If True, the timeout of each attempt is adapted to the latencies
+            observed for its endpoint, never exceeding `requests_timeout`.
+            A `spotipy.timeouts.AdaptiveTimeout` may be passed to tune it.
+        :param circuit_breakers:
+            If True, requests to an endpoint family (like ``me/player``)
+            fail fast with a SpotifyCircuitOpenError while too many of its
+            recent requests failed. A
+            `spotipy.circuit_breaker.CircuitBreakers` may be passed to tune
+            them, share them between clients or read their states.
+        :param hedging:
+            If True, a GET request that goes unanswered for longer than the
+            95th percentile of the latencies observed for its endpoint is
+            sent again, and the first response is used (the other one is
+            dropped). Hedges count against the rate limiter, the scheduler
+            and the adaptive concurrency limit. A `spotipy.hedging.HedgePolicy` may be
+            passed to tune it or hedge only some endpoints.
         """
         self.prefix = "https://api.spotify.com/v1/"
         self._auth = auth
@@ -184,14 +333,50 @@ class Spotify:
         self.retries = retries
         self.status_retries = status_retries
         self.language = language
-
-        if isinstance(requests_session, requests.Session):
+        self.codec = get_codec(codec)
+        self.etag_cache = etag_cache
+        self.response_cache = response_cache
+        if single_flight is True:
+            single_flight = SingleFlight()
+        elif single_flight is False:
+            single_flight = None
+        self.single_flight = single_flight
+        self.batcher = None if batch_window is None else Batcher(batch_window)
+        self.rate_limiter = rate_limiter
+        if adaptive_concurrency is True:
+            adaptive_concurrency = AdaptiveConcurrency(initial=self.max_concurrent_chunks)
+        self.concurrency = adaptive_concurrency or None
+        self.scheduler = scheduler
+        self.lane = lane
+        self.tenant = tenant
+        self.deadline = deadline
+        if adaptive_timeout is True:
+            adaptive_timeout = AdaptiveTimeout()
+        self.adaptive_timeout = adaptive_timeout or None
+        if circuit_breakers is True:
+            circuit_breakers = CircuitBreakers()
+        self.circuit_breakers = circuit_breakers or None
+        if hedging is True:
+            hedging = HedgePolicy()
+        self.hedging = hedging or None
+
+        # sessions passed in and the requests module keep their own retry
+        # policy: the client only retries the requests of the sessions it
+        # builds and of transports
+        self._client_retries = True
+        if transport is not None:
+            self._session = None
+        elif isinstance(requests_session, requests.Session):
             self._session = requests_session
+            self._client_retries = False
         else:
             if requests_session:  # Build a new session.
                 self._build_session()
             else:  # Use the Requests API module as a "session".
                 self._session = requests.api
+                self._client_retries = False
+        self._transport = transport or RequestsTransport(self._session)
+        self._retry = self._build_retry()
 
     def set_auth(self, auth):
         self._auth = auth
@@ -214,18 +399,22 @@ class Spotify:
         if getattr(self, "_session", None) and isinstance(self._session, REQUESTS_SESSION):
             self._session.close()
 
-    def _build_session(self):
-        self._session = requests.Session()
-        retry = Retry(
+    def _build_retry(self):
+        return Retry(
             total=self.retries,
             connect=None,
-            read=False,
+            # read timeouts only reach `_next_error_retry` for GET requests
+            read=None,
             allowed_methods=frozenset(['GET', 'POST', 'PUT', 'DELETE']),
             status=self.status_retries,
             backoff_factor=self.backoff_factor,
             status_forcelist=self.status_forcelist)
 
-        adapter = requests.adapters.HTTPAdapter(max_retries=retry)
+    def _build_session(self):
+        self._session = requests.Session()
+        # failed connections and bad status codes are retried by `_send`,
+        # within the deadline, whatever the transport
+        adapter = requests.adapters.HTTPAdapter(max_retries=connection_retry(0))
         self._session.mount('http://', adapter)
         self._session.mount('https://', adapter)
 
@@ -240,11 +429,14 @@ class Spotify:
             token = self.auth_manager.get_access_token()
         return {"Authorization": f"Bearer {token}"}
 
-    def _internal_call(self, method, url, payload, params):
+    def _prepare_request(self, url, payload, params):
+        """ Builds the absolute URL, the non-auth headers and the keyword
+            arguments (query parameters and body) for an API request.
+        """
         args = dict(params=params)
         if not url.startswith("http"):
             url = self.prefix + url
-        headers = self._auth_headers()
+        headers = {}
 
         if "content_type" in args["params"]:
             headers["Content-Type"] = args["params"]["content_type"]
@@ -254,48 +446,483 @@ class Spotify:
         else:
             headers["Content-Type"] = "application/json"
             if payload:
-                args["data"] = json.dumps(payload)
+                args["data"] = self.codec.dumps(payload)
 
         if self.language is not None:
             headers["Accept-Language"] = self.language
 
-        logger.debug(f"Sending {method} to {url} with Params: "
-                     f"{args.get('params')} Headers: {headers} and Body: {args.get('data')!r}")
+        return url, headers, args
+
+    def _build_http_error(self, method, url, params, response):
+        """ Maps an unsuccessful HTTP response to a SpotifyException
 
+            Parameters:
+                - method - the HTTP method of the request
+                - url - the URL of the request
+                - params - the query parameters of the request
+                - response - a response object with `status_code`, `url`,
+                             `headers`, `text` and `json()`
+        """
         try:
-            response = self._session.request(
-                method, url, headers=headers, proxies=self.proxies,
-                timeout=self.requests_timeout, **args
+            json_response = response.json()
+            error = json_response.get("error", {})
+            msg = error.get("message")
+            reason = error.get("reason")
+        except ValueError:
+            # if the response cannot be decoded into JSON (which raises a ValueError),
+            # then try to decode it into text
+
+            # if we receive an empty string (which is falsy), then replace it with `None`
+            msg = response.text or None
+            reason = None
+
+        logger.error(f"HTTP Error for {method} to {url} with Params: "
+                     f"{params} returned {response.status_code} due to {msg}")
+
+        return SpotifyException(
+            response.status_code,
+            -1,
+            f"{response.url}:\n {msg}",
+            reason=reason,
+            headers=response.headers,
+        )
+
+    def _next_retry(self, retry, method, url, response):
+        """ Decides whether a response should be retried
+
+            Returns the incremented `Retry` and the number of seconds to
+            wait before the next attempt, or `(None, None)` if the
+            response should be returned to the caller. Raises a
+            SpotifyException once the retries are exhausted.
+        """
+        if not self._client_retries:
+            return None, None
+        has_retry_after = "Retry-After" in response.headers
+        if not retry.is_retry(method, response.status_code, has_retry_after):
+            return None, None
+        retry_response = _RetryResponse(response)
+        try:
+            retry = retry.increment(method, url, response=retry_response)
+        except MaxRetryError as retry_error:
+            logger.error('Max Retries reached')
+            parsed = urllibparse.urlsplit(str(response.url))
+            path_url = parsed.path + (f"?{parsed.query}" if parsed.query else "")
+            raise SpotifyException(
+                429,
+                -1,
+                f"{path_url}:\n Max Retries",
+                reason=retry_error.reason
             )
+        delay = None
+        if retry.respect_retry_after_header:
+            delay = retry.get_retry_after(retry_response)
+        return retry, delay or retry.get_backoff_time()
+
+    def _next_error_retry(self, retry, method, url, error, expires):
+        """ Decides whether a request that raised `error` should be retried:
+            requests that couldn't connect are, and GET requests that timed
+            out waiting for the response, while retries and time before the
+            deadline remain.
+
+            Returns the incremented `Retry` and the number of seconds to
+            wait before the next attempt, or `(None, None)` if the error
+            should be raised.
+        """
+        if not self._client_retries:
+            return None, None
+        if self._transport.is_connect_error(error):
+            message = f"Connection failed, retrying {method} {url}"
+        elif method == "GET" and self._transport.is_read_timeout(error):
+            message = f"Read timed out, retrying GET {url}"
+        else:
+            return None, None
+        try:
+            retry = retry.increment(method, url, error=error)
+        except MaxRetryError:
+            return None, None
+        delay = retry.get_backoff_time()
+        if not self._within_deadline(expires, delay):
+            return None, None
+        logger.warning(message)
+        return retry, delay
+
+    def _expiry(self):
+        """ Returns the time (of `time.monotonic`) at which the deadline of
+            a request sent now expires, or None
+        """
+        expires = current_deadline()
+        if expires is None and self.deadline is not None:
+            expires = time.monotonic() + self.deadline
+        return expires
+
+    def _within_deadline(self, expires, delay=0):
+        """ Tells whether there is time left after waiting `delay` seconds """
+        return expires is None or time.monotonic() + delay < expires
+
+    def _attempt_timeout(self, url, endpoint, expires):
+        """ Returns the timeout of an attempt at `endpoint`: the client's,
+            shortened to the adaptive timeout and to the time left before
+            the deadline. Raises a SpotifyDeadlineExceededError if none is.
+        """
+        timeout = self.requests_timeout
+        if self.adaptive_timeout is not None:
+            adapted = self.adaptive_timeout.timeout_for(endpoint)
+            if adapted is not None:
+                timeout = _cap_timeout(timeout, adapted)
+        if expires is not None:
+            remaining = expires - time.monotonic()
+            if remaining <= 0:
+                raise SpotifyDeadlineExceededError(url)
+            timeout = _cap_timeout(timeout, remaining)
+        return timeout
+
+    def _throttle(self):
+        """ Returns the number of seconds to wait for the rate limiter
+            before sending a request
+        """
+        if self.rate_limiter is None:
+            return 0
+        return self.rate_limiter.reserve()
+
+    def _note_rate_limit(self, response):
+        """ Pauses the rate limiter for the Retry-After of a 429 response
+
+            Returns what the limiter's `pause` returns: an awaitable for
+            asynchronous limiters.
+        """
+        if self.rate_limiter is None or response.status_code != 429:
+            return
+        retry_after = response.headers.get("Retry-After")
+        if retry_after is None:
+            return
+        try:
+            seconds = self._retry.parse_retry_after(retry_after)
+        except InvalidHeader:
+            return
+        logger.warning(f"Rate limited: pausing requests for {seconds} seconds")
+        return self.rate_limiter.pause(seconds)
+
+    def _record_response(self, endpoint, response, started):
+        """ Adjusts the adaptive concurrency limit and timeouts for a
+            response (None if the request failed) to a request to
+            `endpoint` sent at `started`
+        """
+        latency = time.monotonic() - started
+        if self.concurrency is not None:
+            status = None if response is None else response.status_code
+            self.concurrency.record(status, latency)
+        if response is not None and response.status_code < 500:
+            if self.adaptive_timeout is not None:
+                self.adaptive_timeout.record(endpoint, latency)
+            if self.hedging is not None:
+                self.hedging.record(endpoint, latency)
+
+    def _admission(self):
+        """ Returns the context manager a request is sent in: a slot of
+            the scheduler, if any
+        """
+        if self.scheduler is None:
+            return contextlib.nullcontext()
+        tenant = current_tenant()
+        if tenant is None:
+            tenant = self.tenant
+        return self.scheduler.slot(current_lane() or self.lane, tenant)
+
+    def _attempt(self, method, url, headers, args, endpoint, expires):
+        """ Sends a request once, after waiting for the scheduler, the rate
+            limiter and the concurrency limit
+        """
+        # queued requests don't hold a place with the rate limiter yet
+        with self._admission():
+            delay = self._throttle()
+            if delay > 0:
+                if not self._within_deadline(expires, delay):
+                    raise SpotifyDeadlineExceededError(url)
+                time.sleep(delay)
+            with self.concurrency or contextlib.nullcontext():
+                timeout = self._attempt_timeout(url, endpoint, expires)
+                started = time.monotonic()
+                try:
+                    response = self._request(
+                        method, url, endpoint, expires, headers=headers,
+                        proxies=self.proxies, timeout=timeout, **args
+                    )
+                except Exception:
+                    self._record_response(endpoint, None, started)
+                    raise
+                self._record_response(endpoint, response, started)
+        return response
+
+    def _hedge_delay(self, method, endpoint):
+        """ Returns the number of seconds after which a request gets a
+            hedge, or None if it doesn't
+        """
+        if self.hedging is None:
+            return None
+        return self.hedging.delay_for(method, endpoint)
+
+    def _hedge_timeout(self, url, endpoint, expires):
+        """ Returns the timeout of a hedge, or None if the deadline leaves
+            no time to send one
+        """
+        try:
+            return self._attempt_timeout(url, endpoint, expires)
+        except SpotifyDeadlineExceededError:
+            return None
 
-            response.raise_for_status()
-            results = response.json()
-        except requests.exceptions.HTTPError as http_error:
-            response = http_error.response
+    def _send_hedge(self, method, url, endpoint, expires, settled, kwargs):
+        """ Sends the hedge of a request once it has a slot of the scheduler,
+            its own place with the rate limiter and a slot of the adaptive
+            concurrency limit, unless the request was `settled` meanwhile.
+            Returns None if the hedge wasn't sent.
+        """
+        with self._admission():
+            # don't take a place with the rate limiter if the request was
+            # answered while the hedge waited for the scheduler
+            if settled.is_set():
+                return None
+            throttle = self._throttle()
+            # the place with the rate limiter stays taken, sent or not
+            if not self._within_deadline(expires, throttle) or settled.wait(throttle):
+                return None
+            with self.concurrency or contextlib.nullcontext():
+                timeout = self._hedge_timeout(url, endpoint, expires)
+                if settled.is_set() or timeout is None:
+                    return None
+                logger.debug(f"Hedging {method} {url}")
+                self.hedging.count_hedge()
+                return self._transport.request(method, url, **dict(kwargs, timeout=timeout))
+
+    def _request(self, method, url, endpoint, expires, **kwargs):
+        """ Sends a request with the transport, hedging it if it is slow
+            to answer
+        """
+        delay = self._hedge_delay(method, endpoint)
+        if delay is None:
+            return self._transport.request(method, url, **kwargs)
+        # the calling thread can't give up on a request it sends, so both
+        # are sent from threads of their own: the losing response is dropped
+        answers = queue.SimpleQueue()
+        settled = threading.Event()
+
+        def answer(hedge, send, *args, **kwargs):
             try:
-                json_response = response.json()
-                error = json_response.get("error", {})
-                msg = error.get("message")
-                reason = error.get("reason")
-            except ValueError:
-                # if the response cannot be decoded into JSON (which raises a ValueError),
-                # then try to decode it into text
-
-                # if we receive an empty string (which is falsy), then replace it with `None`
-                msg = response.text or None
-                reason = None
+                answers.put((hedge, send(*args, **kwargs), None))
+            except Exception as error:
+                answers.put((hedge, None, error))
+
+        threading.Thread(
+            target=answer, args=(False, self._transport.request, method, url), kwargs=kwargs,
+            name="spotipy-request", daemon=True,
+        ).start()
+        pending = 1
+        try:
+            first = answers.get(timeout=delay)
+        except queue.Empty:
+            threading.Thread(
+                target=contextvars.copy_context().run,
+                args=(answer, True, self._send_hedge, method, url, endpoint, expires, settled,
+                      kwargs),
+                name="spotipy-hedge", daemon=True,
+            ).start()
+            pending = 2
+            first = answers.get()
+        errors = {}
+        while True:
+            hedge, response, error = first
+            pending -= 1
+            if response is not None:
+                settled.set()
+                if hedge:
+                    self.hedging.count_won()
+                return response
+            if error is not None:
+                errors[hedge] = error
+            if not pending:
+                settled.set()
+                raise errors.get(False) or errors[True]
+            first = answers.get()
+
+    def _admit_circuit(self, url, endpoint):
+        """ Returns the circuit breaker of the endpoint's family and a permit
+            to send a request, or `(None, None)` without circuit breakers.
+            Raises a SpotifyCircuitOpenError if the circuit is open.
+        """
+        if self.circuit_breakers is None:
+            return None, None
+        family = self._endpoint_family(endpoint)
+        breaker = self.circuit_breakers.get(family)
+        permit = breaker.admit()
+        if permit is None:
+            raise SpotifyCircuitOpenError(url, family)
+        return breaker, permit
+
+    def _record_circuit(self, breaker, permit, response=None, error=None):
+        """ Records the outcome of an attempt with its circuit breaker:
+            a failure for 5xx responses and transport errors. Requests that
+            weren't sent (raising a SpotifyException) or were cancelled give
+            their permit back.
+        """
+        if breaker is None:
+            return
+        if isinstance(error, SpotifyException) or (
+                error is not None and not isinstance(error, Exception)):
+            breaker.cancel(permit)
+        else:
+            breaker.record(permit, error is None and response.status_code < 500)
+
+    def _send(self, method, url, headers, args):
+        retry = self._retry
+        endpoint = self._endpoint(url)
+        expires = self._expiry()
+        while True:
+            breaker, permit = self._admit_circuit(url, endpoint)
+            try:
+                response = self._attempt(method, url, headers, args, endpoint, expires)
+            except BaseException as error:
+                self._record_circuit(breaker, permit, error=error)
+                # cancelled or interrupted
+                if not isinstance(error, Exception):
+                    raise
+                retry, delay = self._next_error_retry(retry, method, url, error, expires)
+                if retry is None:
+                    raise
+            else:
+                self._record_circuit(breaker, permit, response)
+                self._note_rate_limit(response)
+                retry, delay = self._next_retry(retry, method, url, response)
+                # out of time, the caller gets the response to retry
+                if retry is None or not self._within_deadline(expires, delay):
+                    return response
+            time.sleep(delay)
+
+    def _api_path(self, url):
+        """ Returns the path of an API URL relative to the prefix """
+        if url.startswith(self.prefix):
+            return url[len(self.prefix):].split("?", 1)[0]
+        path = urllibparse.urlsplit(url).path.lstrip("/")
+        return path[3:] if path.startswith("v1/") else path
+
+    def _endpoint(self, url):
+        """ Returns the endpoint of an API URL: its path relative to the
+            prefix, with IDs replaced by ``{id}`` (e.g. ``albums/{id}/tracks``)
+        """
+        segments = self._api_path(url).split("/")
+        for i in range(1, len(segments)):
+            if (segments[i - 1] in self._id_collections
+                    and segments[i] not in ("", "contains")):
+                segments[i] = "{id}"
+        return "/".join(segments)
+
+    def _endpoint_family(self, endpoint):
+        """ Returns the family of an endpoint, the area of the API sharing a
+            circuit breaker: its first path segment, or its first two for
+            ``me`` and ``browse`` endpoints (e.g. ``me/player``)
+        """
+        segments = endpoint.split("/")
+        if segments[0] in ("me", "browse") and len(segments) > 1 and segments[1]:
+            return "/".join(segments[:2])
+        return segments[0]
+
+    def _lookup_response(self, method, url, args, headers):
+        """ Returns the response cache key and time to live of a request,
+            and its cached response if there is one.
+        """
+        key, ttl = self._response_key(method, url, args, headers)
+        if key is None:
+            return None, 0, None
+        return key, ttl, self._cached_response(key, url, self.response_cache.get(key))
+
+    def _response_key(self, method, url, args, headers):
+        if self.response_cache is None:
+            return None, 0
+        return self.response_cache.key_for(
+            method, url, args.get("params"), self.language,
+            self._api_path(url), headers.get("Authorization"),
+        )
 
-            logger.error(f"HTTP Error for {method} to {url} with Params: "
-                         f"{args.get('params')} returned {response.status_code} due to {msg}")
+    def _cached_response(self, key, url, body):
+        if body is None:
+            return None
+        logger.debug(f'Using cached response for {key}')
+        return Response(200, {}, body, url)
+
+    def _store_response(self, key, ttl, response):
+        if key is not None and response.status_code == 200:
+            self.response_cache.set(key, response.content, ttl)
+
+    def _add_conditional_headers(self, method, url, args, headers):
+        """ Adds If-None-Match to GET requests for resources in the ETag
+            cache. Returns the cache key and the cached entry, if any.
+        """
+        if self.etag_cache is None or method != "GET":
+            return None, None
+        key = make_cache_key(method, url, args.get("params"), self.language)
+        entry = self.etag_cache.get(key)
+        if entry is not None:
+            headers["If-None-Match"] = entry[0]
+        return key, entry
+
+    def _revalidate(self, key, entry, response):
+        """ Serves a 304 Not Modified from the ETag cache and remembers
+            the ETag of successful responses.
+        """
+        if key is None:
+            return response
+        if entry is not None:
+            self.etag_cache.record(response.status_code == 304)
+            if response.status_code == 304:
+                logger.debug(f'Not modified, using cached body for {response.url}')
+                return Response(200, response.headers, entry[1], response.url)
+        etag = response.headers.get("ETag")
+        if etag and response.status_code == 200:
+            self.etag_cache.set(key, etag, response.content)
+        return response
+
+    def _handle_response(self, method, url, args, response):
+        if response.status_code >= 400:
+            raise self._build_http_error(method, url, args.get("params"), response)
 
-            raise SpotifyException(
-                response.status_code,
-                -1,
-                f"{response.url}:\n {msg}",
-                reason=reason,
-                headers=response.headers,
+        try:
+            results = self.codec.loads(response.content)
+        except ValueError:
+            results = None
+
+        logger.debug(f'RESULTS: {results}')
+        return results
+
+    def _internal_call(self, method, url, payload, params, cache=True):
+        url, headers, args = self._prepare_request(url, payload, params)
+        headers.update(self._auth_headers())
+
+        logger.debug(f"Sending {method} to {url} with Params: "
+                     f"{args.get('params')} Headers: {headers} and Body: {args.get('data')!r}")
+
+        cache_key, ttl, cached = None, 0, None
+        if cache:
+            cache_key, ttl, cached = self._lookup_response(method, url, args, headers)
+        if cached is not None:
+            return self._handle_response(method, url, args, cached)
+
+        flight_key = self._flight_key(method, url, args, headers)
+        if flight_key is None:
+            response = self._fetch(method, url, headers, args, cache_key, ttl)
+        else:
+            response = self.single_flight.do(
+                flight_key,
+                lambda: self._fetch(method, url, headers, args, cache_key, ttl),
             )
+        return self._handle_response(method, url, args, response)
+
+    def _fetch(self, method, url, headers, args, cache_key, ttl):
+        """ Sends a request that could not be answered from the response
+            cache and returns its response.
+        """
+        key, entry = self._add_conditional_headers(method, url, args, headers)
+        try:
+            response = self._send(method, url, headers, args)
         except requests.exceptions.RetryError as retry_error:
+            # raised by sessions that retry bad status codes themselves
             request = retry_error.request
             logger.error('Max Retries reached')
             try:
@@ -308,11 +935,238 @@ class Spotify:
                 f"{request.path_url}:\n Max Retries",
                 reason=reason
             )
-        except ValueError:
-            results = None
 
-        logger.debug(f'RESULTS: {results}')
-        return results
+        response = self._revalidate(key, entry, response)
+        self._store_response(cache_key, ttl, response)
+        return response
+
+    def _flight_key(self, method, url, args, headers):
+        """ Returns the key concurrent identical requests share a call under,
+            or None if the request should be sent on its own.
+
+            Only GET requests are shared. The key includes the access token,
+            as responses may depend on the user.
+        """
+        if self.single_flight is None or method != "GET":
+            return None
+        return make_cache_key(
+            method, url, args.get("params"), self.language,
+            headers.get("Authorization", ""),
+        )
+
+    def _then(self, result, callback):
+        """ Applies `callback` to the result of an API call.
+
+            Methods that post-process a response go through this hook so
+            that subclasses whose calls return awaitables (see
+            `AsyncSpotify`) can defer the callback until the call completes.
+        """
+        return callback(result)
+
+    def _completed(self, value):
+        """ Returns `value` as the result of an API call would be returned
+            (that is, wrapped in an awaitable by `AsyncSpotify`).
+        """
+        return value
+
+    def _get_several(self, path, ids, **params):
+        """ Gets several entities of a kind with a single request, like
+            `tracks/?ids=...`.
+
+            With a response cache, the entities cached by earlier calls
+            (for several entities, or a single one like `tracks/{id}`) are
+            looked up at once, and only the others are requested.
+        """
+        keys, ttl = self._entity_cache_keys(path, ids, params)
+        if keys is None:
+            return self._get(f"{path}/?ids=" + ",".join(ids), **params)
+        return self._get_several_cached(path, ids, keys, ttl, params)
+
+    def _get_entities(self, path, ids, **params):
+        """ Gets any number of entities of a kind, in chunks of as many IDs
+            as the endpoint accepts (see `_get_chunked`).
+
+            With a response cache, the cached entities are looked up at
+            once for all the IDs, and only the others are requested.
+        """
+        keys, ttl = self._entity_cache_keys(path, ids, params)
+        if keys is None:
+            return self._get_chunked(
+                path, ids,
+                lambda chunk: self._get(f"{path}/?ids=" + ",".join(chunk), **params),
+                path,
+            )
+        return self._get_several_cached(path, ids, keys, ttl, params)
+
+    def _entity_cache_keys(self, path, ids, params):
+        """ Returns the response cache keys of the entities, by ID, and
+            their TTL, or `(None, None)` if they aren't cached one by one
+        """
+        cache = self.response_cache
+        # entities cached per user would need the access token in their keys
+        if cache is None or not ids or cache.is_per_user(
+                f"{path}/{ids[0]}", f"{self.prefix}{path}/{ids[0]}", params):
+            return None, None
+        keys = {}
+        for entity_id in ids:
+            key, ttl = cache.key_for(
+                "GET", f"{self.prefix}{path}/{entity_id}", params, self.language,
+                f"{path}/{entity_id}",
+            )
+            if key is None:
+                return None, None
+            keys[entity_id] = key
+        return keys, ttl
+
+    def _get_several_cached(self, path, ids, keys, ttl, params):
+        return self._drive(self._get_several_cached_steps(path, ids, keys, ttl, params))
+
+    def _get_several_cached_steps(self, path, ids, keys, ttl, params):
+        """ The steps of `_get_several_cached`, for `_drive`, so that
+            `AsyncSpotify` awaits the lookups of an asynchronous cache
+        """
+        found = yield lambda: self.response_cache.get_many(
+            list(dict.fromkeys(keys.values()))
+        )
+        missing = list(dict.fromkeys(i for i in ids if keys[i] not in found))
+        entities = {}
+        if missing:
+            # the entities are cached individually, not as a bulk response
+            result = yield lambda: self._get_chunked(
+                path, missing,
+                lambda chunk: self._internal_call(
+                    "GET", f"{path}/?ids=" + ",".join(chunk), None, dict(params), cache=False
+                ),
+                path,
+            )
+            bodies = {}
+            for entity_id, entity in zip(missing, result[path]):
+                entities[entity_id] = entity
+                if entity is not None:
+                    bodies[keys[entity_id]] = self.codec.dumps(entity).encode("utf-8")
+            if bodies:
+                yield lambda: self.response_cache.set_many(bodies, ttl)
+        for entity_id in ids:
+            if entity_id not in entities:
+                entities[entity_id] = self.codec.loads(found[keys[entity_id]])
+        return {path: [entities[entity_id] for entity_id in ids]}
+
+    def _get_chunked(self, path, ids, fetch, key=None):
+        """ Gets the results for any number of IDs in chunks of as many IDs
+            as the endpoint accepts, fetched concurrently.
+
+            Duplicate IDs are only requested once. The results are returned
+            in the order of `ids`, as a list, or as `{key: [...]}` for
+            endpoints that answer like that (e.g. `{"tracks": [...]}`).
+
+            Parameters:
+                - path - the endpoint, a key of `max_ids_per_request`
+                - ids - a list of IDs
+                - fetch - returns the response for a chunk of IDs
+                - key - the key of the results in a response, if any
+        """
+        unique = list(dict.fromkeys(ids))
+        limit = self.max_ids_per_request[path]
+        chunks = [unique[i:i + limit] for i in range(0, len(unique), limit)] or [[]]
+
+        def merge(responses):
+            if len(chunks) == 1 and len(unique) == len(ids):
+                return responses[0]
+            results = {}
+            for chunk, response in zip(chunks, responses):
+                results.update(zip(chunk, response if key is None else response[key]))
+            merged = [results.get(i) for i in ids]
+            return merged if key is None else {key: merged}
+
+        return self._then(self._map_chunks(fetch, chunks), merge)
+
+    def _map_chunks(self, fetch, chunks, max_workers=None):
+        """ Calls `fetch` for each chunk, with at most `max_workers` (by
+            default `max_concurrent_chunks`, or the adaptive concurrency
+            limit) calls at once, and returns the results in order
+        """
+        if len(chunks) == 1:
+            return [fetch(chunks[0])]
+        max_workers = self._chunk_workers(max_workers)
+        # the chunks are fetched in the context of the caller, e.g. its
+        # `priority` lane, each in a copy of its own
+        contexts = [contextvars.copy_context() for _ in chunks]
+        with ThreadPoolExecutor(min(len(chunks), max_workers)) as pool:
+            return list(pool.map(lambda chunk, context: context.run(fetch, chunk),
+                                 chunks, contexts))
+
+    def _chunk_workers(self, max_workers):
+        """ Returns the number of chunks to fetch at once. With adaptive
+            concurrency, requests wait for it in `_send`, so there are
+            workers enough to reach its maximum.
+        """
+        if max_workers:
+            return max_workers
+        if self.concurrency is not None:
+            return self.concurrency.maximum
+        return self.max_concurrent_chunks
+
+    def _drive(self, steps):
+        """ Runs a generator that yields API calls to make one after the
+            other (as functions without arguments) and is sent back their
+            results. Returns the value the generator returns.
+
+            `AsyncSpotify` awaits each call instead, so the same generator
+            serves both clients.
+        """
+        try:
+            call = next(steps)
+            while True:
+                call = steps.send(call())
+        except StopIteration as stop:
+            return stop.value
+
+    def _playlist_chunks(self, items):
+        size = self.max_playlist_items_per_request
+        return [items[i:i + size] for i in range(0, len(items), size)] or [[]]
+
+    def _get_one(self, path, entity_id, **params):
+        """ Gets a single entity, like `tracks/{id}`. With a batcher, the
+            entity is requested together with those other callers ask for
+            at the same time, in a request for several entities.
+        """
+        if self.batcher is None:
+            return self._get(f"{path}/{entity_id}", **params)
+        return self.batcher.load(
+            (path,) + tuple(sorted(params.items())),
+            entity_id,
+            lambda ids: self._load_several(path, ids, params),
+            self.max_ids_per_request[path],
+        )
+
+    def _load_several(self, path, ids, params):
+        """ Loads a batch of entities for `_get_one`, returning the entity
+            or the exception to raise for each ID
+        """
+        try:
+            entities = self._get_several(path, ids, **params)[path]
+        except SpotifyException as e:
+            # a single invalid ID fails the whole batch
+            if e.http_status != 400 or len(ids) == 1:
+                raise
+            return [self._load_one(path, entity_id, params) for entity_id in ids]
+        return self._or_not_found(path, ids, entities)
+
+    def _load_one(self, path, entity_id, params):
+        try:
+            return self._get(f"{path}/{entity_id}", **params)
+        except SpotifyException as e:
+            return e
+
+    def _or_not_found(self, path, ids, entities):
+        """ Replaces the missing entities (`null`) of a response for several
+            entities with the error a request for the entity would raise
+        """
+        return [
+            SpotifyException(404, -1, f"{self.prefix}{path}/{entity_id}:\n non existing id")
+            if entity is None else entity
+            for entity_id, entity in zip(ids, entities)
+        ]
 
     def _get(self, url, args=None, payload=None, **kwargs):
         if args:
@@ -346,6 +1200,79 @@ class Spotify:
         else:
             return None
 
+    def iter_pages(self, method, *args, **kwargs):
+        """ Yields the pages of a paged result, prefetching the next page
+            while a page is consumed. See `spotipy.pagination.iter_pages`.
+
+            Parameters:
+                - method - the method (or its name) returning the first page,
+                           e.g. `sp.playlist_items`
+                - args, kwargs - the arguments of the method, and `key` and
+                                 `prefetch` (optional). `limit` defaults to
+                                 the largest page size of the endpoint
+
+            Example::
+
+                for page in sp.iter_pages(sp.search, "abba", type="track"):
+                    ...
+        """
+        return pagination.iter_pages(self, method, *args, **kwargs)
+
+    def iter_items(self, method, *args, **kwargs):
+        """ Yields the items of all the pages of a paged result, like
+            `iter_pages`
+
+            Example::
+
+                for item in sp.iter_items(sp.playlist_items, playlist_id):
+                    print(item["track"]["name"])
+        """
+        return pagination.iter_items(self, method, *args, **kwargs)
+
+    def fetch_all(self, method, *args, **kwargs):
+        """ Returns the items of all the pages of a paged result. After the
+            first page, the other pages are requested at once from their
+            offsets. See `spotipy.pagination.fetch_all`.
+
+            Parameters:
+                - method - the method (or its name) returning the first page,
+                           e.g. `sp.playlist_items`
+                - args, kwargs - the arguments of the method, and `key` and
+                                 `max_workers` (optional)
+
+            Example::
+
+                items = sp.fetch_all(sp.playlist_items, playlist_id)
+        """
+        return pagination.fetch_all(self, method, *args, **kwargs)
+
+    def cursor_stream(self, method, *args, **kwargs):
+        """ Returns a `spotipy.pagination.CursorStream` over the items of
+            `current_user_followed_artists` or `current_user_recently_played`,
+            with a resume token to persist and pass as `resume_token` to
+            continue where the stream stopped.
+
+            Example::
+
+                stream = sp.cursor_stream(sp.current_user_followed_artists)
+                for artist in stream:
+                    ...
+                token = stream.resume_token
+        """
+        return pagination.CursorStream(self, method, *args, **kwargs)
+
+    def paged(self, method, *args, **kwargs):
+        """ Returns a `spotipy.pagination.PagedSequence`, a lazy sequence over
+            the items of an offset-paged result that only fetches the pages
+            covering the items asked for.
+
+            Example::
+
+                tracks = sp.paged(sp.playlist_items, playlist_id)
+                last = tracks[-20:]
+        """
+        return pagination.PagedSequence(self, method, *args, **kwargs)
+
     def previous(self, result):
         """ returns the previous result given a paged result
 
@@ -366,18 +1293,18 @@ class Spotify:
         """
 
         trid = self._get_id("track", track_id)
-        return self._get("tracks/" + trid, market=market)
+        return self._get_one("tracks", trid, market=market)
 
     def tracks(self, tracks, market=None):
         """ returns a list of tracks given a list of track IDs, URIs, or URLs
 
             Parameters:
-                - tracks - a list of spotify URIs, URLs or IDs. Maximum: 50 IDs.
+                - tracks - a list of spotify URIs, URLs or IDs
                 - market - an ISO 3166-1 alpha-2 country code.
         """
 
         tlist = [self._get_id("track", t) for t in tracks]
-        return self._get("tracks/?ids=" + ",".join(tlist), market=market)
+        return self._get_entities("tracks", tlist, market=market)
 
     def artist(self, artist_id):
         """ returns a single artist given the artist's ID, URI or URL
@@ -387,7 +1314,7 @@ class Spotify:
         """
 
         trid = self._get_id("artist", artist_id)
-        return self._get("artists/" + trid)
+        return self._get_one("artists", trid)
 
     def artists(self, artists):
         """ returns a list of artists given the artist IDs, URIs, or URLs
@@ -397,7 +1324,7 @@ class Spotify:
         """
 
         tlist = [self._get_id("artist", a) for a in artists]
-        return self._get("artists/?ids=" + ",".join(tlist))
+        return self._get_entities("artists", tlist)
 
     def artist_albums(
         self, artist_id, album_type=None, include_groups=None, country=None, limit=20, offset=0
@@ -476,10 +1403,7 @@ class Spotify:
         """
 
         trid = self._get_id("album", album_id)
-        if market is not None:
-            return self._get("albums/" + trid + '?market=' + market)
-        else:
-            return self._get("albums/" + trid)
+        return self._get_one("albums", trid, market=market)
 
     def album_tracks(self, album_id, limit=50, offset=0, market=None):
         """ Get Spotify catalog information about an album's tracks
@@ -506,10 +1430,7 @@ class Spotify:
         """
 
         tlist = [self._get_id("album", a) for a in albums]
-        if market is not None:
-            return self._get("albums/?ids=" + ",".join(tlist) + '&market=' + market)
-        else:
-            return self._get("albums/?ids=" + ",".join(tlist))
+        return self._get_entities("albums", tlist, market=market)
 
     def show(self, show_id, market=None):
         """ returns a single show given the show's ID, URIs or URL
@@ -539,7 +1460,7 @@ class Spotify:
         """
 
         tlist = [self._get_id("show", s) for s in shows]
-        return self._get("shows/?ids=" + ",".join(tlist), market=market)
+        return self._get_entities("shows", tlist, market=market)
 
     def show_episodes(self, show_id, limit=50, offset=0, market=None):
         """ Get Spotify catalog information about a show's episodes
@@ -573,7 +1494,7 @@ class Spotify:
         """
 
         trid = self._get_id("episode", episode_id)
-        return self._get("episodes/" + trid, market=market)
+        return self._get_one("episodes", trid, market=market)
 
     def episodes(self, episodes, market=None):
         """ returns a list of episodes given the episode IDs, URIs, or URLs
@@ -588,7 +1509,7 @@ class Spotify:
         """
 
         tlist = [self._get_id("episode", e) for e in episodes]
-        return self._get("episodes/?ids=" + ",".join(tlist), market=market)
+        return self._get_entities("episodes", tlist, market=market)
 
     def search(self, q, limit=10, offset=0, type="track", market=None):
         """ searches for an item
@@ -639,7 +1560,7 @@ class Spotify:
             "Searching multiple markets is poorly performing.",
             UserWarning,
         )
-        return self._search_multiple_markets(q, limit, offset, type, markets, total)
+        return self._drive(self._search_markets_steps(q, limit, offset, type, markets, total))
 
     def user(self, user):
         """ Gets basic profile information about a Spotify User
@@ -1163,6 +2084,9 @@ class Spotify:
     ):
         """ Adds tracks/episodes to a playlist
 
+            More than 100 items are added with a request per 100 items, in
+            order, and the response to the last request is returned.
+
             Parameters:
                 - playlist_id - the id of the playlist
                 - items - a list of track/episode URIs or URLs
@@ -1170,25 +2094,43 @@ class Spotify:
         """
         plid = self._get_id("playlist", playlist_id)
         ftracks = [self._get_uri("track", tid) for tid in items]
-        return self._post(
-            f"playlists/{plid}/tracks",
-            payload=ftracks,
-            position=position,
-        )
+        return self._drive(self._add_items_steps(plid, ftracks, position))
+
+    def _add_items_steps(self, plid, uris, position=None):
+        response = None
+        offset = 0
+        for chunk in self._playlist_chunks(uris):
+            response = yield lambda: self._post(
+                f"playlists/{plid}/tracks",
+                payload=chunk,
+                position=None if position is None else position + offset,
+            )
+            offset += len(chunk)
+        return response
 
     def playlist_replace_items(self, playlist_id, items):
         """ Replace all tracks/episodes in a playlist
 
+            More than 100 items are set by replacing the tracks with the
+            first 100 items and adding the others 100 at a time, and the
+            response to the last request is returned.
+
             Parameters:
                 - playlist_id - the id of the playlist
                 - items - list of track/episode ids to comprise playlist
         """
         plid = self._get_id("playlist", playlist_id)
         ftracks = [self._get_uri("track", tid) for tid in items]
-        payload = {"uris": ftracks}
-        return self._put(
-            f"playlists/{plid}/tracks", payload=payload
+        return self._drive(self._replace_items_steps(plid, ftracks))
+
+    def _replace_items_steps(self, plid, uris):
+        first, *rest = self._playlist_chunks(uris)
+        response = yield lambda: self._put(
+            f"playlists/{plid}/tracks", payload={"uris": first}
         )
+        if rest:
+            response = yield from self._add_items_steps(plid, uris[len(first):])
+        return response
 
     def playlist_reorder_items(
         self,
@@ -1226,6 +2168,10 @@ class Spotify:
     ):
         """ Removes all occurrences of the given tracks/episodes from the given playlist
 
+            More than 100 distinct items are removed with a request per 100
+            items, each against the snapshot the previous one returned, and
+            the response to the last request is returned.
+
             Parameters:
                 - playlist_id - the id of the playlist
                 - items - list of track/episode ids to remove from the playlist
@@ -1234,13 +2180,21 @@ class Spotify:
         """
 
         plid = self._get_id("playlist", playlist_id)
-        ftracks = [self._get_uri("track", tid) for tid in items]
-        payload = {"tracks": [{"uri": track} for track in ftracks]}
-        if snapshot_id:
-            payload["snapshot_id"] = snapshot_id
-        return self._delete(
-            f"playlists/{plid}/tracks", payload=payload
-        )
+        ftracks = list(dict.fromkeys(self._get_uri("track", tid) for tid in items))
+        return self._drive(self._remove_items_steps(plid, ftracks, snapshot_id))
+
+    def _remove_items_steps(self, plid, uris, snapshot_id=None):
+        response = None
+        for chunk in self._playlist_chunks(uris):
+            payload = {"tracks": [{"uri": track} for track in chunk]}
+            if snapshot_id:
+                payload["snapshot_id"] = snapshot_id
+            response = yield lambda: self._delete(
+                f"playlists/{plid}/tracks", payload=payload
+            )
+            if isinstance(response, dict):
+                snapshot_id = response.get("snapshot_id", snapshot_id)
+        return response
 
     def playlist_remove_specific_occurrences_of_items(
         self, playlist_id, items, snapshot_id=None
@@ -1368,7 +2322,10 @@ class Spotify:
                 - albums - a list of album URIs, URLs or IDs
         """
         alist = [self._get_id("album", a) for a in albums]
-        return self._get("me/albums/contains?ids=" + ",".join(alist))
+        return self._get_chunked(
+            "me/albums/contains", alist,
+            lambda chunk: self._get("me/albums/contains?ids=" + ",".join(chunk)),
+        )
 
     def current_user_saved_tracks(self, limit=20, offset=0, market=None):
         """ Gets a list of the tracks saved in the current authorized user's
@@ -1416,7 +2373,10 @@ class Spotify:
         tlist = []
         if tracks is not None:
             tlist = [self._get_id("track", t) for t in tracks]
-        return self._get("me/tracks/contains?ids=" + ",".join(tlist))
+        return self._get_chunked(
+            "me/tracks/contains", tlist,
+            lambda chunk: self._get("me/tracks/contains?ids=" + ",".join(chunk)),
+        )
 
     def current_user_saved_episodes(self, limit=20, offset=0, market=None):
         """ Gets a list of the episodes saved in the current authorized user's
@@ -1464,7 +2424,10 @@ class Spotify:
         elist = []
         if episodes is not None:
             elist = [self._get_id("episode", e) for e in episodes]
-        return self._get("me/episodes/contains?ids=" + ",".join(elist))
+        return self._get_chunked(
+            "me/episodes/contains", elist,
+            lambda chunk: self._get("me/episodes/contains?ids=" + ",".join(chunk)),
+        )
 
     def current_user_saved_shows(self, limit=20, offset=0, market=None):
         """ Gets a list of the shows saved in the current authorized user's
@@ -1505,7 +2468,10 @@ class Spotify:
                 - shows - a list of show URIs, URLs or IDs
         """
         slist = [self._get_id("show", s) for s in shows]
-        return self._get("me/shows/contains?ids=" + ",".join(slist))
+        return self._get_chunked(
+            "me/shows/contains", slist,
+            lambda chunk: self._get("me/shows/contains?ids=" + ",".join(chunk)),
+        )
 
     def current_user_followed_artists(self, limit=20, after=None):
         """ Gets a list of the artists followed by the current authorized user
@@ -1531,8 +2497,11 @@ class Spotify:
         idlist = []
         if ids is not None:
             idlist = [self._get_id("artist", i) for i in ids]
-        return self._get(
-            "me/following/contains", ids=",".join(idlist), type="artist"
+        return self._get_chunked(
+            "me/following/contains", idlist,
+            lambda chunk: self._get(
+                "me/following/contains", ids=",".join(chunk), type="artist"
+            ),
         )
 
     def current_user_following_users(self, ids=None):
@@ -1546,8 +2515,11 @@ class Spotify:
         idlist = []
         if ids is not None:
             idlist = [self._get_id("user", i) for i in ids]
-        return self._get(
-            "me/following/contains", ids=",".join(idlist), type="user"
+        return self._get_chunked(
+            "me/following/contains", idlist,
+            lambda chunk: self._get(
+                "me/following/contains", ids=",".join(chunk), type="user"
+            ),
         )
 
     def current_user_top_artists(
@@ -1884,6 +2856,10 @@ class Spotify:
         else:
             tlist = [self._get_id("track", t) for t in tracks]
             results = self._get("audio-features/?ids=" + ",".join(tlist))
+        return self._then(results, self._unwrap_audio_features)
+
+    @staticmethod
+    def _unwrap_audio_features(results):
         # the response has changed, look for the new style first, and if
         # it's not there, fallback on the old style
         if "audio_features" in results:
@@ -2023,7 +2999,7 @@ class Spotify:
         if state not in ["track", "context", "off"]:
             logger.warning("Invalid state")
             return
-        self._put(
+        return self._put(
             self._append_device_id(
                 f"me/player/repeat?state={state}", device_id
             )
@@ -2042,7 +3018,7 @@ class Spotify:
         if volume_percent < 0 or volume_percent > 100:
             logger.warning("Volume must be between 0 and 100, inclusive")
             return
-        self._put(
+        return self._put(
             self._append_device_id(
                 f"me/player/volume?volume_percent={volume_percent}",
                 device_id,
@@ -2060,7 +3036,7 @@ class Spotify:
             logger.warning("state must be a boolean")
             return
         state = str(state).lower()
-        self._put(
+        return self._put(
             self._append_device_id(
                 f"me/player/shuffle?state={state}", device_id
             )
@@ -2147,7 +3123,9 @@ class Spotify:
     def _is_uri(self, uri):
         return re.search(Spotify._regex_spotify_uri, uri) is not None
 
-    def _search_multiple_markets(self, q, limit, offset, type, markets, total):
+    def _search_markets_steps(self, q, limit, offset, type, markets, total):
+        # markets are searched one after another, as `limit` depends on the
+        # number of results that have been collected so far
         if total and limit > total:
             limit = total
             warnings.warn(f"limit was auto-adjusted to equal {total} "
@@ -2159,7 +3137,7 @@ class Spotify:
         count = 0
 
         for country in markets:
-            result = self._get(
+            result = yield lambda: self._get(
                 "search", q=q, limit=limit, offset=offset, type=type, market=country
             )
             for item_type in item_types:
@@ -2205,12 +3183,7 @@ class Spotify:
         - market - an ISO 3166-1 alpha-2 country code.
         """
         audiobook_ids = [self._get_id("audiobook", id) for id in ids]
-        endpoint = f"audiobooks?ids={','.join(audiobook_ids)}"
-
-        if market:
-            endpoint += f'&market={market}'
-
-        return self._get(endpoint)
+        return self._get_entities("audiobooks", audiobook_ids, market=market or None)
 
     def get_audiobook_chapters(self, id, market=None, limit=20, offset=0):
         """ Get Spotify catalog information about an audiobook’s chapters.
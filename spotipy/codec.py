@@ -0,0 +1,98 @@
+""" JSON codecs used for API responses, request payloads and token caches """
+
+__all__ = [
+    "JSONCodec",
+    "OrjsonCodec",
+    "MsgspecCodec",
+    "get_codec",
+]
+
+import json
+
+
+class JSONCodec:
+    """
+    Encodes and decodes JSON with the standard library.
+
+    Custom codecs need the same two methods: `loads`, which takes bytes or
+    str and raises a ValueError on invalid input, and `dumps`, which
+    returns a str.
+    """
+
+    def __init__(self, encoder_cls=None):
+        """
+        Parameters:
+             * encoder_cls: Optional, a `json.JSONEncoder` subclass used by `dumps`
+        """
+        self.encoder_cls = encoder_cls
+
+    def loads(self, data):
+        return json.loads(data)
+
+    def dumps(self, obj):
+        return json.dumps(obj, cls=self.encoder_cls)
+
+
+class OrjsonCodec:
+    """ Encodes and decodes JSON with orjson (``pip install orjson``) """
+
+    def __init__(self):
+        import orjson
+        self._orjson = orjson
+
+    def loads(self, data):
+        return self._orjson.loads(data)
+
+    def dumps(self, obj):
+        return self._orjson.dumps(obj).decode("utf-8")
+
+
+class MsgspecCodec:
+    """ Encodes and decodes JSON with msgspec (``pip install msgspec``) """
+
+    def __init__(self):
+        import msgspec
+        self._msgspec = msgspec
+        self._decoder = msgspec.json.Decoder()
+        self._encoder = msgspec.json.Encoder()
+
+    def loads(self, data):
+        try:
+            return self._decoder.decode(data)
+        except self._msgspec.DecodeError as error:
+            raise ValueError(str(error)) from error
+
+    def dumps(self, obj):
+        return self._encoder.encode(obj).decode("utf-8")
+
+
+_CODECS = {
+    "json": JSONCodec,
+    "orjson": OrjsonCodec,
+    "msgspec": MsgspecCodec,
+}
+
+
+def get_codec(codec=None):
+    """ Returns a codec instance
+
+        Parameters:
+            - codec - a codec instance, one of "json", "orjson" or "msgspec",
+                      or None to use the fastest installed library
+                      (orjson, then msgspec, then the standard library)
+    """
+    if codec is None:
+        for codec_cls in (OrjsonCodec, MsgspecCodec):
+            try:
+                return codec_cls()
+            except ImportError:
+                pass
+        return JSONCodec()
+    if isinstance(codec, str):
+        try:
+            return _CODECS[codec]()
+        except KeyError:
+            raise ValueError(
+                f"Unknown codec {codec!r}, expected one of {', '.join(_CODECS)}"
+            ) from None
+    return codec
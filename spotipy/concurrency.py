@@ -0,0 +1,362 @@
+""" Helpers for making concurrent calls to the Web API """
+
+__all__ = [
+    "SingleFlight",
+    "AsyncSingleFlight",
+    "Batcher",
+    "AsyncBatcher",
+    "AdaptiveConcurrency",
+    "AsyncAdaptiveConcurrency",
+]
+
+import asyncio
+import threading
+import time
+
+
+class _Call:
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key: while a call is in
+    flight, threads making the same call wait for it and share its result
+    or exception instead of making the call again.
+
+    Example usage::
+
+        flight = SingleFlight()
+        result = flight.do(key, lambda: fetch(key))
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn):
+        """ Calls `fn` unless a call with the same key is in flight, and
+            returns (or raises) the outcome of the call for the key
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def __len__(self):
+        return len(self._calls)
+
+
+class AsyncSingleFlight:
+    """
+    Coalesces concurrent calls with the same key in an event loop, like
+    `SingleFlight`. `fn` returns an awaitable, which runs in a task of
+    its own, so a caller being cancelled doesn't cancel the call for the
+    other callers waiting on it.
+    """
+
+    def __init__(self):
+        self._calls = {}
+
+    async def do(self, key, fn):
+        """ Awaits `fn()` unless a call with the same key is in flight, and
+            returns (or raises) the outcome of the call for the key
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = self._calls[key] = asyncio.ensure_future(fn())
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+        return await asyncio.shield(task)
+
+    def __len__(self):
+        return len(self._calls)
+
+
+def _result_for(results, item):
+    result = results[item]
+    if isinstance(result, BaseException):
+        raise result
+    return result
+
+
+class _Batch:
+
+    def __init__(self):
+        self.items = {}
+        self.full = threading.Event()
+        self.done = threading.Event()
+        self.results = None
+        self.error = None
+
+
+class Batcher:
+    """
+    Collects the loads of single items made by several threads within
+    `window` seconds and loads them with one call, like a DataLoader.
+
+    Loads are grouped by `group` (e.g. the endpoint and its parameters).
+    The first thread to load an item of a group waits for the window to
+    pass, or for `max_size` distinct items to be collected, then calls
+    `load_many` with the items and hands the results out to the waiting
+    threads. `load_many` returns a result per item, in order; a result
+    that is an exception is raised to the threads that loaded the item.
+
+    Example usage::
+
+        batcher = Batcher(window=0.005)
+        track = batcher.load("tracks", track_id, load_tracks, 50)
+    """
+
+    def __init__(self, window=0.005):
+        self.window = window
+        self._lock = threading.Lock()
+        self._batches = {}
+
+    def load(self, group, item, load_many, max_size):
+        """ Adds `item` to the open batch of `group` and returns (or raises)
+            its result once the batch was loaded
+        """
+        with self._lock:
+            batch = self._batches.get(group)
+            leader = batch is None
+            if leader:
+                batch = self._batches[group] = _Batch()
+            batch.items[item] = None
+            if len(batch.items) >= max_size:
+                # later loads start a new batch
+                del self._batches[group]
+                batch.full.set()
+
+        if not leader:
+            batch.done.wait()
+        else:
+            batch.full.wait(self.window)
+            with self._lock:
+                if self._batches.get(group) is batch:
+                    del self._batches[group]
+            items = list(batch.items)
+            try:
+                batch.results = dict(zip(items, load_many(items)))
+            except BaseException as error:
+                batch.error = error
+            finally:
+                batch.done.set()
+
+        if batch.error is not None:
+            raise batch.error
+        return _result_for(batch.results, item)
+
+
+class _AsyncBatch:
+
+    def __init__(self, future):
+        self.items = {}
+        self.future = future
+        self.timer = None
+
+
+class AsyncBatcher:
+    """
+    Collects the loads of single items made within `window` seconds in an
+    event loop and loads them with one call, like `Batcher`. `load_many`
+    returns an awaitable. With a window of 0, the batch holds the loads
+    made before the event loop next runs its callbacks, such as those of
+    the tasks started by a single `asyncio.gather`.
+    """
+
+    def __init__(self, window=0):
+        self.window = window
+        self._batches = {}
+
+    async def load(self, group, item, load_many, max_size):
+        """ Adds `item` to the open batch of `group` and returns (or raises)
+            its result once the batch was loaded
+        """
+        batch = self._batches.get(group)
+        if batch is None:
+            loop = asyncio.get_running_loop()
+            batch = self._batches[group] = _AsyncBatch(loop.create_future())
+            batch.timer = loop.call_later(self.window, self._dispatch, group, batch, load_many)
+        batch.items[item] = None
+        if len(batch.items) >= max_size:
+            batch.timer.cancel()
+            self._dispatch(group, batch, load_many)
+        results = await asyncio.shield(batch.future)
+        return _result_for(results, item)
+
+    def _dispatch(self, group, batch, load_many):
+        if self._batches.get(group) is batch:
+            del self._batches[group]
+        items = list(batch.items)
+
+        def done(task):
+            if task.cancelled():
+                batch.future.cancel()
+            elif task.exception() is not None:
+                batch.future.set_exception(task.exception())
+            else:
+                batch.future.set_result(dict(zip(items, task.result())))
+
+        asyncio.ensure_future(load_many(items)).add_done_callback(done)
+
+
+class AdaptiveConcurrency:
+    """
+    Limits the number of requests in flight, adapting the limit to how the
+    API copes (additive increase, multiplicative decrease, as TCP does).
+
+    Every healthy response raises the limit by `1 / limit`, i.e. by one
+    once a full limit of requests succeeded. A 429, a 5xx, an error or a
+    response more than `latency_tolerance` times slower than the average
+    multiplies it by `decrease`. Responses to requests sent before the
+    last decrease don't decrease it again, so a burst of failures counts
+    once.
+
+    `limit` and `in_flight` can be read at any time, e.g. to export them
+    as metrics. Example usage::
+
+        concurrency = AdaptiveConcurrency(initial=4, maximum=32)
+        with concurrency:
+            started = time.monotonic()
+            response = send(request)
+        concurrency.record(response.status_code, time.monotonic() - started)
+    """
+
+    def __init__(
+        self,
+        initial=4,
+        minimum=1,
+        maximum=32,
+        decrease=0.5,
+        latency_tolerance=2.0,
+        clock=time.monotonic,
+    ):
+        """
+        Parameters:
+            - initial - the limit to start with
+            - minimum - the lowest the limit goes
+            - maximum - the highest the limit goes
+            - decrease - the factor to cut the limit by
+            - latency_tolerance - how many times slower than the average
+              a response may be before it counts as a sign of overload
+            - clock - returns the current time in seconds
+        """
+        if not 1 <= minimum <= initial <= maximum:
+            raise ValueError("expected 1 <= minimum <= initial <= maximum")
+        if not 0 < decrease < 1:
+            raise ValueError("decrease must be between 0 and 1")
+        self.minimum = minimum
+        self.maximum = maximum
+        self.decrease = decrease
+        self.latency_tolerance = latency_tolerance
+        self.in_flight = 0
+        self._limit = float(initial)
+        self._clock = clock
+        self._average_latency = None
+        self._last_decrease = float("-inf")
+        self._lock = threading.Condition()
+
+    @property
+    def limit(self):
+        """ The number of requests allowed in flight """
+        return int(self._limit)
+
+    def record(self, status, latency):
+        """ Adjusts the limit for a response
+
+            Parameters:
+                - status - the status code of the response, or None if the
+                  request failed without one (e.g. it timed out)
+                - latency - the number of seconds the response took
+        """
+        with self._lock:
+            now = self._clock()
+            healthy = status is not None and status != 429 and status < 500
+            average = self._average_latency
+            if healthy and average is None:
+                self._average_latency = latency
+            elif healthy:
+                self._average_latency += 0.1 * (latency - average)
+                healthy = latency <= average * self.latency_tolerance
+            if healthy:
+                self._limit = min(self.maximum, self._limit + 1 / self._limit)
+                self._wake()
+            elif now - latency >= self._last_decrease:
+                self._limit = max(self.minimum, self._limit * self.decrease)
+                self._last_decrease = now
+
+    def acquire(self):
+        """ Waits until a request may be sent and counts it as in flight """
+        with self._lock:
+            while self.in_flight >= self.limit:
+                self._lock.wait()
+            self.in_flight += 1
+
+    def release(self):
+        """ Counts a request as done """
+        with self._lock:
+            self.in_flight -= 1
+            self._wake()
+
+    def _wake(self):
+        self._lock.notify_all()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+
+
+class AsyncAdaptiveConcurrency(AdaptiveConcurrency):
+    """
+    An `AdaptiveConcurrency` for the tasks of an event loop: `acquire`
+    waits without blocking the loop, and it is used with `async with`.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._waiters = []
+
+    async def acquire(self):
+        while self.in_flight >= self.limit:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            await waiter
+        self.in_flight += 1
+
+    def _wake(self):
+        waiters, self._waiters = self._waiters, []
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.release()
@@ -21,6 +21,33 @@ class SpotifyException(SpotifyBaseException):
                 f"reason: {self.reason}")
 
 
+class SpotifyOverloadedError(SpotifyException):
+    """ A request was turned away by the client's scheduler, without being
+        sent, because too many requests of its lane were waiting
+    """
+
+    def __init__(self, lane, reason):
+        self.lane = lane
+        super().__init__(None, -1, f"Overloaded: {lane} request {reason}", reason=reason)
+
+
+class SpotifyDeadlineExceededError(SpotifyException):
+    """ The deadline of a call expired before it could be completed """
+
+    def __init__(self, url):
+        super().__init__(None, -1, f"{url}:\n Deadline exceeded")
+
+
+class SpotifyCircuitOpenError(SpotifyException):
+    """ A request was turned away without being sent, because the circuit
+        breaker of its endpoint family is open
+    """
+
+    def __init__(self, url, family):
+        self.family = family
+        super().__init__(None, -1, f"{url}:\n Circuit open for {family}")
+
+
 class SpotifyOauthError(SpotifyBaseException):
     """ Error during Auth Code or Implicit Grant flow """
 
@@ -0,0 +1,80 @@
+""" Hedged requests cutting the tail latency of idempotent GET requests """
+
+__all__ = ["HedgePolicy"]
+
+import threading
+
+from spotipy.timeouts import LatencyTracker
+
+
+class HedgePolicy:
+    """
+    Decides when a GET request gets a hedge: once it went unanswered for
+    the `percentile` of the latencies observed for its endpoint (but at
+    least `minimum` seconds), the same request is sent again on another
+    connection. The first response is used: `AsyncSpotify` cancels the
+    other request, while `Spotify`, which can't interrupt a request being
+    sent, drops its response. Until `min_samples` latencies were observed
+    for an endpoint, its requests aren't hedged.
+
+    Hedges take their own slot of the client's scheduler and adaptive
+    concurrency limit, and their own place with its rate limiter, like
+    any other request, so they never send more requests than those allow.
+
+    Example usage::
+
+        hedging = HedgePolicy(percentile=0.95, endpoints={"tracks/{id}"})
+        sp = spotipy.Spotify(auth_manager=..., hedging=hedging)
+    """
+
+    def __init__(self, percentile=0.95, minimum=0.01, min_samples=20, endpoints=None,
+                 tracker=None):
+        """
+        Parameters:
+            - percentile - the quantile of the latencies to wait for
+            - minimum - the shortest wait before a hedge, in seconds
+            - min_samples - the number of latencies to observe first
+            - endpoints - the endpoints (such as ``albums/{id}``) to hedge
+              requests to, or None for all of them
+            - tracker - a `LatencyTracker`, to share it between clients
+        """
+        self.percentile = percentile
+        self.minimum = minimum
+        self.min_samples = min_samples
+        self.endpoints = None if endpoints is None else frozenset(endpoints)
+        self.tracker = tracker or LatencyTracker()
+        self.hedged = 0
+        self.won = 0
+        self._lock = threading.Lock()
+
+    def record(self, endpoint, seconds):
+        self.tracker.record(endpoint, seconds)
+
+    def delay_for(self, method, endpoint):
+        """ Returns the number of seconds to wait for the response to a
+            request before sending its hedge, or None not to hedge it
+        """
+        if method != "GET":
+            return None
+        if self.endpoints is not None and endpoint not in self.endpoints:
+            return None
+        if self.tracker.count(endpoint) < self.min_samples:
+            return None
+        return max(self.minimum, self.tracker.percentile(endpoint, self.percentile))
+
+    def count_hedge(self):
+        """ Counts a hedge that was sent """
+        with self._lock:
+            self.hedged += 1
+
+    def count_won(self):
+        """ Counts a hedge whose response was used """
+        with self._lock:
+            self.won += 1
+
+    def stats(self):
+        """ Returns the number of hedges sent, and of those that answered
+            first
+        """
+        with self._lock:
+            return {"hedged": self.hedged, "won": self.won}
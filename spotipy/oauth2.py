@@ -22,6 +22,7 @@ import requests
 
 from spotipy.cache_handler import CacheFileHandler, CacheHandler
 from spotipy.exceptions import SpotifyOauthError, SpotifyStateError
+from spotipy.transport import RequestsTransport
 from spotipy.util import (CLIENT_CREDS_ENV_VARS, REQUESTS_SESSION,
                           get_host_port, normalize_scope)
 
@@ -45,8 +46,10 @@ def _ensure_value(value, env_key):
 
 
 class SpotifyAuthBase:
-    def __init__(self, requests_session):
-        if isinstance(requests_session, requests.Session):
+    def __init__(self, requests_session, transport=None):
+        if transport is not None:
+            self._session = None
+        elif isinstance(requests_session, requests.Session):
             self._session = requests_session
         else:
             if requests_session:  # Build a new session.
@@ -54,6 +57,7 @@ class SpotifyAuthBase:
             else:  # Use the Requests API module as a "session".
                 from requests import api
                 self._session = api
+        self._transport = transport or RequestsTransport(self._session)
 
     def _normalize_scope(self, scope):
         return normalize_scope(scope)
@@ -102,8 +106,27 @@ class SpotifyAuthBase:
         )
         return needle_scope <= haystack_scope
 
+    def _post_token_request(self, payload, headers):
+        logger.debug(f"Sending POST request to {self.OAUTH_TOKEN_URL} with Headers: "
+                     f"{headers} and Body: {payload}")
+
+        response = self._transport.request(
+            "POST",
+            self.OAUTH_TOKEN_URL,
+            data=payload,
+            headers=headers,
+            proxies=self.proxies,
+            timeout=self.requests_timeout,
+        )
+        if response.status_code >= 400:
+            raise self._build_oauth_error(response)
+        return response.json()
+
     def _handle_oauth_error(self, http_error):
-        response = http_error.response
+        raise self._build_oauth_error(http_error.response)
+
+    @staticmethod
+    def _build_oauth_error(response):
         try:
             error_payload = response.json()
             error = error_payload.get('error')
@@ -116,7 +139,7 @@ class SpotifyAuthBase:
             error = response.text or None
             error_description = None
 
-        raise SpotifyOauthError(
+        return SpotifyOauthError(
             f'error: {error}, error_description: {error_description}',
             error=error,
             error_description=error_description
@@ -138,7 +161,8 @@ class SpotifyClientCredentials(SpotifyAuthBase):
         proxies=None,
         requests_session=True,
         requests_timeout=None,
-        cache_handler=None
+        cache_handler=None,
+        transport=None
     ):
         """
         Creates a Client Credentials Flow Manager.
@@ -164,10 +188,12 @@ class SpotifyClientCredentials(SpotifyAuthBase):
                               getting and saving cached authorization tokens.
                               Optional, will otherwise use `CacheFileHandler`.
                               (takes precedence over `cache_path` and `username`)
+             * transport: Optional, a `spotipy.transport.Transport` to send token
+                          requests with (takes precedence over `requests_session`)
 
         """
 
-        super().__init__(requests_session)
+        super().__init__(requests_session, transport)
 
         self.client_id = client_id
         self.client_secret = client_secret
@@ -219,23 +245,7 @@ class SpotifyClientCredentials(SpotifyAuthBase):
             self.client_id, self.client_secret
         )
 
-        logger.debug(f"Sending POST request to {self.OAUTH_TOKEN_URL} with Headers: "
-                     f"{headers} and Body: {payload}")
-
-        try:
-            response = self._session.post(
-                self.OAUTH_TOKEN_URL,
-                data=payload,
-                headers=headers,
-                verify=True,
-                proxies=self.proxies,
-                timeout=self.requests_timeout,
-            )
-            response.raise_for_status()
-            token_info = response.json()
-            return token_info
-        except requests.exceptions.HTTPError as http_error:
-            self._handle_oauth_error(http_error)
+        return self._post_token_request(payload, headers)
 
     def _add_custom_values_to_token_info(self, token_info):
         """
@@ -267,7 +277,8 @@ class SpotifyOAuth(SpotifyAuthBase):
             requests_session=True,
             requests_timeout=None,
             open_browser=True,
-            cache_handler=None
+            cache_handler=None,
+            transport=None
     ):
         """
         Creates a SpotifyOAuth object
@@ -294,9 +305,11 @@ class SpotifyOAuth(SpotifyAuthBase):
                               getting and saving cached authorization tokens.
                               Optional, will otherwise use `CacheFileHandler`.
                               (takes precedence over `cache_path` and `username`)
+             * transport: Optional, a `spotipy.transport.Transport` to send token
+                          requests with (takes precedence over `requests_session`)
         """
 
-        super().__init__(requests_session)
+        super().__init__(requests_session, transport)
 
         self.client_id = client_id
         self.client_secret = client_secret
@@ -520,25 +533,10 @@ class SpotifyOAuth(SpotifyAuthBase):
 
         headers = self._make_authorization_headers()
 
-        logger.debug(f"Sending POST request to {self.OAUTH_TOKEN_URL} with Headers: "
-                     f"{headers} and Body: {payload}")
-
-        try:
-            response = self._session.post(
-                self.OAUTH_TOKEN_URL,
-                data=payload,
-                headers=headers,
-                verify=True,
-                proxies=self.proxies,
-                timeout=self.requests_timeout,
-            )
-            response.raise_for_status()
-            token_info = response.json()
-            token_info = self._add_custom_values_to_token_info(token_info)
-            self.cache_handler.save_token_to_cache(token_info)
-            return token_info if as_dict else token_info["access_token"]
-        except requests.exceptions.HTTPError as http_error:
-            self._handle_oauth_error(http_error)
+        token_info = self._post_token_request(payload, headers)
+        token_info = self._add_custom_values_to_token_info(token_info)
+        self.cache_handler.save_token_to_cache(token_info)
+        return token_info if as_dict else token_info["access_token"]
 
     def refresh_access_token(self, refresh_token):
         payload = {
@@ -548,26 +546,12 @@ class SpotifyOAuth(SpotifyAuthBase):
 
         headers = self._make_authorization_headers()
 
-        logger.debug(f"Sending POST request to {self.OAUTH_TOKEN_URL} with Headers: "
-                     f"{headers} and Body: {payload}")
-
-        try:
-            response = self._session.post(
-                self.OAUTH_TOKEN_URL,
-                data=payload,
-                headers=headers,
-                proxies=self.proxies,
-                timeout=self.requests_timeout,
-            )
-            response.raise_for_status()
-            token_info = response.json()
-            token_info = self._add_custom_values_to_token_info(token_info)
-            if "refresh_token" not in token_info:
-                token_info["refresh_token"] = refresh_token
-            self.cache_handler.save_token_to_cache(token_info)
-            return token_info
-        except requests.exceptions.HTTPError as http_error:
-            self._handle_oauth_error(http_error)
+        token_info = self._post_token_request(payload, headers)
+        token_info = self._add_custom_values_to_token_info(token_info)
+        if "refresh_token" not in token_info:
+            token_info["refresh_token"] = refresh_token
+        self.cache_handler.save_token_to_cache(token_info)
+        return token_info
 
     def _add_custom_values_to_token_info(self, token_info):
         """
@@ -630,7 +614,8 @@ class SpotifyPKCE(SpotifyAuthBase):
                  requests_timeout=None,
                  requests_session=True,
                  open_browser=True,
-                 cache_handler=None):
+                 cache_handler=None,
+                 transport=None):
         """
         Creates Auth Manager with the PKCE Auth flow.
 
@@ -654,9 +639,11 @@ class SpotifyPKCE(SpotifyAuthBase):
                               getting and saving cached authorization tokens.
                               Optional, will otherwise use `CacheFileHandler`.
                               (takes precedence over `cache_path` and `username`)
+             * transport: Optional, a `spotipy.transport.Transport` to send token
+                          requests with (takes precedence over `requests_session`)
         """
 
-        super().__init__(requests_session)
+        super().__init__(requests_session, transport)
         self.client_id = client_id
         self.redirect_uri = redirect_uri
         self.state = state
@@ -886,25 +873,10 @@ class SpotifyPKCE(SpotifyAuthBase):
 
         headers = {"Content-Type": "application/x-www-form-urlencoded"}
 
-        logger.debug(f"Sending POST request to {self.OAUTH_TOKEN_URL} with Headers: "
-                     f"{headers} and Body: {payload}")
-
-        try:
-            response = self._session.post(
-                self.OAUTH_TOKEN_URL,
-                data=payload,
-                headers=headers,
-                verify=True,
-                proxies=self.proxies,
-                timeout=self.requests_timeout,
-            )
-            response.raise_for_status()
-            token_info = response.json()
-            token_info = self._add_custom_values_to_token_info(token_info)
-            self.cache_handler.save_token_to_cache(token_info)
-            return token_info["access_token"]
-        except requests.exceptions.HTTPError as http_error:
-            self._handle_oauth_error(http_error)
+        token_info = self._post_token_request(payload, headers)
+        token_info = self._add_custom_values_to_token_info(token_info)
+        self.cache_handler.save_token_to_cache(token_info)
+        return token_info["access_token"]
 
     def refresh_access_token(self, refresh_token):
         payload = {
@@ -915,26 +887,12 @@ class SpotifyPKCE(SpotifyAuthBase):
 
         headers = {"Content-Type": "application/x-www-form-urlencoded"}
 
-        logger.debug(f"Sending POST request to {self.OAUTH_TOKEN_URL} with Headers: "
-                     f"{headers} and Body: {payload}")
-
-        try:
-            response = self._session.post(
-                self.OAUTH_TOKEN_URL,
-                data=payload,
-                headers=headers,
-                proxies=self.proxies,
-                timeout=self.requests_timeout,
-            )
-            response.raise_for_status()
-            token_info = response.json()
-            token_info = self._add_custom_values_to_token_info(token_info)
-            if "refresh_token" not in token_info:
-                token_info["refresh_token"] = refresh_token
-            self.cache_handler.save_token_to_cache(token_info)
-            return token_info
-        except requests.exceptions.HTTPError as http_error:
-            self._handle_oauth_error(http_error)
+        token_info = self._post_token_request(payload, headers)
+        token_info = self._add_custom_values_to_token_info(token_info)
+        if "refresh_token" not in token_info:
+            token_info["refresh_token"] = refresh_token
+        self.cache_handler.save_token_to_cache(token_info)
+        return token_info
 
     def parse_response_code(self, url):
         """ Parse the response code in the given response url
@@ -0,0 +1,432 @@
+""" Iterating over the paged results of the Web API """
+
+__all__ = [
+    "iter_pages",
+    "iter_items",
+    "aiter_pages",
+    "aiter_items",
+    "fetch_all",
+    "CursorStream",
+    "PagedSequence",
+]
+
+import asyncio
+import base64
+import contextvars
+import inspect
+import json
+from collections import OrderedDict
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+# the largest page size of the endpoints taking more than 50 items a page
+MAX_LIMITS = {
+    "playlist_items": 100,
+    "playlist_tracks": 100,
+    "user_playlist_tracks": 100,
+}
+DEFAULT_MAX_LIMIT = 50
+# the endpoints that only serve the first items of their results
+MAX_TOTALS = {
+    "search": 1000,
+}
+
+
+def _prepare(client, method, kwargs):
+    """ Resolves a method name and defaults its `limit` to the largest page
+        size of the endpoint
+    """
+    if isinstance(method, str):
+        method = getattr(client, method)
+    if "limit" not in kwargs and "limit" in inspect.signature(method).parameters:
+        kwargs["limit"] = MAX_LIMITS.get(method.__name__, DEFAULT_MAX_LIMIT)
+    return method
+
+
+def _page_key(result):
+    """ Returns the key of the paging object in a result, like "tracks" in
+        the result of a search, or None if the result is a paging object
+    """
+    if "items" in result:
+        return None
+    keys = [k for k, v in result.items() if isinstance(v, dict) and "items" in v]
+    if len(keys) != 1:
+        raise ValueError(
+            f"Expected a single paging object in the result, found {keys}: pass key="
+        )
+    return keys[0]
+
+
+def _page(result, key):
+    if result is None or key is None:
+        return result
+    return result[key]
+
+
+def fetch_all(client, method, *args, key=None, max_workers=None, **kwargs):
+    """ Returns the items of all the pages of a paged result, in order.
+
+        The first page gives the total number of items, from which the
+        offsets of the other pages are known: those pages are requested
+        at once, with at most `max_workers` requests in flight (by default
+        the client's `max_concurrent_chunks`), on a thread pool for a
+        `Spotify` client or in tasks for an `AsyncSpotify` client (which
+        returns an awaitable).
+
+        Items added or removed while the pages are fetched can shift the
+        later pages; use a playlist's snapshot to detect that.
+
+        Parameters:
+            - client - a `Spotify` or `AsyncSpotify` client
+            - method - the client method (or its name) returning the first
+                       page. It must take an `offset`
+            - args, kwargs - the arguments of the method. `limit` defaults
+                             to the largest page size of the endpoint
+            - key - the key of the paging object in results holding several
+            - max_workers - the most pages to request at once
+    """
+    method = _prepare(client, method, kwargs)
+    if "offset" not in inspect.signature(method).parameters:
+        raise ValueError(f"{method.__name__} is not paged by offset")
+    return client._drive(_fetch_all_steps(client, method, args, kwargs, key, max_workers))
+
+
+def _fetch_all_steps(client, method, args, kwargs, key, max_workers):
+    result = yield lambda: method(*args, **kwargs)
+    if result is None:
+        return []
+    if key is None:
+        key = _page_key(result)
+    first = _page(result, key)
+    items = list(first["items"])
+    limit = first.get("limit") or kwargs.get("limit") or len(items)
+    total = min(first["total"], MAX_TOTALS.get(method.__name__, first["total"]))
+    offsets = list(range(first.get("offset", 0) + limit, total, limit)) if limit else []
+    if offsets:
+        results = yield lambda: client._map_chunks(
+            lambda offset: method(*args, **dict(kwargs, offset=offset)), offsets, max_workers
+        )
+        for result in results:
+            items.extend(_page(result, key)["items"])
+    return items
+
+
+def iter_pages(client, method, *args, key=None, prefetch=True, **kwargs):
+    """ Yields the pages of a paged result, following their `next` links.
+
+        While a page is consumed, the next one is fetched on a background
+        thread. Pages are only referenced until the next one is yielded.
+
+        Parameters:
+            - client - a `Spotify` client
+            - method - the client method (or its name) returning the first
+                       page, e.g. `sp.playlist_items`
+            - args, kwargs - the arguments of the method. `limit` defaults
+                             to the largest page size of the endpoint
+            - key - the key of the paging object in results holding
+                    several, like the result of a search for several types
+            - prefetch - fetch the next page while a page is consumed
+    """
+    method = _prepare(client, method, kwargs)
+    result = method(*args, **kwargs)
+    if key is None and result is not None:
+        key = _page_key(result)
+    page = _page(result, key)
+    del result
+    executor = ThreadPoolExecutor(1) if prefetch else None
+    try:
+        while page is not None:
+            upcoming = None
+            if page.get("next") and executor is not None:
+                upcoming = executor.submit(contextvars.copy_context().run, client.next, page)
+            yield page
+            if upcoming is not None:
+                page = _page(upcoming.result(), key)
+            elif page.get("next"):
+                page = _page(client.next(page), key)
+            else:
+                page = None
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+
+def iter_items(client, method, *args, **kwargs):
+    """ Yields the items of all the pages of a paged result, as
+        `iter_pages` fetches them
+    """
+    for page in iter_pages(client, method, *args, **kwargs):
+        yield from page["items"]
+
+
+async def aiter_pages(client, method, *args, key=None, prefetch=True, **kwargs):
+    """ Yields the pages of a paged result of an `AsyncSpotify` client, like
+        `iter_pages`. The next page is fetched in a task of its own.
+    """
+    method = _prepare(client, method, kwargs)
+    result = await method(*args, **kwargs)
+    if key is None and result is not None:
+        key = _page_key(result)
+    page = _page(result, key)
+    del result
+    upcoming = None
+    try:
+        while page is not None:
+            upcoming = None
+            if page.get("next") and prefetch:
+                upcoming = asyncio.ensure_future(client.next(page))
+            yield page
+            if upcoming is not None:
+                page = _page(await upcoming, key)
+            elif page.get("next"):
+                page = _page(await client.next(page), key)
+            else:
+                page = None
+    finally:
+        if upcoming is not None and not upcoming.done():
+            upcoming.cancel()
+
+
+async def aiter_items(client, method, *args, **kwargs):
+    """ Yields the items of all the pages of a paged result of an
+        `AsyncSpotify` client
+    """
+    async for page in aiter_pages(client, method, *args, **kwargs):
+        for item in page["items"]:
+            yield item
+
+
+def _played_at_ms(item):
+    """ Returns the `played_at` time of a play history item as a Unix
+        timestamp in milliseconds, the cursor of recently played tracks
+    """
+    seconds, _, fraction = item["played_at"].rstrip("Z").partition(".")
+    played_at = datetime.strptime(seconds, "%Y-%m-%dT%H:%M:%S").replace(tzinfo=timezone.utc)
+    return int(played_at.timestamp()) * 1000 + int((fraction + "000")[:3])
+
+
+class _Cursor:
+
+    def __init__(self, key, item_cursor, oldest_first):
+        # the key of the paging object in results, if nested
+        self.key = key
+        # returns the `after` cursor that resumes after an item
+        self.item_cursor = item_cursor
+        # whether pages list the items newest first, and stream by polling
+        # for newer items rather than by following `next` links
+        self.oldest_first = oldest_first
+
+
+class CursorStream:
+    """
+    Streams the items of a cursor-paged result, following the `after`
+    cursor, and keeps a resume token: an opaque string that can be
+    persisted, and passed as `resume_token` to start a new stream right
+    after the last item handed out.
+
+    Supports `current_user_followed_artists`, whose artists are streamed
+    in the order of the API, and `current_user_recently_played`, whose
+    plays are streamed oldest first. Once the recently played tracks
+    were streamed, resuming yields the tracks played since.
+
+    Iterate over it with `for` for a `Spotify` client, and `async for`
+    for an `AsyncSpotify` client. Example usage::
+
+        stream = sp.cursor_stream(sp.current_user_recently_played,
+                                  resume_token=load_token())
+        for play in stream:
+            ingest(play)
+            save_token(stream.resume_token)
+    """
+
+    CURSORS = {
+        "current_user_followed_artists": _Cursor("artists", lambda item: item["id"], False),
+        "current_user_recently_played": _Cursor(None, _played_at_ms, True),
+    }
+
+    def __init__(self, client, method, *args, resume_token=None, **kwargs):
+        """
+        Parameters:
+            - client - a `Spotify` or `AsyncSpotify` client
+            - method - the client method (or its name), e.g.
+                       `sp.current_user_recently_played`
+            - args, kwargs - the arguments of the method, other than the
+                             cursors. `limit` defaults to 50
+            - resume_token - a `resume_token` of an earlier stream
+        """
+        self._method = _prepare(client, method, kwargs)
+        self._name = self._method.__name__
+        if self._name not in self.CURSORS:
+            raise ValueError(f"{self._name} is not paged by cursor")
+        self._args = args
+        self._kwargs = kwargs
+        self._cursor = self.CURSORS[self._name]
+        self._after = self._decode(resume_token) if resume_token else None
+
+    @property
+    def resume_token(self):
+        """ The token that resumes the stream after the last item handed
+            out, or None if no item was
+        """
+        if self._after is None:
+            return None
+        state = json.dumps({"method": self._name, "after": self._after})
+        return base64.urlsafe_b64encode(state.encode("utf-8")).decode("ascii")
+
+    def _decode(self, token):
+        try:
+            state = json.loads(base64.urlsafe_b64decode(token.encode("ascii")))
+            method, after = state["method"], state["after"]
+        except (ValueError, TypeError, KeyError):
+            raise ValueError("Invalid resume token")
+        if method != self._name:
+            raise ValueError(f"The resume token is for {method}, not {self._name}")
+        return after
+
+    def _request(self):
+        return self._method(*self._args, **dict(self._kwargs, after=self._after))
+
+    def _items(self, result):
+        """ Returns the items of a page in streaming order, and whether
+            there may be more
+        """
+        page = _page(result, self._cursor.key)
+        if not page or not page["items"]:
+            return [], False
+        if self._cursor.oldest_first:
+            return page["items"][::-1], True
+        return page["items"], bool(page.get("next"))
+
+    def __iter__(self):
+        more = True
+        while more:
+            items, more = self._items(self._request())
+            for item in items:
+                self._after = self._cursor.item_cursor(item)
+                yield item
+
+    async def __aiter__(self):
+        more = True
+        while more:
+            items, more = self._items(await self._request())
+            for item in items:
+                self._after = self._cursor.item_cursor(item)
+                yield item
+
+
+class PagedSequence(Sequence):
+    """
+    A lazy, read-only sequence over the items of an offset-paged result.
+    Only the pages covering the items asked for are fetched, and fetched
+    pages are kept, so sampling or reading the end of a large playlist
+    costs a few requests rather than a walk from the first page.
+
+    `len()` costs a single request for one item, to learn the total.
+    Slices fetch the pages they cover at once, like `fetch_all`.
+
+    With an `AsyncSpotify` client, indexing returns an awaitable, and
+    `await seq.length()` stands in for `len(seq)`. Example usage::
+
+        tracks = sp.paged(sp.playlist_items, playlist_id)
+        print(len(tracks), tracks[-20:])
+        sample = [tracks[i] for i in random.sample(range(len(tracks)), 5)]
+    """
+
+    def __init__(self, client, method, *args, key=None, max_pages=None, **kwargs):
+        """
+        Parameters:
+            - client - a `Spotify` or `AsyncSpotify` client
+            - method - the client method (or its name), e.g.
+                       `sp.playlist_items`. It must take `limit` and `offset`
+            - args, kwargs - the arguments of the method. `limit`, the page
+                             size, defaults to the largest of the endpoint
+            - key - the key of the paging object in results holding several
+            - max_pages - the most pages to keep, least recently used first
+                          out (optional)
+        """
+        self._client = client
+        self._method = _prepare(client, method, kwargs)
+        if "offset" not in inspect.signature(self._method).parameters:
+            raise ValueError(f"{self._method.__name__} is not paged by offset")
+        kwargs.pop("offset", None)
+        self._page_size = kwargs.pop("limit")
+        self._args = args
+        self._kwargs = kwargs
+        self._key = key
+        self._max_pages = max_pages
+        self._pages = OrderedDict()
+        self._total = None
+
+    def _request(self, offset, limit):
+        return self._method(*self._args, **dict(self._kwargs, offset=offset, limit=limit))
+
+    def _read(self, result):
+        """ Returns the paging object of a result, noting the total """
+        if self._key is None:
+            self._key = _page_key(result)
+        page = _page(result, self._key)
+        total = page["total"]
+        self._total = min(total, MAX_TOTALS.get(self._method.__name__, total))
+        return page
+
+    def _total_steps(self):
+        if self._total is None:
+            self._read((yield lambda: self._request(0, 1)))
+        return self._total
+
+    def _pages_steps(self, numbers):
+        """ Fetches the pages not kept yet among `numbers` """
+        missing = [n for n in dict.fromkeys(numbers) if n not in self._pages]
+        if missing:
+            results = yield lambda: self._client._map_chunks(
+                lambda n: self._request(n * self._page_size, self._page_size), missing
+            )
+            for number, result in zip(missing, results):
+                self._pages[number] = self._read(result)["items"]
+        pages = {}
+        for number in numbers:
+            pages[number] = self._pages[number]
+            self._pages.move_to_end(number)
+        while self._max_pages and len(self._pages) > self._max_pages:
+            self._pages.popitem(last=False)
+        return pages
+
+    def _item(self, pages, index):
+        try:
+            return pages[index // self._page_size][index % self._page_size]
+        except (KeyError, IndexError):
+            # the collection shrank since its total was read
+            raise IndexError("PagedSequence index out of range")
+
+    def _getitem_steps(self, index):
+        if isinstance(index, slice):
+            indexes = range(*index.indices((yield from self._total_steps())))
+            pages = yield from self._pages_steps([i // self._page_size for i in indexes])
+            return [self._item(pages, i) for i in indexes]
+        if index < 0 or self._total is not None:
+            total = yield from self._total_steps()
+            if index < 0:
+                index += total
+            if not 0 <= index < total:
+                raise IndexError("PagedSequence index out of range")
+        pages = yield from self._pages_steps([index // self._page_size])
+        return self._item(pages, index)
+
+    def __getitem__(self, index):
+        return self._client._drive(self._getitem_steps(index))
+
+    def length(self):
+        """ Returns the number of items (an awaitable with `AsyncSpotify`) """
+        return self._client._drive(self._total_steps())
+
+    def __len__(self):
+        return self.length()
+
+    def __iter__(self):
+        for number in range(-(-len(self) // self._page_size)):
+            yield from self._client._drive(self._pages_steps([number]))[number]
+
+    def __repr__(self):
+        total = "?" if self._total is None else self._total
+        return f"<PagedSequence {self._method.__name__} of {total} items>"
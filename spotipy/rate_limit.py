@@ -0,0 +1,249 @@
+""" Client-side rate limiting of the requests to the Web API """
+
+__all__ = [
+    "RateLimiter",
+    "TokenBucket",
+    "RedisRateLimiter",
+    "AsyncRedisRateLimiter",
+]
+
+import asyncio
+import logging
+import threading
+import time
+
+from redis import RedisError
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    """
+    Base class for rate limiters. A client reserves a slot before every
+    request and waits as long as the limiter tells it to, and pauses the
+    limiter when the API answers 429 Too Many Requests with a Retry-After.
+    """
+
+    def reserve(self, cost=1):
+        """ Reserves a slot for a request and returns the number of seconds
+            to wait before sending it
+
+            Parameters:
+                - cost - the number of requests the slot is for
+        """
+        raise NotImplementedError()
+
+    def pause(self, seconds):
+        """ Holds back all the requests for the next `seconds` seconds """
+        raise NotImplementedError()
+
+    def acquire(self, cost=1):
+        """ Waits until a request may be sent """
+        delay = self.reserve(cost)
+        if delay > 0:
+            time.sleep(delay)
+
+
+class TokenBucket(RateLimiter):
+    """
+    A token bucket allowing `rate` requests every `per` seconds, shared by
+    all the threads (or tasks) using it, and by several clients if they
+    are given the same bucket.
+
+    The bucket holds `burst` tokens. It refills at `rate / per` tokens a
+    second, so with the default `burst` of 1 requests are evenly spaced and
+    at most `rate` requests are sent in any window of `per` seconds (the
+    Web API counts requests in a rolling 30 second window). A larger
+    `burst` lets that many requests through at once after a quiet spell.
+
+    A pause, e.g. for the Retry-After of a 429 response, holds back every
+    request until it ends, not just the one that got the 429.
+
+    Example usage::
+
+        sp = spotipy.Spotify(auth_manager=..., rate_limiter=TokenBucket(150))
+    """
+
+    def __init__(self, rate, per=30.0, burst=1, clock=time.monotonic):
+        """
+        Parameters:
+            - rate - the number of requests allowed every `per` seconds
+            - per - the length of the window, in seconds
+            - burst - the number of requests that may be sent at once
+            - clock - returns the current time in seconds
+        """
+        if rate <= 0 or per <= 0 or burst < 1:
+            raise ValueError("rate, per and burst must be positive")
+        self.rate = rate
+        self.per = per
+        self.burst = burst
+        self._clock = clock
+        self._interval = per / rate
+        self._lock = threading.Lock()
+        # implemented as the equivalent generic cell rate algorithm: rather
+        # than a token count, the time the bucket will be full again is kept
+        self._full_at = float("-inf")
+        self._paused_until = float("-inf")
+
+    def reserve(self, cost=1):
+        with self._lock:
+            now = self._clock()
+            full_at = max(self._full_at, now)
+            start = max(
+                now,
+                full_at + self._interval * (cost - self.burst),
+                self._paused_until,
+            )
+            self._full_at = max(full_at, start) + self._interval * cost
+            return start - now
+
+    def pause(self, seconds):
+        with self._lock:
+            until = self._clock() + seconds
+            self._paused_until = max(self._paused_until, until)
+
+    @property
+    def paused_for(self):
+        """ The number of seconds left of the current pause, if any """
+        return max(0.0, self._paused_until - self._clock())
+
+
+# The scripts keep the state of a `TokenBucket` in Redis, in microseconds
+# of the Redis server's clock, so that the hosts' clocks don't matter.
+# Writing after TIME needs effects replication, the default since Redis 5.
+_NOW = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000000 + tonumber(time[2])
+"""
+
+# KEYS: full at, paused until; ARGV: interval, burst, cost
+_RESERVE = _NOW + """
+local interval = tonumber(ARGV[1])
+local cost = tonumber(ARGV[3])
+local full_at = math.max(tonumber(redis.call('GET', KEYS[1]) or 0), now)
+local paused_until = tonumber(redis.call('GET', KEYS[2]) or 0)
+local start = math.max(now, full_at + interval * (cost - tonumber(ARGV[2])), paused_until)
+full_at = math.max(full_at, start) + interval * cost
+redis.call('SET', KEYS[1], string.format('%d', full_at),
+           'PX', math.ceil((full_at - now) / 1000) + 1000)
+return start - now
+"""
+
+# KEYS: paused until; ARGV: pause, channel
+_PAUSE = _NOW + """
+local paused_until = now + tonumber(ARGV[1])
+if paused_until > tonumber(redis.call('GET', KEYS[1]) or 0) then
+    redis.call('SET', KEYS[1], string.format('%d', paused_until),
+               'PX', math.ceil(tonumber(ARGV[1]) / 1000) + 1000)
+    redis.call('PUBLISH', ARGV[2], ARGV[1])
+end
+return 0
+"""
+
+# KEYS: paused until
+_PAUSED_FOR = _NOW + """
+return math.max(0, tonumber(redis.call('GET', KEYS[1]) or 0) - now)
+"""
+
+
+class RedisRateLimiter(RateLimiter):
+    """
+    A `TokenBucket` kept in Redis, shared by every process and host using
+    the same Redis and prefix, e.g. all the workers sharing the credentials
+    of an app. Reservations and pauses are atomic Lua scripts, timed by the
+    clock of the Redis server.
+
+    A pause, e.g. for the Retry-After of a 429 response, holds back the
+    requests of every participant, and is announced on the `channel`
+    (with the length of the pause in microseconds) for those who want to
+    know, like monitoring.
+
+    If Redis can't be reached, requests are let through and a warning is
+    logged. Example usage::
+
+        limiter = RedisRateLimiter(redis.Redis(), 150, per=30)
+        sp = spotipy.Spotify(auth_manager=..., rate_limiter=limiter)
+    """
+
+    def __init__(self, redis, rate, per=30.0, burst=1, prefix="spotipy:rate-limit:"):
+        """
+        Parameters:
+            - redis - a redis-py client
+            - rate - the number of requests allowed every `per` seconds
+            - per - the length of the window, in seconds
+            - burst - the number of requests that may be sent at once
+            - prefix - the prefix of the keys (and channel) of the limiter
+        """
+        if rate <= 0 or per <= 0 or burst < 1:
+            raise ValueError("rate, per and burst must be positive")
+        self.redis = redis
+        self.rate = rate
+        self.per = per
+        self.burst = burst
+        self.channel = prefix + "pauses"
+        self._interval = round(per / rate * 1000000)
+        self._full_at_key = prefix + "full-at"
+        self._paused_until_key = prefix + "paused-until"
+        self._reserve = redis.register_script(_RESERVE)
+        self._pause = redis.register_script(_PAUSE)
+        self._paused_for = redis.register_script(_PAUSED_FOR)
+
+    def _reserve_args(self, cost):
+        return {
+            "keys": [self._full_at_key, self._paused_until_key],
+            "args": [self._interval, self.burst, cost],
+        }
+
+    def _pause_args(self, seconds):
+        return {
+            "keys": [self._paused_until_key],
+            "args": [round(seconds * 1000000), self.channel],
+        }
+
+    def reserve(self, cost=1):
+        try:
+            return self._reserve(**self._reserve_args(cost)) / 1000000
+        except RedisError as e:
+            logger.warning(f"Error reserving a request with Redis, not limiting it: {e}")
+            return 0
+
+    def pause(self, seconds):
+        try:
+            self._pause(**self._pause_args(seconds))
+        except RedisError as e:
+            logger.warning(f"Error pausing the rate limiter in Redis: {e}")
+
+    @property
+    def paused_for(self):
+        """ The number of seconds left of the current pause, if any """
+        return self._paused_for(keys=[self._paused_until_key]) / 1000000
+
+
+class AsyncRedisRateLimiter(RedisRateLimiter):
+    """
+    A `RedisRateLimiter` using the asyncio client of redis-py
+    (`redis.asyncio.Redis`), for `AsyncSpotify`. `reserve`, `pause`,
+    `acquire` and `paused_for` return awaitables.
+    """
+
+    async def reserve(self, cost=1):
+        try:
+            return await self._reserve(**self._reserve_args(cost)) / 1000000
+        except RedisError as e:
+            logger.warning(f"Error reserving a request with Redis, not limiting it: {e}")
+            return 0
+
+    async def pause(self, seconds):
+        try:
+            await self._pause(**self._pause_args(seconds))
+        except RedisError as e:
+            logger.warning(f"Error pausing the rate limiter in Redis: {e}")
+
+    async def acquire(self, cost=1):
+        delay = await self.reserve(cost)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    @property
+    async def paused_for(self):
+        return await self._paused_for(keys=[self._paused_until_key]) / 1000000
@@ -0,0 +1,633 @@
+""" Caches for the responses of GET requests to the Web API """
+
+__all__ = [
+    "AsyncRedisResponseCache",
+    "CachePolicy",
+    "DEFAULT_POLICIES",
+    "ETagCache",
+    "MemoryResponseCache",
+    "RedisResponseCache",
+    "ResponseCache",
+    "SQLiteResponseCache",
+    "bypass_cache",
+    "make_cache_key",
+]
+
+import contextlib
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+import urllib.parse as urllibparse
+from collections import OrderedDict, namedtuple
+from contextvars import ContextVar
+
+from redis import RedisError
+
+logger = logging.getLogger(__name__)
+
+CachePolicy = namedtuple("CachePolicy", "pattern ttl per_user", defaults=(False,))
+CachePolicy.__doc__ = """
+How long responses for the endpoints whose path (relative to the API
+prefix, e.g. ``albums/{id}``) matches `pattern` are cached, in seconds.
+A `ttl` of 0 disables caching. Responses of `per_user` endpoints are
+cached separately for each access token, as are those of requests for
+the market of the access token (see `ResponseCache.is_per_user`).
+"""
+
+DEFAULT_POLICIES = (
+    CachePolicy(r"^me/player", 5, per_user=True),
+    # the user's library, follows and playlists change with the client's
+    # own writes, which don't invalidate cached responses
+    CachePolicy(r"^(me|users|playlists)(/|$)", 0, per_user=True),
+    CachePolicy(r"^markets$", 24 * 60 * 60),
+    CachePolicy(r"^recommendations/available-genre-seeds$", 24 * 60 * 60),
+    CachePolicy(r"^browse/categories", 60 * 60),
+    CachePolicy(r"^(artists|albums|tracks|shows|episodes|audiobooks|chapters)(/|$)", 60 * 60),
+)
+
+# without a market, these fall back to the country of the user
+_USER_MARKET_PATHS = re.compile(r"^(shows|episodes|audiobooks|chapters)(/|$)")
+
+_bypass = ContextVar("spotipy_cache_bypass", default=False)
+
+
+@contextlib.contextmanager
+def bypass_cache():
+    """ Makes requests in the current thread or task skip response cache
+        lookups. Their responses still replace the cached ones.
+
+        Example usage::
+
+            with bypass_cache():
+                sp.album(album_id)
+    """
+    token = _bypass.set(True)
+    try:
+        yield
+    finally:
+        _bypass.reset(token)
+
+
+def make_cache_key(method, url, params=None, language=None, authorization=None):
+    """ Returns a key identifying a request, independent of the order of
+        its query parameters and of whether they were passed in `params`
+        or as part of the URL (like in the `next` URL of a paged result).
+
+        Parameters:
+            - method - the HTTP method
+            - url - the absolute URL
+            - params - query parameters, `None` values are left out
+            - language - the Accept-Language of the client
+            - authorization - the Authorization header, for responses
+              that depend on the user (only a digest of it is kept)
+    """
+    parsed = urllibparse.urlsplit(url)
+    query = urllibparse.parse_qsl(parsed.query, keep_blank_values=True)
+    if params:
+        query.extend((k, str(v)) for k, v in params.items() if v is not None)
+    query.sort()
+    key = (
+        f"{method} {parsed.scheme.lower()}://{parsed.netloc.lower()}{parsed.path}"
+        f"?{urllibparse.urlencode(query)} {language or ''}"
+    )
+    if authorization is not None:
+        digest = hashlib.sha256(authorization.encode("utf-8")).hexdigest()
+        key += " " + digest[:16]
+    return key
+
+
+class ETagCache:
+    """
+    Remembers the ETag and body of GET responses, so that repeat requests
+    can be sent with If-None-Match and answered by a body-less
+    304 Not Modified when the resource did not change.
+
+    Bodies are kept as the raw bytes of the response and decoded on every
+    use, so callers never share (and mutate) the same result. The least
+    recently used entries are dropped once `maxsize` is reached.
+    """
+
+    def __init__(self, maxsize=1024):
+        """
+        Parameters:
+            - maxsize - the number of responses to remember
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """ Returns the `(etag, body)` stored for a key, or None """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, etag, body):
+        with self._lock:
+            self._entries[key] = (etag, body)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def record(self, not_modified):
+        """ Counts a revalidation, which either hit (304) or missed """
+        with self._lock:
+            if not_modified:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class ResponseCache:
+    """
+    Caches the bodies of successful GET responses, so repeat calls are
+    answered without a request to the Web API. Attach one to a client
+    with ``Spotify(response_cache=...)``.
+
+    How long a response is kept depends on the first of the `policies`
+    matching its endpoint. Subclasses store the bodies by implementing
+    `_load`, `_store` and `clear`.
+    """
+
+    def __init__(self, policies=None, default_ttl=60):
+        """
+        Parameters:
+            - policies - a sequence of `CachePolicy`, defaults to `DEFAULT_POLICIES`
+            - default_ttl - seconds to cache endpoints no policy matches
+        """
+        if policies is None:
+            policies = DEFAULT_POLICIES
+        self.policies = [
+            (re.compile(policy.pattern), policy)
+            for policy in (CachePolicy(*policy) for policy in policies)
+        ]
+        self.default_ttl = default_ttl
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+
+    def policy_for(self, path):
+        """ Returns the `CachePolicy` for a path relative to the API prefix """
+        for pattern, policy in self.policies:
+            if pattern.search(path):
+                return policy
+        return CachePolicy(None, self.default_ttl)
+
+    def is_per_user(self, path, url, params):
+        """ Tells whether the response to a GET request depends on the user,
+            and is cached for each access token: that of a `per_user`
+            endpoint, or of a request with ``market=from_token``, or for
+            shows, episodes, audiobooks or chapters without a market
+        """
+        if self.policy_for(path).per_user:
+            return True
+        market = params.get("market") if params else None
+        if market is None:
+            query = urllibparse.parse_qs(urllibparse.urlsplit(url).query)
+            market = query.get("market", [None])[0]
+        if market == "from_token":
+            return True
+        return not market and _USER_MARKET_PATHS.search(path) is not None
+
+    def key_for(self, method, url, params, language, path, authorization=None):
+        """ Returns the cache key and time to live of a request, or
+            `(None, 0)` if its response should not be cached
+        """
+        if method != "GET":
+            return None, 0
+        policy = self.policy_for(path)
+        if not policy.ttl:
+            return None, 0
+        if not self.is_per_user(path, url, params):
+            authorization = None
+        elif authorization is None:
+            authorization = ""
+        return make_cache_key(method, url, params, language, authorization), policy.ttl
+
+    def get(self, key):
+        """ Returns the cached body for a key, or None """
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys):
+        """ Returns a dict with the cached bodies of those keys that are cached """
+        if _bypass.get():
+            return {}
+        return self._count(keys, self._load(keys))
+
+    def set(self, key, body, ttl):
+        self.set_many({key: body}, ttl)
+
+    def set_many(self, items, ttl):
+        """ Caches the bodies of a dict of keys for `ttl` seconds """
+        if items:
+            self._store(items, ttl)
+
+    def stats(self):
+        """ Returns the number of hits and misses and the hit ratio """
+        with self._stats_lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / total if total else 0.0,
+            }
+
+    def _count(self, keys, found):
+        with self._stats_lock:
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def _load(self, keys):
+        raise NotImplementedError()
+
+    def _store(self, items, ttl):
+        raise NotImplementedError()
+
+    def clear(self):
+        raise NotImplementedError()
+
+
+class MemoryResponseCache(ResponseCache):
+    """
+    Keeps responses in the memory of the current process. Once `maxsize`
+    responses are cached, the least recently used ones are dropped.
+    """
+
+    def __init__(self, maxsize=1024, policies=None, default_ttl=60):
+        """
+        Parameters:
+            - maxsize - the number of responses to keep
+            - policies - a sequence of `CachePolicy`, defaults to `DEFAULT_POLICIES`
+            - default_ttl - seconds to cache endpoints no policy matches
+        """
+        super().__init__(policies, default_ttl)
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _load(self, keys):
+        now = time.monotonic()
+        found = {}
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is None:
+                    continue
+                expires_at, body = entry
+                if expires_at <= now:
+                    del self._entries[key]
+                    continue
+                self._entries.move_to_end(key)
+                found[key] = body
+        return found
+
+    def _store(self, items, ttl):
+        expires_at = time.monotonic() + ttl
+        with self._lock:
+            for key, body in items.items():
+                self._entries[key] = (expires_at, body)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SQLiteResponseCache(ResponseCache):
+    """
+    Keeps responses in a SQLite database file, so they survive restarts
+    and are shared by all processes on a host that use the same file.
+
+    The database runs in WAL mode, so readers don't block the writer.
+    Expired responses are removed, and the oldest ones once the bodies
+    take up more than `max_bytes`, every `evict_interval` writes or when
+    `evict` is called. Bodies can be compressed with zstd
+    (``pip install zstandard``).
+
+    Errors of the database, such as a write lock held by another process
+    for longer than `write_timeout`, are logged: the response is then not
+    cached, or looked up as a miss.
+    """
+
+    def __init__(self, path, max_bytes=256 * 1024 * 1024, compress=False,
+                 compression_level=3, timeout=30, evict_interval=100,
+                 write_timeout=0.1, policies=None, default_ttl=60):
+        """
+        Parameters:
+            - path - the database file, created if it doesn't exist
+            - max_bytes - the total size of the stored bodies to evict down to
+            - compress - whether to compress bodies with zstd
+            - compression_level - the zstd compression level
+            - timeout - seconds to wait for a lock held by another process
+            - evict_interval - the number of writes between evictions
+            - write_timeout - seconds a response waits to be cached while
+              another process writes, before it is skipped
+            - policies - a sequence of `CachePolicy`, defaults to `DEFAULT_POLICIES`
+            - default_ttl - seconds to cache endpoints no policy matches
+        """
+        super().__init__(policies, default_ttl)
+        if compress:
+            import zstandard  # noqa: F401
+        self.path = path
+        self.max_bytes = max_bytes
+        self.compress = compress
+        self.compression_level = compression_level
+        self.timeout = timeout
+        self.evict_interval = evict_interval
+        self.write_timeout = write_timeout
+        self._local = threading.local()
+        self._writes = 0
+        with self._transaction() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY,"
+                " body BLOB NOT NULL,"
+                " compressed INTEGER NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " stored_at REAL NOT NULL,"
+                " expires_at REAL NOT NULL)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS responses_expires_at ON responses (expires_at)"
+            )
+
+    def _connect(self):
+        # sqlite3 connections can't be shared between threads, nor be used
+        # by a child process after a fork
+        local = self._local
+        if getattr(local, "pid", None) != os.getpid():
+            import sqlite3
+            connection = sqlite3.connect(
+                self.path, timeout=self.timeout, isolation_level=None,
+                check_same_thread=False,
+            )
+            connection.execute(f"PRAGMA busy_timeout = {int(self.timeout * 1000)}")
+            connection.execute("PRAGMA journal_mode = WAL")
+            connection.execute("PRAGMA synchronous = NORMAL")
+            local.connection = connection
+            local.pid = os.getpid()
+        return local.connection
+
+    def _transaction(self, timeout=None):
+        return _Transaction(self._connect(), timeout, self.timeout)
+
+    def _zstd(self):
+        # zstd (de)compressors must not be used by several threads at once
+        local = self._local
+        if getattr(local, "zstd", None) is None:
+            import zstandard
+            local.zstd = (
+                zstandard.ZstdCompressor(level=self.compression_level),
+                zstandard.ZstdDecompressor(),
+            )
+        return local.zstd
+
+    def _load(self, keys):
+        import sqlite3
+        found = {}
+        now = time.time()
+        try:
+            connection = self._connect()
+            # stay below SQLite's limit on the number of variables in a query
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                rows = connection.execute(
+                    f"SELECT key, body, compressed FROM responses WHERE key IN "
+                    f"({','.join('?' * len(chunk))}) AND expires_at > ?",
+                    (*chunk, now),
+                )
+                for key, body, compressed in rows:
+                    found[key] = self._zstd()[1].decompress(body) if compressed else body
+        except sqlite3.Error as e:
+            logger.warning(f"Error getting responses from cache: {e}")
+            return {}
+        return found
+
+    def _store(self, items, ttl):
+        now = time.time()
+        rows = []
+        for key, body in items.items():
+            size = len(body)
+            if self.compress:
+                body = self._zstd()[0].compress(body)
+            rows.append((key, body, int(self.compress), size, now, now + ttl))
+        import sqlite3
+        try:
+            with self._transaction(self.write_timeout) as connection:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO responses"
+                    " (key, body, compressed, size, stored_at, expires_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Error saving responses to cache: {e}")
+            return
+        self._writes += 1
+        if self._writes % self.evict_interval == 0:
+            self.evict()
+
+    def evict(self):
+        """ Removes expired responses, then the oldest ones until the
+            stored bodies take up no more than `max_bytes`
+        """
+        import sqlite3
+        try:
+            with self._transaction(self.write_timeout) as connection:
+                connection.execute(
+                    "DELETE FROM responses WHERE expires_at <= ?", (time.time(),)
+                )
+                connection.execute(
+                    "DELETE FROM responses WHERE key IN ("
+                    " SELECT key FROM ("
+                    "  SELECT key, SUM(size) OVER (ORDER BY stored_at DESC, key) AS total"
+                    "  FROM responses)"
+                    " WHERE total > ?)",
+                    (self.max_bytes,),
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Error evicting responses from cache: {e}")
+
+    def clear(self):
+        with self._transaction() as connection:
+            connection.execute("DELETE FROM responses")
+
+    def close(self):
+        """ Closes the connection of the current thread """
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.pid = None
+
+    def __len__(self):
+        return self._connect().execute(
+            "SELECT COUNT(*) FROM responses"
+        ).fetchone()[0]
+
+
+class RedisResponseCache(ResponseCache):
+    """
+    Keeps responses in Redis, to share them between all the hosts
+    running spotipy. Responses expire through Redis' own key expiry.
+
+    Lookups for several responses (such as the entities requested by
+    `Spotify.tracks` or `Spotify.artists`) take a single round trip, and
+    so do writes of several responses. Errors talking to Redis are logged
+    and treated as cache misses.
+    """
+
+    def __init__(self, redis, prefix="spotipy:response:", policies=None, default_ttl=60):
+        """
+        Parameters:
+            - redis - a Redis client provided by redis-py
+              (https://github.com/redis/redis-py)
+            - prefix - prepended to the keys of all cached responses
+            - policies - a sequence of `CachePolicy`, defaults to `DEFAULT_POLICIES`
+            - default_ttl - seconds to cache endpoints no policy matches
+        """
+        super().__init__(policies, default_ttl)
+        self.redis = redis
+        self.prefix = prefix
+
+    def _load(self, keys):
+        try:
+            bodies = self.redis.mget([self.prefix + key for key in keys])
+        except RedisError as e:
+            logger.warning(f"Error getting responses from cache: {e}")
+            return {}
+        return {key: body for key, body in zip(keys, bodies) if body is not None}
+
+    def _store(self, items, ttl):
+        try:
+            pipeline = self.redis.pipeline(transaction=False)
+            for key, body in items.items():
+                pipeline.set(self.prefix + key, body, px=int(ttl * 1000))
+            pipeline.execute()
+        except RedisError as e:
+            logger.warning(f"Error saving responses to cache: {e}")
+
+    def clear(self):
+        """ Deletes all responses stored under `prefix` """
+        keys = []
+        for key in self.redis.scan_iter(match=self.prefix + "*", count=1000):
+            keys.append(key)
+            if len(keys) == 1000:
+                self.redis.delete(*keys)
+                keys = []
+        if keys:
+            self.redis.delete(*keys)
+
+
+class AsyncRedisResponseCache(RedisResponseCache):
+    """
+    A `RedisResponseCache` using the asyncio client of redis-py
+    (`redis.asyncio.Redis`), for `AsyncSpotify`. `get`, `get_many`, `set`,
+    `set_many` and `clear` return awaitables.
+    """
+
+    async def get(self, key):
+        return (await self.get_many([key])).get(key)
+
+    async def get_many(self, keys):
+        if _bypass.get():
+            return {}
+        return self._count(keys, await self._load(keys))
+
+    async def set(self, key, body, ttl):
+        await self.set_many({key: body}, ttl)
+
+    async def set_many(self, items, ttl):
+        if items:
+            await self._store(items, ttl)
+
+    async def _load(self, keys):
+        try:
+            bodies = await self.redis.mget([self.prefix + key for key in keys])
+        except RedisError as e:
+            logger.warning(f"Error getting responses from cache: {e}")
+            return {}
+        return {key: body for key, body in zip(keys, bodies) if body is not None}
+
+    async def _store(self, items, ttl):
+        try:
+            pipeline = self.redis.pipeline(transaction=False)
+            for key, body in items.items():
+                pipeline.set(self.prefix + key, body, px=int(ttl * 1000))
+            await pipeline.execute()
+        except RedisError as e:
+            logger.warning(f"Error saving responses to cache: {e}")
+
+    async def clear(self):
+        keys = []
+        async for key in self.redis.scan_iter(match=self.prefix + "*", count=1000):
+            keys.append(key)
+            if len(keys) == 1000:
+                await self.redis.delete(*keys)
+                keys = []
+        if keys:
+            await self.redis.delete(*keys)
+
+
+class _Transaction:
+    """ Runs the statements of a `with` block in a write transaction,
+        waiting at most `timeout` seconds (rather than the connection's
+        `default_timeout`) for the write lock
+    """
+
+    def __init__(self, connection, timeout=None, default_timeout=None):
+        self.connection = connection
+        self.timeout = timeout
+        self.default_timeout = default_timeout
+
+    def _set_timeout(self, seconds):
+        self.connection.execute(f"PRAGMA busy_timeout = {int(seconds * 1000)}")
+
+    def __enter__(self):
+        if self.timeout is not None:
+            self._set_timeout(self.timeout)
+        # take the write lock up front, rather than upgrading a read lock
+        # (which fails immediately instead of waiting if another process
+        # is writing)
+        try:
+            self.connection.execute("BEGIN IMMEDIATE")
+        except BaseException:
+            self._restore_timeout()
+            raise
+        return self.connection
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            if exc_type is None:
+                try:
+                    self.connection.execute("COMMIT")
+                except BaseException:
+                    self.connection.execute("ROLLBACK")
+                    raise
+            else:
+                self.connection.execute("ROLLBACK")
+        finally:
+            self._restore_timeout()
+
+    def _restore_timeout(self):
+        if self.timeout is not None:
+            self._set_timeout(self.default_timeout)
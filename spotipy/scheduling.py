@@ -0,0 +1,389 @@
+""" Admission control and priority lanes for the requests of a client """
+
+__all__ = [
+    "BULK",
+    "INTERACTIVE",
+    "DEFAULT_LANES",
+    "Lane",
+    "PriorityScheduler",
+    "AsyncPriorityScheduler",
+    "current_lane",
+    "current_tenant",
+    "for_tenant",
+    "priority",
+]
+
+import asyncio
+import contextlib
+import threading
+import time
+from collections import deque, namedtuple
+from contextvars import ContextVar
+
+from spotipy.exceptions import SpotifyOverloadedError
+
+INTERACTIVE = "interactive"
+BULK = "bulk"
+
+Lane = namedtuple("Lane", "name max_queued max_wait", defaults=(None, None))
+Lane.__doc__ = """
+A class of requests of a `PriorityScheduler`. At most `max_queued`
+requests wait in the lane (None for no bound), each for at most
+`max_wait` seconds (None to wait as long as it takes).
+"""
+
+DEFAULT_LANES = (
+    Lane(INTERACTIVE, max_queued=100, max_wait=10),
+    Lane(BULK, max_queued=10000),
+)
+
+_lane = ContextVar("spotipy_lane", default=None)
+_tenant = ContextVar("spotipy_tenant", default=None)
+
+
+@contextlib.contextmanager
+def priority(lane):
+    """ Sends the requests made in the current thread or task through
+        `lane` of the client's scheduler, rather than the client's lane.
+
+        Example usage::
+
+            with priority(BULK):
+                sp.playlist_items(playlist_id)
+    """
+    token = _lane.set(lane)
+    try:
+        yield
+    finally:
+        _lane.reset(token)
+
+
+def current_lane():
+    """ Returns the lane set by `priority` for the current thread or task,
+        or None
+    """
+    return _lane.get()
+
+
+@contextlib.contextmanager
+def for_tenant(tenant):
+    """ Makes the requests in the current thread or task on behalf of
+        `tenant`, e.g. a customer account, rather than the client's tenant.
+
+        Example usage::
+
+            with for_tenant(account_id):
+                sync_library(sp)
+    """
+    token = _tenant.set(tenant)
+    try:
+        yield
+    finally:
+        _tenant.reset(token)
+
+
+def current_tenant():
+    """ Returns the tenant set by `for_tenant` for the current thread or
+        task, or None
+    """
+    return _tenant.get()
+
+
+class _Stats:
+
+    def __init__(self):
+        self.queued = 0
+        self.in_flight = 0
+        self.dispatched = 0
+        self.rejected = 0
+        self.shed = 0
+        self.wait_time = 0.0
+        self.max_wait_time = 0.0
+
+    def admit(self, wait_time):
+        self.queued -= 1
+        self.in_flight += 1
+        self.dispatched += 1
+        self.wait_time += wait_time
+        self.max_wait_time = max(self.max_wait_time, wait_time)
+
+    def as_dict(self):
+        return {
+            "queued": self.queued,
+            "in_flight": self.in_flight,
+            "dispatched": self.dispatched,
+            "rejected": self.rejected,
+            "shed": self.shed,
+            "average_wait_time": self.wait_time / self.dispatched if self.dispatched else 0.0,
+            "max_wait_time": self.max_wait_time,
+        }
+
+
+class _LaneState(_Stats):
+
+    def __init__(self, lane):
+        super().__init__()
+        self.lane = lane
+        # the waiters of each tenant, and the tenants' smooth weighted
+        # round robin counters
+        self.queues = {}
+        self.current = {}
+
+
+class _Waiter:
+
+    def __init__(self, state, tenant, enqueued):
+        self.state = state
+        self.tenant = tenant
+        self.enqueued = enqueued
+        self.admitted = False
+
+
+class PriorityScheduler:
+    """
+    Lets at most `max_in_flight` requests be sent at once, and queues the
+    others in lanes. Whenever a request is done, the next one is taken
+    from the first lane with requests waiting, so interactive requests go
+    ahead of any bulk work queued before them.
+
+    Within a lane, requests are queued by tenant (e.g. the customer
+    account they are made for), and the tenants with requests waiting
+    take turns by weighted round robin: a tenant of weight 2 gets twice
+    the turns of a tenant of weight 1, however many requests each queued.
+
+    Under overload, requests fail fast with `SpotifyOverloadedError`
+    rather than waiting indefinitely: when their lane's queue (or their
+    tenant's share of it) is full, or once they waited for its `max_wait`.
+
+    Example usage::
+
+        scheduler = PriorityScheduler(max_in_flight=8)
+        sp = spotipy.Spotify(auth_manager=..., scheduler=scheduler)
+        with priority(BULK):
+            backfill(sp)
+    """
+
+    def __init__(
+        self,
+        max_in_flight=8,
+        lanes=DEFAULT_LANES,
+        default_lane=INTERACTIVE,
+        weights=None,
+        max_queued_per_tenant=None,
+        clock=time.monotonic,
+    ):
+        """
+        Parameters:
+            - max_in_flight - the most requests sent at once
+            - lanes - the `Lane`s, from the highest priority to the lowest
+            - default_lane - the lane of requests made without one
+            - weights - the weight of each tenant, 1 for the others
+            - max_queued_per_tenant - the most requests of one tenant
+              queued in a lane
+            - clock - returns the current time in seconds
+        """
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be positive")
+        self.max_in_flight = max_in_flight
+        self.default_lane = default_lane
+        self.weights = dict(weights or {})
+        self.max_queued_per_tenant = max_queued_per_tenant
+        self.in_flight = 0
+        self._lanes = {lane.name: _LaneState(lane) for lane in lanes}
+        self._tenants = {}
+        if default_lane not in self._lanes:
+            raise ValueError(f"Unknown default lane: {default_lane}")
+        self._clock = clock
+        self._lock = threading.Condition()
+
+    def _state(self, lane):
+        try:
+            return self._lanes[lane or self.default_lane]
+        except KeyError:
+            raise ValueError(f"Unknown lane: {lane}") from None
+
+    def _tenant(self, tenant):
+        stats = self._tenants.get(tenant)
+        if stats is None:
+            stats = self._tenants[tenant] = _Stats()
+        return stats
+
+    def _enqueue(self, lane, tenant):
+        """ Admits a request of `lane` at once if nothing is waiting, or
+            queues it. Returns its waiter.
+        """
+        state = self._state(lane)
+        stats = self._tenant(tenant)
+        waiter = _Waiter(state, tenant, self._clock())
+        queue = state.queues.get(tenant)
+        if self.in_flight < self.max_in_flight and not self.queued:
+            state.queued += 1
+            stats.queued += 1
+            self._admit(waiter)
+            return waiter
+        max_queued = state.lane.max_queued
+        if max_queued is not None and state.queued >= max_queued:
+            reason = "queue full"
+        elif (self.max_queued_per_tenant is not None
+              and len(queue or ()) >= self.max_queued_per_tenant):
+            reason = "queue full for the tenant"
+        else:
+            reason = None
+        if reason is not None:
+            state.rejected += 1
+            stats.rejected += 1
+            raise SpotifyOverloadedError(state.lane.name, reason)
+        if queue is None:
+            queue = state.queues[tenant] = deque()
+            state.current[tenant] = 0
+        queue.append(waiter)
+        state.queued += 1
+        stats.queued += 1
+        return waiter
+
+    def _admit(self, waiter):
+        wait_time = self._clock() - waiter.enqueued
+        waiter.state.admit(wait_time)
+        self._tenants[waiter.tenant].admit(wait_time)
+        self.in_flight += 1
+        waiter.admitted = True
+
+    def _next_tenant(self, state):
+        """ Picks the tenant whose request of the lane goes next, by smooth
+            weighted round robin
+        """
+        total = 0
+        for tenant in state.current:
+            weight = self.weights.get(tenant, 1)
+            state.current[tenant] += weight
+            total += weight
+        tenant = max(state.current, key=state.current.get)
+        state.current[tenant] -= total
+        return tenant
+
+    def _dequeue(self, waiter):
+        state = waiter.state
+        queue = state.queues[waiter.tenant]
+        queue.remove(waiter)
+        if not queue:
+            del state.queues[waiter.tenant]
+            del state.current[waiter.tenant]
+
+    def _dispatch(self):
+        """ Admits waiting requests, by priority, while there is room """
+        for state in self._lanes.values():
+            while state.queues and self.in_flight < self.max_in_flight:
+                waiter = state.queues[self._next_tenant(state)][0]
+                self._dequeue(waiter)
+                self._admit(waiter)
+                self._wake(waiter)
+
+    def _wake(self, waiter):
+        self._lock.notify_all()
+
+    def _leave(self, waiter):
+        """ Removes a waiter that gave up waiting from its queue """
+        self._dequeue(waiter)
+        waiter.state.queued -= 1
+        self._tenants[waiter.tenant].queued -= 1
+
+    def _shed(self, waiter):
+        self._leave(waiter)
+        waiter.state.shed += 1
+        self._tenants[waiter.tenant].shed += 1
+
+    def _release(self, waiter):
+        waiter.state.in_flight -= 1
+        self._tenants[waiter.tenant].in_flight -= 1
+        self.in_flight -= 1
+        self._dispatch()
+
+    @property
+    def queued(self):
+        """ The number of requests waiting, in all the lanes """
+        return sum(state.queued for state in self._lanes.values())
+
+    @contextlib.contextmanager
+    def slot(self, lane=None, tenant=None):
+        """ Waits for the turn of a request of `lane`, made for `tenant`,
+            and counts it as in flight until the block is left. Raises
+            `SpotifyOverloadedError` if the request is rejected or shed.
+        """
+        with self._lock:
+            waiter = self._enqueue(lane, tenant)
+            max_wait = waiter.state.lane.max_wait
+            deadline = None if max_wait is None else waiter.enqueued + max_wait
+            while not waiter.admitted:
+                timeout = None if deadline is None else deadline - self._clock()
+                if timeout is not None and timeout <= 0:
+                    self._shed(waiter)
+                    raise SpotifyOverloadedError(waiter.state.lane.name, "waited too long")
+                self._lock.wait(timeout)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._release(waiter)
+
+    def stats(self):
+        """ Returns, for each lane, the number of requests queued, in
+            flight, dispatched, rejected (because the queue was full) and
+            shed (because they waited too long), and the average and
+            longest time dispatched requests waited, in seconds
+        """
+        with self._lock:
+            return {name: state.as_dict() for name, state in self._lanes.items()}
+
+    def tenant_stats(self):
+        """ Returns the same statistics as `stats` for each tenant that made
+            requests (None for the requests made without a tenant)
+        """
+        with self._lock:
+            return {tenant: stats.as_dict() for tenant, stats in self._tenants.items()}
+
+
+class AsyncPriorityScheduler(PriorityScheduler):
+    """
+    A `PriorityScheduler` for the tasks of an event loop: requests wait
+    for their turn without blocking the loop, and `slot` is used with
+    `async with`.
+    """
+
+    def _enqueue(self, lane, tenant):
+        waiter = super()._enqueue(lane, tenant)
+        if not waiter.admitted:
+            waiter.future = asyncio.get_running_loop().create_future()
+        return waiter
+
+    def _wake(self, waiter):
+        if not waiter.future.done():
+            waiter.future.set_result(None)
+
+    @contextlib.asynccontextmanager
+    async def slot(self, lane=None, tenant=None):
+        with self._lock:
+            waiter = self._enqueue(lane, tenant)
+        if not waiter.admitted:
+            try:
+                await asyncio.wait_for(
+                    asyncio.shield(waiter.future), waiter.state.lane.max_wait
+                )
+            except asyncio.TimeoutError:
+                with self._lock:
+                    if not waiter.admitted:
+                        self._shed(waiter)
+                        raise SpotifyOverloadedError(
+                            waiter.state.lane.name, "waited too long"
+                        ) from None
+            except asyncio.CancelledError:
+                with self._lock:
+                    if waiter.admitted:
+                        self._release(waiter)
+                    else:
+                        self._leave(waiter)
+                raise
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._release(waiter)
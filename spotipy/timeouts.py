@@ -0,0 +1,121 @@
+""" Deadlines for API calls and timeouts adapted to observed latencies """
+
+__all__ = [
+    "AdaptiveTimeout",
+    "LatencyTracker",
+    "current_deadline",
+    "deadline",
+]
+
+import contextlib
+import math
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+
+_deadline = ContextVar("spotipy_deadline", default=None)
+
+
+@contextlib.contextmanager
+def deadline(seconds):
+    """ Limits the calls made in the current thread or task to `seconds`
+        in all, including their retries and the waits between them. A
+        deadline set within another can only be shorter.
+
+        Example usage::
+
+            with deadline(0.5):
+                sp.track(track_id)
+    """
+    expires = time.monotonic() + seconds
+    outer = _deadline.get()
+    token = _deadline.set(expires if outer is None else min(outer, expires))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def current_deadline():
+    """ Returns the time (of `time.monotonic`) at which the deadline set
+        by `deadline` for the current thread or task expires, or None
+    """
+    return _deadline.get()
+
+
+class LatencyTracker:
+    """
+    Keeps the latest `window` latencies of each endpoint (such as
+    ``albums/{id}``) to compute their percentiles.
+    """
+
+    def __init__(self, window=200):
+        self.window = window
+        self._lock = threading.Lock()
+        self._latencies = {}
+
+    def record(self, endpoint, seconds):
+        """ Records the latency of a response of `endpoint` """
+        with self._lock:
+            latencies = self._latencies.get(endpoint)
+            if latencies is None:
+                latencies = self._latencies[endpoint] = deque(maxlen=self.window)
+            latencies.append(seconds)
+
+    def count(self, endpoint):
+        """ Returns the number of latencies kept for `endpoint` """
+        with self._lock:
+            return len(self._latencies.get(endpoint, ()))
+
+    def percentile(self, endpoint, q):
+        """ Returns the `q` quantile (between 0 and 1) of the latencies of
+            `endpoint`, or None if none was recorded
+        """
+        with self._lock:
+            latencies = sorted(self._latencies.get(endpoint, ()))
+        if not latencies:
+            return None
+        rank = math.ceil(q * len(latencies)) - 1
+        return latencies[min(len(latencies) - 1, max(0, rank))]
+
+
+class AdaptiveTimeout:
+    """
+    Picks the timeout of each attempt at an endpoint from the latencies
+    observed for it: `factor` times their `percentile`, but at least
+    `minimum` seconds. Until `min_samples` latencies were observed, and
+    whenever it would be longer, the client's `requests_timeout` is used.
+
+    Example usage::
+
+        sp = spotipy.Spotify(auth_manager=..., adaptive_timeout=AdaptiveTimeout())
+    """
+
+    def __init__(self, percentile=0.99, factor=2.0, minimum=0.25, min_samples=20,
+                 tracker=None):
+        """
+        Parameters:
+            - percentile - the quantile of the latencies to start from
+            - factor - how many times that latency to wait
+            - minimum - the shortest timeout, in seconds
+            - min_samples - the number of latencies to observe first
+            - tracker - a `LatencyTracker`, to share it with others
+        """
+        self.percentile = percentile
+        self.factor = factor
+        self.minimum = minimum
+        self.min_samples = min_samples
+        self.tracker = tracker or LatencyTracker()
+
+    def record(self, endpoint, seconds):
+        self.tracker.record(endpoint, seconds)
+
+    def timeout_for(self, endpoint):
+        """ Returns the timeout of the next attempt at `endpoint`, in
+            seconds, or None to use the client's
+        """
+        if self.tracker.count(endpoint) < self.min_samples:
+            return None
+        latency = self.tracker.percentile(endpoint, self.percentile)
+        return max(self.minimum, latency * self.factor)
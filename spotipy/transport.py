@@ -0,0 +1,356 @@
+""" Pluggable HTTP transports for the Spotify clients and auth managers """
+
+__all__ = [
+    "Transport",
+    "AsyncTransport",
+    "RequestsTransport",
+    "Urllib3Transport",
+    "HTTPXTransport",
+    "AsyncHTTPXTransport",
+]
+
+import json
+import urllib.parse as urllibparse
+
+import requests
+import urllib3
+
+from spotipy.util import REQUESTS_SESSION, Retry
+
+
+def connection_retry(retries, backoff_factor=0):
+    """ Returns a `Retry` that only retries failed connection attempts.
+
+    Bad status codes are retried by the client itself, so that the same
+    policy applies whatever transport is in use.
+    """
+    return Retry(
+        total=retries,
+        connect=None,
+        read=False,
+        status=0,
+        status_forcelist=(),
+        respect_retry_after_header=False,
+        allowed_methods=frozenset(['GET', 'POST', 'PUT', 'DELETE']),
+        backoff_factor=backoff_factor)
+
+
+def _is_urllib3_connect_error(error):
+    """ Tells whether urllib3 failed to connect (once out of retries) """
+    if isinstance(error, urllib3.exceptions.MaxRetryError):
+        error = error.reason
+    # including NewConnectionError, for refused connections
+    return isinstance(error, urllib3.exceptions.ConnectTimeoutError)
+
+
+def merge_params(url, params):
+    """ Appends the non-empty query parameters to the URL, keeping any
+        query string the URL already carries (like `requests` does).
+    """
+    if not params:
+        return url
+    query = urllibparse.urlencode(
+        [(k, v) for k, v in params.items() if v is not None], doseq=True
+    )
+    if not query:
+        return url
+    return url + ("&" if urllibparse.urlsplit(url).query else "?") + query
+
+
+def _encode_body(headers, data):
+    """ Form-encodes dictionary bodies, as `requests` does for `data=` """
+    if isinstance(data, dict):
+        headers = dict(headers or {})
+        headers.setdefault("Content-Type", "application/x-www-form-urlencoded")
+        data = urllibparse.urlencode(data)
+    return headers, data
+
+
+class Response:
+    """ A minimal response, as returned by `Urllib3Transport` """
+
+    __slots__ = ("status_code", "headers", "content", "url")
+
+    def __init__(self, status_code, headers, content, url):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.url = url
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class Transport:
+    """
+    Sends HTTP requests for `Spotify` and the auth managers.
+
+    Custom transports must implement `request`, which sends a single
+    request and returns a response with `status_code`, `headers`
+    (case-insensitive), `content`, `text`, `url` and `json()`. Unsuccessful
+    status codes must be returned, not raised: the client decides whether
+    to retry them. A transport may retry failed connection attempts.
+    """
+
+    def request(self, method, url, params=None, headers=None, data=None,
+                timeout=None, proxies=None):
+        """
+        Sends a request and returns the response.
+
+        Parameters:
+            - method - the HTTP method
+            - url - the absolute URL, which may already have a query string
+            - params - query parameters, `None` values are left out
+            - headers - request headers
+            - data - the body as a string/bytes, or a dict to form-encode
+            - timeout - seconds to wait for the server, or a (connect, read) tuple
+            - proxies - proxy URLs by scheme (not supported by all transports)
+        """
+        raise NotImplementedError()
+
+    def is_read_timeout(self, error):
+        """ Tells whether an exception raised by `request` means that the
+            server took too long to answer, so that the client may retry
+            idempotent requests
+        """
+        return False
+
+    def is_connect_error(self, error):
+        """ Tells whether an exception raised by `request` means that no
+            connection to the server could be made, so that the request
+            wasn't sent and the client may retry it
+        """
+        return False
+
+    def close(self):
+        """ Releases the connections held by the transport """
+
+
+class AsyncTransport:
+    """
+    Asynchronous counterpart of `Transport`, used by `AsyncSpotify` and
+    the auth managers in `spotipy.async_oauth2`. `request` and `close`
+    are coroutines.
+    """
+
+    async def request(self, method, url, params=None, headers=None, data=None,
+                      timeout=None, proxies=None):
+        raise NotImplementedError()
+
+    def is_read_timeout(self, error):
+        return False
+
+    def is_connect_error(self, error):
+        return False
+
+    async def close(self):
+        pass
+
+
+class RequestsTransport(Transport):
+    """ Sends requests through a `requests.Session` (the default) """
+
+    def __init__(self, session=None):
+        """
+        Parameters:
+            - session - a `requests.Session`, or the `requests.api` module to
+                        send every request on a new connection. A session is
+                        created if not supplied.
+        """
+        self.session = session if session is not None else requests.Session()
+
+    def request(self, method, url, params=None, headers=None, data=None,
+                timeout=None, proxies=None):
+        return self.session.request(
+            method, url, params=params, headers=headers, data=data,
+            timeout=timeout, proxies=proxies,
+        )
+
+    def is_read_timeout(self, error):
+        return isinstance(error, requests.exceptions.ReadTimeout)
+
+    def is_connect_error(self, error):
+        if isinstance(error, requests.exceptions.ConnectTimeout):
+            return True
+        return (isinstance(error, requests.exceptions.ConnectionError)
+                and bool(error.args) and _is_urllib3_connect_error(error.args[0]))
+
+    def close(self):
+        if isinstance(self.session, REQUESTS_SESSION):
+            self.session.close()
+
+
+class Urllib3Transport(Transport):
+    """
+    Sends requests straight through a `urllib3.PoolManager`.
+
+    This skips the per-request work `requests` does on top of urllib3
+    (hooks, cookie handling and merging environment settings), which adds
+    up for clients making many calls. Proxies are configured once, when
+    the transport is created.
+    """
+
+    def __init__(self, pool_manager=None, retries=0, backoff_factor=0.3,
+                 proxies=None, maxsize=10):
+        """
+        Parameters:
+            - pool_manager - a `urllib3.PoolManager` to send requests with.
+                             Created if not supplied.
+            - retries - number of times to retry failed connection attempts
+              (none by default: `Spotify` retries them within its deadline)
+            - backoff_factor - backoff factor between connection attempts
+            - proxies - proxy URLs by scheme; the `https` proxy (or else the
+                        `http` one) is used for all requests
+            - maxsize - number of connections to keep per host
+        """
+        if pool_manager is None:
+            retry = connection_retry(retries, backoff_factor)
+            proxy = (proxies or {}).get("https") or (proxies or {}).get("http")
+            if proxy:
+                pool_manager = urllib3.ProxyManager(proxy, retries=retry, maxsize=maxsize)
+            else:
+                pool_manager = urllib3.PoolManager(retries=retry, maxsize=maxsize)
+        self.pool_manager = pool_manager
+
+    def request(self, method, url, params=None, headers=None, data=None,
+                timeout=None, proxies=None):
+        url = merge_params(url, params)
+        headers, data = _encode_body(headers, data)
+        if isinstance(timeout, tuple):
+            timeout = urllib3.Timeout(connect=timeout[0], read=timeout[1])
+        response = self.pool_manager.request(
+            method, url, body=data, headers=headers, timeout=timeout,
+        )
+        return Response(response.status, response.headers, response.data, url)
+
+    def is_read_timeout(self, error):
+        return isinstance(error, urllib3.exceptions.ReadTimeoutError)
+
+    def is_connect_error(self, error):
+        return _is_urllib3_connect_error(error)
+
+    def close(self):
+        self.pool_manager.clear()
+
+
+def _httpx_timeout(timeout):
+    if isinstance(timeout, tuple):
+        import httpx
+        return httpx.Timeout(None, connect=timeout[0], read=timeout[1])
+    return timeout
+
+
+def _is_httpx_read_timeout(error):
+    import httpx
+    return isinstance(error, httpx.ReadTimeout)
+
+
+def _is_httpx_connect_error(error):
+    import httpx
+    return isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout))
+
+
+def _httpx_client_kwargs(transport_cls, retries, proxies, http2):
+    mounts = None
+    if proxies:
+        mounts = {
+            f"{scheme}://": transport_cls(proxy=proxy, retries=retries, http2=http2)
+            for scheme, proxy in proxies.items()
+        }
+    return dict(
+        transport=transport_cls(retries=retries, http2=http2),
+        mounts=mounts,
+        follow_redirects=True,
+    )
+
+
+class HTTPXTransport(Transport):
+    """
+    Sends requests through an `httpx.Client` (``pip install httpx``).
+
+    With ``http2=True`` concurrent requests from several threads are
+    multiplexed as streams over a shared connection, instead of each
+    needing a pooled connection (and TLS handshake) of its own.
+    """
+
+    def __init__(self, client=None, retries=0, proxies=None, http2=False):
+        """
+        Parameters:
+            - client - an `httpx.Client` to send requests with. Created if
+                       not supplied.
+            - retries - number of times to retry failed connection attempts
+              (none by default: `Spotify` retries them within its deadline)
+            - proxies - proxy URLs by scheme
+            - http2 - negotiate HTTP/2 with the server, falling back to
+                      HTTP/1.1 (``pip install "spotipy[http2]"``)
+        """
+        if client is None:
+            import httpx
+            client = httpx.Client(
+                **_httpx_client_kwargs(httpx.HTTPTransport, retries, proxies, http2)
+            )
+        self.client = client
+
+    def request(self, method, url, params=None, headers=None, data=None,
+                timeout=None, proxies=None):
+        headers, data = _encode_body(headers, data)
+        return self.client.request(
+            method, merge_params(url, params), headers=headers, content=data,
+            timeout=_httpx_timeout(timeout),
+        )
+
+    def is_read_timeout(self, error):
+        return _is_httpx_read_timeout(error)
+
+    def is_connect_error(self, error):
+        return _is_httpx_connect_error(error)
+
+    def close(self):
+        self.client.close()
+
+
+class AsyncHTTPXTransport(AsyncTransport):
+    """
+    Sends requests through an `httpx.AsyncClient` (``pip install httpx``).
+
+    See `HTTPXTransport` for ``http2=True``.
+    """
+
+    def __init__(self, client=None, retries=0, proxies=None, http2=False):
+        """
+        Parameters:
+            - client - an `httpx.AsyncClient` to send requests with. Created
+                       if not supplied.
+            - retries - number of times to retry failed connection attempts
+              (none by default: `Spotify` retries them within its deadline)
+            - proxies - proxy URLs by scheme
+            - http2 - negotiate HTTP/2 with the server, falling back to
+                      HTTP/1.1 (``pip install "spotipy[http2]"``)
+        """
+        if client is None:
+            import httpx
+            client = httpx.AsyncClient(
+                **_httpx_client_kwargs(httpx.AsyncHTTPTransport, retries, proxies, http2)
+            )
+        self.client = client
+
+    async def request(self, method, url, params=None, headers=None, data=None,
+                      timeout=None, proxies=None):
+        headers, data = _encode_body(headers, data)
+        return await self.client.request(
+            method, merge_params(url, params), headers=headers, content=data,
+            timeout=_httpx_timeout(timeout),
+        )
+
+    def is_read_timeout(self, error):
+        return _is_httpx_read_timeout(error)
+
+    def is_connect_error(self, error):
+        return _is_httpx_connect_error(error)
+
+    async def close(self):
+        await self.client.aclose()
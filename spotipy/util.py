@@ -4,6 +4,7 @@ from __future__ import annotations
 
 __all__ = ["CLIENT_CREDS_ENV_VARS", "prompt_for_user_token"]
 
+import inspect
 import logging
 import os
 import warnings
@@ -157,6 +158,17 @@ def normalize_scope(scope):
         return None
 
 
+async def resolve_awaitable(value):
+    """ Awaits `value` if it is awaitable and returns it unchanged otherwise.
+
+    Used by the asynchronous client and auth managers so that they can work
+    with both synchronous and asynchronous cache handlers and auth managers.
+    """
+    if inspect.isawaitable(value):
+        return await value
+    return value
+
+
 class Retry(urllib3.Retry):
     """
     Custom class for printing a warning when a rate/request limit is reached.
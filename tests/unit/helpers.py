@@ -0,0 +1,70 @@
+""" Fakes shared by the unit tests """
+
+import json
+
+from spotipy.transport import AsyncTransport, Response, Transport
+
+
+class FakeClock:
+    """ A clock that only moves when a test sets or advances `now` """
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class EntityTransport(Transport):
+    """ Answers requests for entities with made up ones. Requests for
+        several entities including "invalid" fail with 400 Bad Request.
+    """
+
+    def __init__(self):
+        self.requests = []
+
+    def request(self, method, url, params=None, **kwargs):
+        self.requests.append((url, params))
+        path = url.split("/v1/")[1]
+        kind, rest = path.split("/", 1)
+        if rest.startswith("?ids="):
+            ids = rest[len("?ids="):].split(",")
+            if "invalid" in ids:
+                body = {"error": {"status": 400, "message": "invalid id"}}
+                return Response(400, {}, json.dumps(body).encode(), url)
+            body = {kind: [None if i == "missing" else {"id": i} for i in ids]}
+        elif rest == "invalid":
+            body = {"error": {"status": 400, "message": "invalid id"}}
+            return Response(400, {}, json.dumps(body).encode(), url)
+        else:
+            body = {"id": rest}
+        return Response(200, {}, json.dumps(body).encode(), url)
+
+
+class FailingTransport(Transport):
+    """ Answers requests to URLs containing `failing` (all of them by
+        default) with 503s, and the others with 200s
+    """
+
+    def __init__(self, failing=""):
+        self.failing = failing
+        self.urls = []
+
+    def request(self, method, url, **kwargs):
+        self.urls.append(url)
+        status = 503 if self.failing in url else 200
+        return Response(status, {}, b'{"id": "abc"}', url)
+
+
+class AsyncAdapter(AsyncTransport):
+    """ Lets `AsyncSpotify` use a fake `Transport` """
+
+    def __init__(self, transport):
+        self.transport = transport
+
+    @property
+    def requests(self):
+        return self.transport.requests
+
+    async def request(self, *args, **kwargs):
+        return self.transport.request(*args, **kwargs)
@@ -0,0 +1,139 @@
+import json
+import unittest
+
+from spotipy import AsyncSpotify, SpotifyException
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+def _make_client(handler, **kwargs):
+    session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return AsyncSpotify(auth="TOKEN", requests_session=session, backoff_factor=0, **kwargs)
+
+
+@unittest.skipIf(httpx is None, "httpx is not installed")
+class AsyncSpotifyTest(unittest.IsolatedAsyncioTestCase):
+
+    async def test_get_builds_request(self):
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, json={"id": "abc"})
+
+        async with _make_client(handler, language="de") as sp:
+            track = await sp.track("spotify:track:abc", market="DE")
+
+        self.assertEqual(track, {"id": "abc"})
+        self.assertEqual(len(requests), 1)
+        request = requests[0]
+        self.assertEqual(request.method, "GET")
+        self.assertEqual(str(request.url), "https://api.spotify.com/v1/tracks/abc?market=DE")
+        self.assertEqual(request.headers["Authorization"], "Bearer TOKEN")
+        self.assertEqual(request.headers["Accept-Language"], "de")
+
+    async def test_drops_empty_params_and_merges_query(self):
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, json={"tracks": []})
+
+        async with _make_client(handler) as sp:
+            await sp.tracks(["abc", "def"])
+
+        self.assertEqual(requests[0].url.path, "/v1/tracks/")
+        self.assertEqual(dict(requests[0].url.params), {"ids": "abc,def"})
+
+    async def test_sends_json_payload(self):
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(201, json={"snapshot_id": "snap"})
+
+        async with _make_client(handler) as sp:
+            result = await sp.playlist_add_items("pl", ["spotify:track:abc"], position=0)
+
+        self.assertEqual(result, {"snapshot_id": "snap"})
+        self.assertEqual(requests[0].method, "POST")
+        self.assertEqual(json.loads(requests[0].content), ["spotify:track:abc"])
+        self.assertEqual(requests[0].url.params["position"], "0")
+
+    async def test_maps_errors_to_spotify_exception(self):
+        def handler(request):
+            return httpx.Response(
+                404, json={"error": {"message": "Non existing id", "reason": "NOPE"}}
+            )
+
+        async with _make_client(handler) as sp:
+            with self.assertRaises(SpotifyException) as error:
+                await sp.album("abc")
+
+        self.assertEqual(error.exception.http_status, 404)
+        self.assertEqual(error.exception.reason, "NOPE")
+        self.assertIn("Non existing id", error.exception.msg)
+
+    async def test_retries_bad_status_codes(self):
+        statuses = [503, 200]
+
+        def handler(request):
+            return httpx.Response(statuses.pop(0), json={"id": "abc"})
+
+        async with _make_client(handler) as sp:
+            self.assertEqual(await sp.artist("abc"), {"id": "abc"})
+        self.assertEqual(statuses, [])
+
+    async def test_max_retries(self):
+        def handler(request):
+            return httpx.Response(500)
+
+        async with _make_client(handler, retries=2, status_retries=2) as sp:
+            with self.assertRaises(SpotifyException) as error:
+                await sp.artist("abc")
+
+        self.assertEqual(error.exception.http_status, 429)
+        self.assertIn("Max Retries", error.exception.msg)
+
+    async def test_empty_body_returns_none(self):
+        def handler(request):
+            return httpx.Response(204)
+
+        async with _make_client(handler) as sp:
+            self.assertIsNone(await sp.pause_playback())
+            self.assertIsNone(await sp.volume(50))
+            # invalid input is rejected without calling the API
+            self.assertIsNone(await sp.volume(101))
+
+    async def test_next_without_next_page(self):
+        async with _make_client(lambda request: httpx.Response(500)) as sp:
+            self.assertIsNone(await sp.next({"next": None}))
+
+    async def test_post_processed_results(self):
+        def handler(request):
+            return httpx.Response(200, json={"audio_features": [{"id": "abc"}]})
+
+        async with _make_client(handler) as sp:
+            with self.assertWarns(DeprecationWarning):
+                features = await sp.audio_features(["abc"])
+        self.assertEqual(features, [{"id": "abc"}])
+
+    async def test_search_markets(self):
+        markets = []
+
+        def handler(request):
+            markets.append(request.url.params["market"])
+            items = [{"id": str(i)} for i in range(int(request.url.params["limit"]))]
+            return httpx.Response(200, json={"tracks": {"items": items}})
+
+        async with _make_client(handler) as sp:
+            with self.assertWarns(UserWarning):
+                results = await sp.search_markets("q", limit=3, markets=["DE", "SE", "US"],
+                                                  total=5)
+
+        self.assertEqual(markets, ["DE", "SE"])
+        self.assertEqual(len(results["DE"]["tracks"]["items"]), 3)
+        self.assertEqual(len(results["SE"]["tracks"]["items"]), 2)
@@ -0,0 +1,165 @@
+import asyncio
+import os
+import tempfile
+import time
+import unittest
+
+from spotipy import AsyncSpotify
+from spotipy.async_oauth2 import (AsyncSpotifyClientCredentials,
+                                  AsyncSpotifyOAuth)
+from spotipy.cache_handler import (AsyncCacheFileHandler,
+                                   AsyncRedisCacheHandler, MemoryCacheHandler)
+from spotipy.exceptions import SpotifyOauthError
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    import aiofiles
+except ImportError:
+    aiofiles = None
+
+try:
+    import fakeredis
+except ImportError:
+    fakeredis = None
+
+
+def _token_handler(calls, status=200, **extra):
+    async def handler(request):
+        calls.append(request)
+        # give concurrent tasks a chance to pile up behind the first request
+        await asyncio.sleep(0.01)
+        body = {"access_token": f"ACCESS{len(calls)}", "expires_in": 3600}
+        body.update(extra)
+        return httpx.Response(status, json=body)
+    return handler
+
+
+def _session(handler):
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+@unittest.skipIf(httpx is None, "httpx is not installed")
+class AsyncSpotifyClientCredentialsTest(unittest.IsolatedAsyncioTestCase):
+
+    async def test_concurrent_requests_share_one_token_request(self):
+        calls = []
+        creds = AsyncSpotifyClientCredentials(
+            "ID", "SECRET",
+            requests_session=_session(_token_handler(calls)),
+            cache_handler=MemoryCacheHandler(),
+        )
+
+        tokens = await asyncio.gather(
+            *(creds.get_access_token(as_dict=False) for _ in range(10))
+        )
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(set(tokens), {"ACCESS1"})
+        self.assertEqual(calls[0].headers["Authorization"], "Basic SUQ6U0VDUkVU")
+        self.assertEqual(creds.cache_handler.get_cached_token()["access_token"], "ACCESS1")
+
+    async def test_error_response(self):
+        async def handler(request):
+            return httpx.Response(400, json={"error": "invalid_client"})
+
+        creds = AsyncSpotifyClientCredentials(
+            "ID", "SECRET", requests_session=_session(handler),
+            cache_handler=MemoryCacheHandler(),
+        )
+        with self.assertRaises(SpotifyOauthError) as error:
+            await creds.get_access_token(check_cache=False)
+        self.assertEqual(error.exception.error, "invalid_client")
+
+    async def test_used_by_async_client(self):
+        calls = []
+        creds = AsyncSpotifyClientCredentials(
+            "ID", "SECRET",
+            requests_session=_session(_token_handler(calls)),
+            cache_handler=MemoryCacheHandler(),
+        )
+
+        def api(request):
+            return httpx.Response(200, json={"auth": request.headers["Authorization"]})
+
+        async with AsyncSpotify(auth_manager=creds, requests_session=_session(api)) as sp:
+            self.assertEqual(await sp.me(), {"auth": "Bearer ACCESS1"})
+
+    def test_default_cache_handler_is_async(self):
+        creds = AsyncSpotifyClientCredentials("ID", "SECRET")
+        self.assertIsInstance(creds.cache_handler, AsyncCacheFileHandler)
+
+
+@unittest.skipIf(httpx is None, "httpx is not installed")
+class AsyncSpotifyOAuthTest(unittest.IsolatedAsyncioTestCase):
+
+    def _make_oauth(self, calls, token_info):
+        return AsyncSpotifyOAuth(
+            "CLID", "CLISEC", "REDIR", scope="user-read-email",
+            requests_session=_session(_token_handler(calls)),
+            cache_handler=MemoryCacheHandler(token_info),
+        )
+
+    async def test_expired_token_is_refreshed_once(self):
+        calls = []
+        expired = {"access_token": "OLD", "refresh_token": "REFRESH",
+                   "expires_at": 0, "scope": "user-read-email"}
+        oauth = self._make_oauth(calls, expired)
+
+        tokens = await asyncio.gather(
+            *(oauth.get_access_token(as_dict=False) for _ in range(5))
+        )
+
+        self.assertEqual(len(calls), 1)
+        self.assertIn(b"grant_type=refresh_token", calls[0].content)
+        self.assertEqual(set(tokens), {"ACCESS1"})
+        # the refresh token is kept if the response doesn't contain a new one
+        self.assertEqual(oauth.cache_handler.get_cached_token()["refresh_token"], "REFRESH")
+
+    async def test_valid_cached_token(self):
+        calls = []
+        token = {"access_token": "CACHED", "refresh_token": "REFRESH",
+                 "expires_at": int(time.time()) + 3600, "scope": "user-read-email"}
+        oauth = self._make_oauth(calls, token)
+
+        self.assertEqual(await oauth.get_access_token(as_dict=False), "CACHED")
+        self.assertEqual(calls, [])
+
+    async def test_exchanges_code(self):
+        calls = []
+        oauth = self._make_oauth(calls, None)
+
+        token = await oauth.get_access_token("CODE", as_dict=False)
+
+        self.assertEqual(token, "ACCESS1")
+        self.assertIn(b"code=CODE", calls[0].content)
+
+
+@unittest.skipIf(aiofiles is None, "aiofiles is not installed")
+class AsyncCacheFileHandlerTest(unittest.IsolatedAsyncioTestCase):
+
+    async def test_round_trip(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, ".cache")
+            handler = AsyncCacheFileHandler(cache_path=path)
+
+            self.assertIsNone(await handler.get_cached_token())
+            await handler.save_token_to_cache({"access_token": "ACCESS"})
+
+            self.assertEqual(await handler.get_cached_token(), {"access_token": "ACCESS"})
+            self.assertEqual(os.stat(path).st_mode & 0o777, 0o600)
+
+
+@unittest.skipIf(fakeredis is None, "fakeredis is not installed")
+class AsyncRedisCacheHandlerTest(unittest.IsolatedAsyncioTestCase):
+
+    async def test_round_trip(self):
+        handler = AsyncRedisCacheHandler(fakeredis.FakeAsyncRedis(), key="token")
+
+        self.assertIsNone(await handler.get_cached_token())
+        await handler.save_token_to_cache({"access_token": "ACCESS"})
+
+        self.assertEqual(await handler.get_cached_token(), {"access_token": "ACCESS"})
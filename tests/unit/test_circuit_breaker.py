@@ -0,0 +1,155 @@
+import asyncio
+import unittest
+
+import requests
+
+from spotipy import (AsyncSpotify, Spotify, SpotifyCircuitOpenError,
+                     SpotifyException)
+from spotipy.circuit_breaker import (CLOSED, HALF_OPEN, OPEN, CircuitBreaker,
+                                     CircuitBreakers)
+from spotipy.transport import AsyncTransport, Transport
+from tests.unit.helpers import FailingTransport, FakeClock
+
+
+class CircuitBreakerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock(0.0)
+        self.breaker = CircuitBreaker(failure_rate=0.5, min_requests=4, window=4,
+                                      reset_timeout=10, clock=self.clock)
+
+    def fail(self, times=1):
+        for _ in range(times):
+            self.breaker.record(self.breaker.admit(), False)
+
+    def test_opens_at_the_failure_rate(self):
+        self.breaker.record(self.breaker.admit(), True)
+        self.breaker.record(self.breaker.admit(), True)
+        self.fail()
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.fail()
+        self.assertEqual(self.breaker.state, OPEN)
+        self.assertIsNone(self.breaker.admit())
+        self.assertEqual(self.breaker.stats()["rejected"], 1)
+
+    def test_needs_min_requests(self):
+        self.fail(3)
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.assertEqual(self.breaker.stats()["failure_rate"], 1.0)
+
+    def test_probe_success_closes(self):
+        self.fail(4)
+        self.clock.now = 10
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+        probe = self.breaker.admit()
+        self.assertIsNone(self.breaker.admit())
+        self.breaker.record(probe, True)
+        self.assertEqual(self.breaker.state, CLOSED)
+
+    def test_probe_failure_reopens(self):
+        self.fail(4)
+        self.clock.now = 10
+        self.breaker.record(self.breaker.admit(), False)
+        self.assertEqual(self.breaker.state, OPEN)
+        self.assertEqual(self.breaker.stats()["opened"], 2)
+
+    def test_cancelled_probe(self):
+        self.fail(4)
+        self.clock.now = 10
+        self.breaker.cancel(self.breaker.admit())
+        self.assertIsNotNone(self.breaker.admit())
+
+    def test_ignores_outcomes_of_earlier_states(self):
+        late = self.breaker.admit()
+        self.fail(4)
+        self.clock.now = 10
+        probe = self.breaker.admit()
+        self.breaker.record(late, False)
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+        self.breaker.record(probe, True)
+        self.assertEqual(self.breaker.state, CLOSED)
+
+
+class ClientCircuitBreakerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.breakers = CircuitBreakers(min_requests=2, window=2)
+        self.transport = FailingTransport("/me/player")
+        self.sp = Spotify(auth="TOKEN", transport=self.transport, retries=0,
+                          status_retries=0, circuit_breakers=self.breakers)
+
+    def test_fails_fast_per_family(self):
+        for _ in range(2):
+            with self.assertRaises(SpotifyException):
+                self.sp.current_playback()
+        with self.assertRaises(SpotifyCircuitOpenError) as context:
+            self.sp.devices()
+
+        self.assertEqual(context.exception.family, "me/player")
+        self.assertEqual(len(self.transport.urls), 2)
+        self.assertEqual(self.sp.track("abc"), {"id": "abc"})
+        self.assertEqual(self.breakers.states(), {"me/player": OPEN, "tracks": CLOSED})
+        self.assertEqual(self.breakers.stats()["me/player"]["rejected"], 1)
+
+    def test_transport_errors_are_failures(self):
+        class Unreachable(Transport):
+            def request(self, method, url, **kwargs):
+                raise requests.exceptions.ConnectionError()
+
+        sp = Spotify(auth="TOKEN", transport=Unreachable(), retries=0,
+                     circuit_breakers=self.breakers)
+        for _ in range(2):
+            with self.assertRaises(requests.exceptions.ConnectionError):
+                sp.track("abc")
+        with self.assertRaises(SpotifyCircuitOpenError):
+            sp.track("abc")
+
+    def test_endpoint_family(self):
+        for endpoint, family in [
+            ("me/player/devices", "me/player"),
+            ("me", "me"),
+            ("browse/categories/{id}", "browse/categories"),
+            ("audio-analysis/{id}", "audio-analysis"),
+            ("albums/{id}/tracks", "albums"),
+        ]:
+            self.assertEqual(self.sp._endpoint_family(endpoint), family)
+
+    def test_async(self):
+        transport = self.transport
+
+        class Async(AsyncTransport):
+            async def request(self, *args, **kwargs):
+                return transport.request(*args, **kwargs)
+
+        async def main():
+            sp = AsyncSpotify(auth="TOKEN", transport=Async(), retries=0, status_retries=0,
+                              circuit_breakers=True)
+            for _ in range(10):
+                with self.assertRaises(SpotifyException):
+                    await sp.current_playback()
+            with self.assertRaises(SpotifyCircuitOpenError):
+                await sp.current_playback()
+            return sp
+
+        sp = asyncio.run(main())
+        self.assertEqual(sp.circuit_breakers.states(), {"me/player": OPEN})
+        self.assertEqual(len(transport.urls), 10)
+
+    def test_cancelled_probe_gives_its_permit_back(self):
+        clock = FakeClock(0.0)
+        breakers = CircuitBreakers(min_requests=1, window=1, reset_timeout=10, clock=clock)
+        breakers.get("tracks").record(breakers.get("tracks").admit(), False)
+        clock.now = 10
+
+        class Slow(AsyncTransport):
+            async def request(self, method, url, **kwargs):
+                await asyncio.sleep(1)
+
+        async def main():
+            sp = AsyncSpotify(auth="TOKEN", transport=Slow(), circuit_breakers=breakers)
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(sp.track("abc"), 0.05)
+
+        asyncio.run(main())
+        self.assertEqual(breakers.states(), {"tracks": HALF_OPEN})
+        self.assertIsNotNone(breakers.get("tracks").admit())
@@ -0,0 +1,104 @@
+import asyncio
+import json
+import unittest
+
+from spotipy import AsyncSpotify, Spotify
+from spotipy.transport import Response, Transport
+from tests.unit.helpers import AsyncAdapter
+
+
+class PlaylistTransport(Transport):
+    """ Records playlist writes and answers each with a new snapshot ID """
+
+    def __init__(self):
+        self.requests = []
+
+    def request(self, method, url, params=None, data=None, **kwargs):
+        params = {k: v for k, v in (params or {}).items() if v is not None}
+        self.requests.append((method, params, json.loads(data)))
+        body = {"snapshot_id": f"snap{len(self.requests)}"}
+        return Response(201, {}, json.dumps(body).encode(), url)
+
+
+def uris(n, start=0):
+    return [f"spotify:track:{i:022d}" for i in range(start, start + n)]
+
+
+class PlaylistWritesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.transport = PlaylistTransport()
+        self.sp = Spotify(auth="TOKEN", transport=self.transport)
+
+    def test_add_items_in_chunks(self):
+        items = uris(250)
+
+        result = self.sp.playlist_add_items("pl", items)
+
+        self.assertEqual(result, {"snapshot_id": "snap3"})
+        self.assertEqual(self.transport.requests, [
+            ("POST", {}, items[:100]),
+            ("POST", {}, items[100:200]),
+            ("POST", {}, items[200:]),
+        ])
+
+    def test_add_items_at_position_keeps_order(self):
+        items = uris(150)
+
+        self.sp.playlist_add_items("pl", items, position=5)
+
+        self.assertEqual(self.transport.requests, [
+            ("POST", {"position": 5}, items[:100]),
+            ("POST", {"position": 105}, items[100:]),
+        ])
+
+    def test_add_few_items(self):
+        self.sp.playlist_add_items("pl", uris(3), position=0)
+        self.assertEqual(self.transport.requests, [("POST", {"position": 0}, uris(3))])
+
+    def test_replace_items_then_append(self):
+        items = uris(201)
+
+        result = self.sp.playlist_replace_items("pl", items)
+
+        self.assertEqual(result, {"snapshot_id": "snap3"})
+        self.assertEqual(self.transport.requests, [
+            ("PUT", {}, {"uris": items[:100]}),
+            ("POST", {}, items[100:200]),
+            ("POST", {}, items[200:]),
+        ])
+
+    def test_replace_with_nothing_clears(self):
+        self.sp.playlist_replace_items("pl", [])
+        self.assertEqual(self.transport.requests, [("PUT", {}, {"uris": []})])
+
+    def test_remove_items_chains_snapshots(self):
+        items = uris(120) + uris(10)
+
+        result = self.sp.playlist_remove_all_occurrences_of_items(
+            "pl", items, snapshot_id="start"
+        )
+
+        self.assertEqual(result, {"snapshot_id": "snap2"})
+        (_, _, first), (_, _, second) = self.transport.requests
+        self.assertEqual(first["snapshot_id"], "start")
+        self.assertEqual(first["tracks"], [{"uri": uri} for uri in uris(100)])
+        self.assertEqual(second["snapshot_id"], "snap1")
+        self.assertEqual(second["tracks"], [{"uri": uri} for uri in uris(20, 100)])
+
+
+class AsyncPlaylistWritesTest(unittest.TestCase):
+
+    def test_replace_items_then_append(self):
+        transport = AsyncAdapter(PlaylistTransport())
+        items = uris(150)
+
+        async def main():
+            sp = AsyncSpotify(auth="TOKEN", transport=transport)
+            return await sp.playlist_replace_items("pl", items)
+
+        self.assertEqual(asyncio.run(main()), {"snapshot_id": "snap2"})
+        self.assertEqual(transport.requests, [
+            ("PUT", {}, {"uris": items[:100]}),
+            ("POST", {}, items[100:]),
+        ])
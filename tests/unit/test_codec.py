@@ -0,0 +1,148 @@
+import json
+import os
+import tempfile
+import unittest
+
+from spotipy import Spotify
+from spotipy.cache_handler import CacheFileHandler, RedisCacheHandler
+from spotipy.codec import JSONCodec, MsgspecCodec, OrjsonCodec, get_codec
+from spotipy.transport import Response, Transport
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import fakeredis
+except ImportError:
+    fakeredis = None
+
+
+class CodecTestMixin:
+
+    def test_round_trip(self):
+        obj = {"name": "Björk", "popularity": 71, "genres": ["art pop"], "explicit": False}
+        encoded = self.codec.dumps(obj)
+        self.assertIsInstance(encoded, str)
+        self.assertEqual(json.loads(encoded), obj)
+        self.assertEqual(self.codec.loads(encoded), obj)
+        self.assertEqual(self.codec.loads(encoded.encode("utf-8")), obj)
+
+    def test_invalid_input_raises_value_error(self):
+        for data in (b"", b"<html>", b'{"a": '):
+            with self.assertRaises(ValueError):
+                self.codec.loads(data)
+
+
+class JSONCodecTest(CodecTestMixin, unittest.TestCase):
+
+    def setUp(self):
+        self.codec = JSONCodec()
+
+
+@unittest.skipIf(orjson is None, "orjson is not installed")
+class OrjsonCodecTest(CodecTestMixin, unittest.TestCase):
+
+    def setUp(self):
+        self.codec = OrjsonCodec()
+
+
+@unittest.skipIf(msgspec is None, "msgspec is not installed")
+class MsgspecCodecTest(CodecTestMixin, unittest.TestCase):
+
+    def setUp(self):
+        self.codec = MsgspecCodec()
+
+
+class GetCodecTest(unittest.TestCase):
+
+    def test_default_prefers_fast_libraries(self):
+        expected = OrjsonCodec if orjson else MsgspecCodec if msgspec else JSONCodec
+        self.assertIsInstance(get_codec(), expected)
+
+    def test_by_name(self):
+        self.assertIsInstance(get_codec("json"), JSONCodec)
+
+    def test_instance(self):
+        codec = JSONCodec()
+        self.assertIs(get_codec(codec), codec)
+
+    def test_unknown_name(self):
+        with self.assertRaises(ValueError):
+            get_codec("yaml")
+
+
+class RecordingTransport(Transport):
+
+    def __init__(self, content):
+        self.content = content
+        self.requests = []
+
+    def request(self, method, url, **kwargs):
+        self.requests.append(kwargs)
+        return Response(200, {}, self.content, url)
+
+
+class ClientCodecTest(unittest.TestCase):
+
+    def test_decodes_response_and_encodes_payload(self):
+        calls = []
+
+        class TracingCodec(JSONCodec):
+            def loads(self, data):
+                calls.append(("loads", data))
+                return super().loads(data)
+
+            def dumps(self, obj):
+                calls.append(("dumps", obj))
+                return super().dumps(obj)
+
+        transport = RecordingTransport(b'{"snapshot_id": "snap"}')
+        sp = Spotify(auth="TOKEN", transport=transport, codec=TracingCodec())
+
+        result = sp.playlist_add_items("pl", ["spotify:track:abc"])
+
+        self.assertEqual(result, {"snapshot_id": "snap"})
+        self.assertEqual(calls, [
+            ("dumps", ["spotify:track:abc"]),
+            ("loads", b'{"snapshot_id": "snap"}'),
+        ])
+        self.assertEqual(json.loads(transport.requests[0]["data"]), ["spotify:track:abc"])
+
+    def test_empty_body(self):
+        sp = Spotify(auth="TOKEN", transport=RecordingTransport(b""))
+        self.assertIsNone(sp.pause_playback())
+
+
+class CacheHandlerCodecTest(unittest.TestCase):
+
+    def test_file_handler(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, ".cache")
+            handler = CacheFileHandler(cache_path=path, codec="json")
+
+            handler.save_token_to_cache({"access_token": "ACCESS"})
+
+            self.assertEqual(handler.get_cached_token(), {"access_token": "ACCESS"})
+            with open(path, "w") as f:
+                f.write("not json")
+            self.assertIsNone(handler.get_cached_token())
+
+    def test_encoder_cls_takes_precedence(self):
+        handler = CacheFileHandler(encoder_cls=json.JSONEncoder, codec="msgspec")
+        self.assertIsInstance(handler.codec, JSONCodec)
+        self.assertIs(handler.codec.encoder_cls, json.JSONEncoder)
+
+    @unittest.skipIf(fakeredis is None, "fakeredis is not installed")
+    def test_redis_handler(self):
+        handler = RedisCacheHandler(fakeredis.FakeRedis(), codec=get_codec())
+
+        handler.save_token_to_cache({"access_token": "ACCESS"})
+
+        self.assertEqual(handler.get_cached_token(), {"access_token": "ACCESS"})
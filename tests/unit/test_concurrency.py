@@ -0,0 +1,647 @@
+import asyncio
+import json
+import threading
+import unittest
+import urllib.parse as urllibparse
+
+from spotipy import AsyncSpotify, Spotify, SpotifyException
+from spotipy.concurrency import (AdaptiveConcurrency, AsyncAdaptiveConcurrency,
+                                 AsyncBatcher, AsyncSingleFlight, Batcher,
+                                 SingleFlight)
+from spotipy.transport import AsyncTransport, Response, Transport
+from tests.unit.helpers import (AsyncAdapter, EntityTransport,
+                                FailingTransport, FakeClock)
+
+
+class SingleFlightTest(unittest.TestCase):
+
+    def run_concurrently(self, flight, key, fn, n=5):
+        """ Calls `flight.do(key, fn)` from `n` threads while `fn` blocks """
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(self.outcome(flight, key, fn)))
+            for _ in range(n)
+        ]
+        for thread in threads:
+            thread.start()
+        return threads, results
+
+    @staticmethod
+    def outcome(flight, key, fn):
+        try:
+            return flight.do(key, fn)
+        except Exception as e:
+            return e
+
+    def test_shares_result(self):
+        flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def fn():
+            calls.append(1)
+            release.wait(5)
+            return "result"
+
+        threads, results = self.run_concurrently(flight, "key", fn)
+        while len(calls) < 1:
+            pass
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ["result"] * 5)
+        self.assertEqual(len(flight), 0)
+
+    def test_shares_exception(self):
+        flight = SingleFlight()
+        release = threading.Event()
+        error = ValueError("boom")
+
+        def fn():
+            release.wait(5)
+            raise error
+
+        threads, results = self.run_concurrently(flight, "key", fn)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertTrue(all(result is error for result in results))
+
+    def test_later_calls_are_not_shared(self):
+        flight = SingleFlight()
+        self.assertEqual(flight.do("key", lambda: 1), 1)
+        self.assertEqual(flight.do("key", lambda: 2), 2)
+
+    def test_distinct_keys(self):
+        flight = SingleFlight()
+        self.assertEqual(flight.do("a", lambda: flight.do("b", lambda: "b")), "b")
+
+
+class AsyncSingleFlightTest(unittest.TestCase):
+
+    def test_shares_result(self):
+        calls = []
+
+        async def fn():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "result"
+
+        async def main():
+            flight = AsyncSingleFlight()
+            results = await asyncio.gather(*(flight.do("key", fn) for _ in range(5)))
+            return results, len(flight)
+
+        self.assertEqual(asyncio.run(main()), (["result"] * 5, 0))
+        self.assertEqual(len(calls), 1)
+
+    def test_shares_exception(self):
+        async def fn():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        async def main():
+            flight = AsyncSingleFlight()
+            return await asyncio.gather(
+                *(flight.do("key", fn) for _ in range(3)), return_exceptions=True
+            )
+
+        results = asyncio.run(main())
+        self.assertTrue(all(isinstance(result, ValueError) for result in results))
+
+    def test_cancelled_caller_does_not_cancel_call(self):
+        async def fn():
+            await asyncio.sleep(0.01)
+            return "result"
+
+        async def main():
+            flight = AsyncSingleFlight()
+            first = asyncio.ensure_future(flight.do("key", fn))
+            second = asyncio.ensure_future(flight.do("key", fn))
+            await asyncio.sleep(0)
+            first.cancel()
+            return await second
+
+        self.assertEqual(asyncio.run(main()), "result")
+
+
+class BlockingTransport(Transport):
+    """ Holds requests until released, counting those that reach it """
+
+    def __init__(self, status=200):
+        self.status = status
+        self.release = threading.Event()
+        self.requests = []
+
+    def request(self, method, url, params=None, headers=None, **kwargs):
+        self.requests.append((method, url, headers))
+        self.release.wait(5)
+        return Response(self.status, {}, b'{"id": "abc"}', url)
+
+
+class ClientSingleFlightTest(unittest.TestCase):
+
+    def call_concurrently(self, sp, call, n=4):
+        results = []
+
+        def target():
+            try:
+                results.append(call(sp))
+            except SpotifyException as e:
+                results.append(e)
+
+        threads = [threading.Thread(target=target) for _ in range(n)]
+        for thread in threads:
+            thread.start()
+        while not sp._transport.requests or len(sp.single_flight) == 0:
+            pass
+        # give the other threads time to join the call in flight
+        threading.Event().wait(0.05)
+        sp._transport.release.set()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_coalesces_identical_gets(self):
+        sp = Spotify(auth="TOKEN", transport=BlockingTransport(), single_flight=True)
+
+        results = self.call_concurrently(sp, lambda sp: sp.track("abc"))
+
+        self.assertEqual(len(sp._transport.requests), 1)
+        self.assertEqual(results, [{"id": "abc"}] * 4)
+        # every caller gets a result of its own
+        self.assertEqual(len({id(result) for result in results}), 4)
+
+    def test_shares_errors(self):
+        sp = Spotify(auth="TOKEN", transport=BlockingTransport(404),
+                     single_flight=True, status_retries=0)
+
+        results = self.call_concurrently(sp, lambda sp: sp.track("abc"))
+
+        self.assertEqual(len(sp._transport.requests), 1)
+        self.assertTrue(all(isinstance(r, SpotifyException) for r in results))
+        self.assertTrue(all(r.http_status == 404 for r in results))
+
+    def test_does_not_coalesce_writes(self):
+        transport = BlockingTransport()
+        transport.release.set()
+        sp = Spotify(auth="TOKEN", transport=transport, single_flight=True)
+
+        sp.playlist_add_items("pl", ["spotify:track:abc"])
+        sp.playlist_add_items("pl", ["spotify:track:abc"])
+
+        self.assertEqual(len(transport.requests), 2)
+
+    def test_keys_include_access_token(self):
+        sp = Spotify(auth="TOKEN", single_flight=True)
+        url = "https://api.spotify.com/v1/me"
+        key = sp._flight_key("GET", url, {}, {"Authorization": "Bearer A"})
+        self.assertNotEqual(key, sp._flight_key("GET", url, {}, {"Authorization": "Bearer B"}))
+        self.assertIsNone(sp._flight_key("PUT", url, {}, {"Authorization": "Bearer A"}))
+
+    def test_disabled_by_default(self):
+        self.assertIsNone(Spotify(auth="TOKEN").single_flight)
+
+
+class AsyncCountingTransport(AsyncTransport):
+
+    def __init__(self):
+        self.requests = []
+
+    async def request(self, method, url, params=None, headers=None, **kwargs):
+        self.requests.append((method, url))
+        await asyncio.sleep(0.01)
+        return Response(200, {}, b'{"id": "abc"}', url)
+
+
+class AsyncClientSingleFlightTest(unittest.TestCase):
+
+    def test_coalesces_identical_gets(self):
+        transport = AsyncCountingTransport()
+
+        async def main():
+            sp = AsyncSpotify(auth="TOKEN", transport=transport, single_flight=True)
+            self.assertIsInstance(sp.single_flight, AsyncSingleFlight)
+            return await asyncio.gather(
+                sp.track("abc"), sp.track("abc"), sp.track("abc"), sp.album("abc")
+            )
+
+        results = asyncio.run(main())
+
+        self.assertEqual(results, [{"id": "abc"}] * 4)
+        self.assertEqual(len(transport.requests), 2)
+
+
+def run_threads(targets):
+    results = {}
+
+    def run(name, target):
+        try:
+            results[name] = target()
+        except Exception as e:
+            results[name] = e
+
+    threads = [threading.Thread(target=run, args=item) for item in targets.items()]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+class BatcherTest(unittest.TestCase):
+
+    def test_batches_loads_within_window(self):
+        batcher = Batcher(window=0.1)
+        batches = []
+
+        def load_many(items):
+            batches.append(items)
+            return [item.upper() for item in items]
+
+        results = run_threads({
+            item: lambda item=item: batcher.load("group", item, load_many, 10)
+            for item in ("a", "b", "c", "a")
+        })
+
+        self.assertEqual(results, {"a": "A", "b": "B", "c": "C"})
+        self.assertEqual(len(batches), 1)
+        self.assertEqual(sorted(batches[0]), ["a", "b", "c"])
+
+    def test_full_batch_is_loaded_at_once(self):
+        batcher = Batcher(window=10)
+        batches = []
+
+        def load_many(items):
+            batches.append(items)
+            return items
+
+        results = run_threads({
+            item: lambda item=item: batcher.load("group", item, load_many, 2)
+            for item in ("a", "b")
+        })
+
+        self.assertEqual(results, {"a": "a", "b": "b"})
+        self.assertEqual(len(batches), 1)
+
+    def test_groups_are_batched_separately(self):
+        batcher = Batcher(window=0.05)
+        results = run_threads({
+            group: lambda group=group: batcher.load(group, "a", lambda items: [group], 10)
+            for group in ("x", "y")
+        })
+        self.assertEqual(results, {"x": "x", "y": "y"})
+
+    def test_errors(self):
+        batcher = Batcher(window=0)
+        error = ValueError("no b")
+
+        with self.assertRaises(ValueError) as cm:
+            batcher.load("group", "b", lambda items: [error], 10)
+        self.assertIs(cm.exception, error)
+
+        def fail(items):
+            raise KeyError("down")
+
+        with self.assertRaises(KeyError):
+            batcher.load("group", "a", fail, 10)
+
+
+class AsyncBatcherTest(unittest.TestCase):
+
+    def test_batches_loads_of_one_gather(self):
+        batches = []
+
+        async def load_many(items):
+            batches.append(items)
+            return [item.upper() for item in items]
+
+        async def main():
+            batcher = AsyncBatcher()
+            return await asyncio.gather(
+                *(batcher.load("group", item, load_many, 2) for item in "abac")
+            )
+
+        self.assertEqual(asyncio.run(main()), ["A", "B", "A", "C"])
+        self.assertEqual(batches, [["a", "b"], ["a", "c"]])
+
+    def test_errors(self):
+        async def load_many(items):
+            if "fail" in items:
+                raise KeyError("down")
+            return [ValueError(item) if item == "bad" else item for item in items]
+
+        async def main():
+            batcher = AsyncBatcher()
+            return await asyncio.gather(
+                batcher.load("group", "good", load_many, 10),
+                batcher.load("group", "bad", load_many, 10),
+                batcher.load("other", "fail", load_many, 10),
+                return_exceptions=True,
+            )
+
+        good, bad, fail = asyncio.run(main())
+        self.assertEqual(good, "good")
+        self.assertIsInstance(bad, ValueError)
+        self.assertIsInstance(fail, KeyError)
+
+
+class ClientBatchingTest(unittest.TestCase):
+
+    def setUp(self):
+        self.transport = EntityTransport()
+        self.sp = Spotify(auth="TOKEN", transport=self.transport,
+                          batch_window=0.1, status_retries=0)
+
+    def test_batches_lookups_from_threads(self):
+        results = run_threads({
+            "a": lambda: self.sp.track("a", market="DE"),
+            "b": lambda: self.sp.track("spotify:track:b", market="DE"),
+            "c": lambda: self.sp.track("c"),
+            "d": lambda: self.sp.album("d"),
+        })
+
+        self.assertEqual(results, {k: {"id": k} for k in "abcd"})
+        urls = sorted(url for url, params in self.transport.requests)
+        self.assertEqual(len(urls), 3)
+        self.assertTrue(urls[0].endswith("/albums/?ids=d"))
+        self.assertIn(urls[1:], [
+            [self.sp.prefix + "tracks/?ids=a,b", self.sp.prefix + "tracks/?ids=c"],
+            [self.sp.prefix + "tracks/?ids=b,a", self.sp.prefix + "tracks/?ids=c"],
+        ])
+
+    def test_missing_entity_raises(self):
+        results = run_threads({
+            "a": lambda: self.sp.artist("a"),
+            "missing": lambda: self.sp.artist("missing"),
+        })
+
+        self.assertEqual(results["a"], {"id": "a"})
+        self.assertEqual(results["missing"].http_status, 404)
+        self.assertEqual(len(self.transport.requests), 1)
+
+    def test_invalid_id_does_not_fail_batch(self):
+        results = run_threads({
+            "a": lambda: self.sp.episode("a"),
+            "invalid": lambda: self.sp.episode("invalid"),
+        })
+
+        self.assertEqual(results["a"], {"id": "a"})
+        self.assertEqual(results["invalid"].http_status, 400)
+        # the batch and the two entities on their own
+        self.assertEqual(len(self.transport.requests), 3)
+
+    def test_disabled_by_default(self):
+        sp = Spotify(auth="TOKEN", transport=self.transport)
+        self.assertEqual(sp.album("a", market="DE"), {"id": "a"})
+        self.assertEqual(self.transport.requests,
+                         [(sp.prefix + "albums/a", {"market": "DE"})])
+
+
+class AsyncClientBatchingTest(unittest.TestCase):
+
+    def test_batches_lookups_of_one_gather(self):
+        transport = AsyncAdapter(EntityTransport())
+        ids = [str(i) for i in range(60)]
+
+        async def main():
+            sp = AsyncSpotify(auth="TOKEN", transport=transport, batch_window=0)
+            return await asyncio.gather(*(sp.track(i) for i in ids))
+
+        self.assertEqual(asyncio.run(main()), [{"id": i} for i in ids])
+        urls = [url for url, params in transport.transport.requests]
+        self.assertEqual(len(urls), 2)
+        self.assertTrue(urls[0].endswith("?ids=" + ",".join(ids[:50])))
+
+    def test_invalid_id_does_not_fail_batch(self):
+        transport = AsyncAdapter(EntityTransport())
+
+        async def main():
+            sp = AsyncSpotify(auth="TOKEN", transport=transport, batch_window=0,
+                              status_retries=0)
+            return await asyncio.gather(
+                sp.artist("a"), sp.artist("invalid"), return_exceptions=True
+            )
+
+        a, invalid = asyncio.run(main())
+        self.assertEqual(a, {"id": "a"})
+        self.assertEqual(invalid.http_status, 400)
+
+
+class ChunkTransport(Transport):
+    """ Answers requests for several entities, and `contains` requests with
+        True for the IDs starting with "saved", from several threads
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = []
+        self.in_flight = 0
+        self.most_in_flight = 0
+
+    def request(self, method, url, params=None, **kwargs):
+        parsed = urllibparse.urlsplit(url)
+        query = dict(urllibparse.parse_qsl(parsed.query))
+        query.update(params or {})
+        ids = query["ids"].split(",")
+        with self.lock:
+            self.requests.append(ids)
+            self.in_flight += 1
+            self.most_in_flight = max(self.most_in_flight, self.in_flight)
+        threading.Event().wait(0.01)
+        with self.lock:
+            self.in_flight -= 1
+        if "contains" in parsed.path:
+            body = [i.startswith("saved") for i in ids]
+        else:
+            kind = parsed.path.split("/")[2]
+            body = {kind: [{"id": i, "market": query.get("market")} for i in ids]}
+        return Response(200, {}, json.dumps(body).encode(), url)
+
+
+class ClientChunkingTest(unittest.TestCase):
+
+    def setUp(self):
+        self.transport = ChunkTransport()
+        self.sp = Spotify(auth="TOKEN", transport=self.transport)
+
+    def test_splits_by_endpoint_limit(self):
+        ids = [f"id{i}" for i in range(45)]
+
+        result = self.sp.albums(ids, market="DE")
+
+        self.assertEqual(result, {"albums": [{"id": i, "market": "DE"} for i in ids]})
+        self.assertEqual(sorted(len(chunk) for chunk in self.transport.requests), [5, 20, 20])
+
+    def test_dedupes_and_keeps_input_order(self):
+        ids = [f"id{i}" for i in range(60)]
+        tracks = list(reversed(ids)) + ids[:10]
+
+        result = self.sp.tracks(tracks)
+
+        self.assertEqual([track["id"] for track in result["tracks"]], tracks)
+        self.assertEqual(sum(len(chunk) for chunk in self.transport.requests), 60)
+
+    def test_bounded_parallelism(self):
+        self.sp.max_concurrent_chunks = 2
+        self.sp.artists(f"id{i}" for i in range(300))
+
+        self.assertEqual(len(self.transport.requests), 6)
+        self.assertEqual(self.transport.most_in_flight, 2)
+
+    def test_contains(self):
+        ids = [f"saved{i}" if i % 3 else f"id{i}" for i in range(70)]
+        expected = [i.startswith("saved") for i in ids]
+
+        self.assertEqual(self.sp.current_user_saved_tracks_contains(ids), expected)
+        self.assertEqual(self.sp.current_user_following_artists(ids), expected)
+        self.assertEqual(self.sp.current_user_saved_albums_contains(ids[:25]), expected[:25])
+        self.assertEqual(
+            sorted(len(chunk) for chunk in self.transport.requests), [5, 20, 20, 20, 50, 50]
+        )
+
+    def test_single_chunk_is_returned_as_is(self):
+        result = self.sp.get_audiobooks(["a", "b"], market="US")
+
+        self.assertEqual(result, {"audiobooks": [{"id": "a", "market": "US"},
+                                                 {"id": "b", "market": "US"}]})
+        self.assertEqual(self.transport.requests, [["a", "b"]])
+
+
+class AsyncClientChunkingTest(unittest.TestCase):
+
+    def test_splits_and_merges(self):
+        transport = AsyncAdapter(ChunkTransport())
+        ids = [f"id{i}" for i in range(120)]
+
+        async def main():
+            sp = AsyncSpotify(auth="TOKEN", transport=transport)
+            return await sp.episodes(ids + ids[:5])
+
+        result = asyncio.run(main())
+
+        self.assertEqual([e["id"] for e in result["episodes"]], ids + ids[:5])
+        self.assertEqual([len(chunk) for chunk in transport.transport.requests], [50, 50, 20])
+
+
+class AdaptiveConcurrencyTest(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def test_additive_increase(self):
+        concurrency = AdaptiveConcurrency(initial=2, maximum=3, clock=self.clock)
+        limits = []
+        for _ in range(5):
+            concurrency.record(200, 0.1)
+            limits.append(concurrency.limit)
+        self.assertEqual(limits, [2, 2, 3, 3, 3])
+
+    def test_multiplicative_decrease(self):
+        concurrency = AdaptiveConcurrency(initial=8, maximum=8, clock=self.clock)
+        concurrency.record(429, 0.1)
+        self.assertEqual(concurrency.limit, 4)
+        # sent before the decrease
+        concurrency.record(503, 0.1)
+        self.assertEqual(concurrency.limit, 4)
+        self.clock.now += 1
+        concurrency.record(None, 0.5)
+        self.assertEqual(concurrency.limit, 2)
+        for _ in range(3):
+            self.clock.now += 1
+            concurrency.record(500, 0.1)
+        self.assertEqual(concurrency.limit, 1)
+
+    def test_slow_response_decreases(self):
+        concurrency = AdaptiveConcurrency(initial=4, latency_tolerance=2, clock=self.clock)
+        concurrency.record(200, 0.1)
+        concurrency.record(200, 0.15)
+        self.assertEqual(concurrency.limit, 4)
+        self.clock.now += 1
+        concurrency.record(200, 0.5)
+        self.assertEqual(concurrency.limit, 2)
+
+    def test_limits_requests_in_flight(self):
+        concurrency = AdaptiveConcurrency(initial=1)
+        concurrency.acquire()
+        acquired = threading.Event()
+
+        def acquire():
+            with concurrency:
+                acquired.set()
+
+        thread = threading.Thread(target=acquire)
+        thread.start()
+        self.assertFalse(acquired.wait(0.05))
+        concurrency.release()
+        self.assertTrue(acquired.wait(1))
+        thread.join()
+        self.assertEqual(concurrency.in_flight, 0)
+
+    def test_async(self):
+        concurrency = AsyncAdaptiveConcurrency(initial=1, maximum=2)
+        most_in_flight = 0
+
+        async def request():
+            nonlocal most_in_flight
+            async with concurrency:
+                most_in_flight = max(most_in_flight, concurrency.in_flight)
+                await asyncio.sleep(0.001)
+            concurrency.record(200, 0.001)
+
+        async def main():
+            await asyncio.gather(*(request() for _ in range(10)))
+
+        asyncio.run(main())
+        self.assertEqual(most_in_flight, 2)
+        self.assertEqual(concurrency.limit, 2)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            AdaptiveConcurrency(initial=8, maximum=4)
+
+
+class ClientAdaptiveConcurrencyTest(unittest.TestCase):
+
+    def test_limits_chunks_in_flight(self):
+        transport = ChunkTransport()
+        concurrency = AdaptiveConcurrency(initial=2, maximum=2)
+        sp = Spotify(auth="TOKEN", transport=transport, adaptive_concurrency=concurrency)
+
+        sp.artists(f"id{i}" for i in range(300))
+
+        self.assertEqual(len(transport.requests), 6)
+        self.assertEqual(transport.most_in_flight, 2)
+        self.assertEqual(concurrency.in_flight, 0)
+
+    def test_server_errors_cut_the_limit(self):
+        sp = Spotify(
+            auth="TOKEN", transport=FailingTransport(), retries=0, status_retries=0,
+            adaptive_concurrency=True,
+        )
+
+        with self.assertRaises(SpotifyException):
+            sp.track("abc")
+
+        self.assertEqual(sp.concurrency.limit, 2)
+
+    def test_disabled_by_default(self):
+        self.assertIsNone(Spotify(auth="TOKEN").concurrency)
+
+    def test_async(self):
+        transport = AsyncAdapter(ChunkTransport())
+        ids = [f"id{i}" for i in range(150)]
+
+        async def main():
+            sp = AsyncSpotify(auth="TOKEN", transport=transport, adaptive_concurrency=True)
+            await sp.episodes(ids)
+            return sp.concurrency
+
+        concurrency = asyncio.run(main())
+
+        self.assertIsInstance(concurrency, AsyncAdaptiveConcurrency)
+        self.assertEqual(concurrency.limit, 4)
+        self.assertEqual(concurrency.in_flight, 0)
@@ -0,0 +1,190 @@
+import asyncio
+import threading
+import unittest
+
+from spotipy import AsyncSpotify, Spotify
+from spotipy.concurrency import AdaptiveConcurrency
+from spotipy.hedging import HedgePolicy
+from spotipy.scheduling import AsyncPriorityScheduler, PriorityScheduler
+from spotipy.transport import AsyncTransport, Response, Transport
+
+
+def warmed_up(latency=0.01, endpoint="tracks/{id}", **kwargs):
+    hedging = HedgePolicy(min_samples=5, **kwargs)
+    for _ in range(5):
+        hedging.record(endpoint, latency)
+    return hedging
+
+
+class CountingLimiter:
+
+    def __init__(self):
+        self.reserved = 0
+
+    def reserve(self):
+        self.reserved += 1
+        return 0
+
+    def pause(self, seconds):
+        pass
+
+
+class StallingTransport(Transport):
+    """ Stalls the first request until released, and answers the others """
+
+    def __init__(self):
+        self.released = threading.Event()
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def request(self, method, url, **kwargs):
+        with self._lock:
+            self.requests += 1
+            first = self.requests == 1
+        if first:
+            self.released.wait(5)
+        return Response(200, {}, b'{"first": %s}' % (b"true" if first else b"false"), url)
+
+
+class HedgePolicyTest(unittest.TestCase):
+
+    def test_delay_for(self):
+        hedging = HedgePolicy(percentile=0.5, minimum=0.05, min_samples=3)
+        for latency in [0.1, 0.2]:
+            hedging.record("tracks/{id}", latency)
+        self.assertIsNone(hedging.delay_for("GET", "tracks/{id}"))
+        hedging.record("tracks/{id}", 0.3)
+        self.assertEqual(hedging.delay_for("GET", "tracks/{id}"), 0.2)
+        self.assertIsNone(hedging.delay_for("PUT", "tracks/{id}"))
+        for _ in range(3):
+            hedging.record("albums/{id}", 0.01)
+        self.assertEqual(hedging.delay_for("GET", "albums/{id}"), 0.05)
+
+    def test_endpoints(self):
+        hedging = warmed_up(endpoints={"albums/{id}"})
+        self.assertIsNone(hedging.delay_for("GET", "tracks/{id}"))
+
+
+class ClientHedgingTest(unittest.TestCase):
+
+    def setUp(self):
+        self.transport = StallingTransport()
+        self.limiter = CountingLimiter()
+
+    def tearDown(self):
+        self.transport.released.set()
+
+    def test_hedge_answers_first(self):
+        hedging = warmed_up()
+        sp = Spotify(auth="TOKEN", transport=self.transport, hedging=hedging,
+                     rate_limiter=self.limiter)
+
+        self.assertEqual(sp.track("abc"), {"first": False})
+        self.assertEqual(self.transport.requests, 2)
+        self.assertEqual(self.limiter.reserved, 2)
+        self.assertEqual(hedging.stats(), {"hedged": 1, "won": 1})
+
+    def test_hedges_take_their_own_slots(self):
+        hedging = warmed_up()
+        scheduler = PriorityScheduler(max_in_flight=1)
+        concurrency = AdaptiveConcurrency(initial=1, maximum=1)
+        for limits in [{"scheduler": scheduler}, {"adaptive_concurrency": concurrency}]:
+            transport = StallingTransport()
+            threading.Timer(0.1, transport.released.set).start()
+            sp = Spotify(auth="TOKEN", transport=transport, hedging=hedging, **limits)
+
+            self.assertEqual(sp.track("abc"), {"first": True})
+            self.assertEqual(transport.requests, 1)
+
+        self.assertEqual(hedging.stats()["hedged"], 0)
+
+    def test_unsent_hedge_takes_no_rate_limit_place(self):
+        hedging = warmed_up()
+        threading.Timer(0.1, self.transport.released.set).start()
+        sp = Spotify(auth="TOKEN", transport=self.transport, hedging=hedging,
+                     rate_limiter=self.limiter,
+                     scheduler=PriorityScheduler(max_in_flight=1))
+
+        self.assertEqual(sp.track("abc"), {"first": True})
+        # the hedge waited for the scheduler until the request was answered
+        threading.Event().wait(0.05)
+        self.assertEqual(self.transport.requests, 1)
+        self.assertEqual(self.limiter.reserved, 1)
+
+    def test_fast_response_is_not_hedged(self):
+        self.transport.released.set()
+        hedging = warmed_up(latency=1)
+        sp = Spotify(auth="TOKEN", transport=self.transport, hedging=hedging)
+
+        self.assertEqual(sp.track("abc"), {"first": True})
+        self.assertEqual(self.transport.requests, 1)
+        self.assertEqual(hedging.stats()["hedged"], 0)
+        self.assertEqual(hedging.tracker.count("tracks/{id}"), 6)
+
+    def test_writes_are_not_hedged(self):
+        threading.Timer(0.1, self.transport.released.set).start()
+        sp = Spotify(auth="TOKEN", transport=self.transport,
+                     hedging=warmed_up(endpoint="playlists/{id}"))
+
+        sp.playlist_change_details("abc", name="name")
+        self.assertEqual(self.transport.requests, 1)
+
+    def test_not_before_warm_up(self):
+        threading.Timer(0.1, self.transport.released.set).start()
+        sp = Spotify(auth="TOKEN", transport=self.transport, hedging=True)
+
+        self.assertEqual(sp.track("abc"), {"first": True})
+        self.assertEqual(self.transport.requests, 1)
+
+
+class AsyncStallingTransport(AsyncTransport):
+
+    def __init__(self, stall=5):
+        self.stall = stall
+        self.requests = 0
+        self.cancelled = False
+
+    async def request(self, method, url, **kwargs):
+        self.requests += 1
+        if self.requests == 1:
+            try:
+                await asyncio.sleep(self.stall)
+            except asyncio.CancelledError:
+                self.cancelled = True
+                raise
+        return Response(200, {}, b'{"id": "abc"}', url)
+
+
+class AsyncClientHedgingTest(unittest.TestCase):
+
+    def test_loser_is_cancelled(self):
+        transport = AsyncStallingTransport()
+        hedging = warmed_up()
+        limiter = CountingLimiter()
+
+        async def main():
+            sp = AsyncSpotify(auth="TOKEN", transport=transport, hedging=hedging,
+                              rate_limiter=limiter)
+            track = await sp.track("abc")
+            await asyncio.sleep(0)
+            return track
+
+        self.assertEqual(asyncio.run(main()), {"id": "abc"})
+        self.assertTrue(transport.cancelled)
+        self.assertEqual(limiter.reserved, 2)
+        self.assertEqual(hedging.stats(), {"hedged": 1, "won": 1})
+
+    def test_hedges_take_their_own_slots(self):
+        transport = AsyncStallingTransport(stall=0.1)
+        hedging = warmed_up()
+        scheduler = AsyncPriorityScheduler(max_in_flight=1)
+
+        async def main():
+            sp = AsyncSpotify(auth="TOKEN", transport=transport, hedging=hedging,
+                              scheduler=scheduler)
+            return await sp.track("abc")
+
+        self.assertEqual(asyncio.run(main()), {"id": "abc"})
+        self.assertEqual(transport.requests, 1)
+        self.assertEqual(hedging.stats()["hedged"], 0)
+        self.assertEqual(scheduler.in_flight, 0)
@@ -0,0 +1,336 @@
+import asyncio
+import json
+import threading
+import unittest
+import urllib.parse as urllibparse
+
+from spotipy import AsyncSpotify, Spotify
+from spotipy.transport import AsyncTransport, Response, Transport
+from tests.unit.helpers import AsyncAdapter
+
+
+class PagingTransport(Transport):
+    """ Serves `total` made up items at every URL, paged with limit and
+        offset. Searches put the page under the searched type, like the API.
+    """
+
+    def __init__(self, total):
+        self.total = total
+        self.lock = threading.Lock()
+        self.requests = []
+
+    def request(self, method, url, params=None, **kwargs):
+        parsed = urllibparse.urlsplit(url)
+        query = dict(urllibparse.parse_qsl(parsed.query))
+        query.update({k: str(v) for k, v in (params or {}).items() if v is not None})
+        limit, offset = int(query.get("limit", 20)), int(query.get("offset", 0))
+        with self.lock:
+            self.requests.append((parsed.path, limit, offset))
+
+        def link(at):
+            if at < 0 or at >= self.total:
+                return None
+            return urllibparse.urlunsplit(parsed._replace(query=urllibparse.urlencode(
+                dict(query, offset=at, limit=limit)
+            )))
+
+        page = {
+            "href": url,
+            "items": [{"n": n} for n in range(offset, min(offset + limit, self.total))],
+            "limit": limit,
+            "offset": offset,
+            "total": self.total,
+            "next": link(offset + limit),
+            "previous": link(offset - limit) if offset else None,
+        }
+        if parsed.path.endswith("/search"):
+            page = {query["type"] + "s": page}
+        return Response(200, {}, json.dumps(page).encode(), url)
+
+
+class IterPagesTest(unittest.TestCase):
+
+    def test_iter_items_defaults_to_largest_limit(self):
+        transport = PagingTransport(250)
+        sp = Spotify(auth="TOKEN", transport=transport)
+
+        items = list(sp.iter_items(sp.playlist_items, "pl"))
+
+        self.assertEqual(items, [{"n": n} for n in range(250)])
+        self.assertEqual([(limit, offset) for _, limit, offset in transport.requests],
+                         [(100, 0), (100, 100), (100, 200)])
+
+    def test_explicit_limit_and_method_name(self):
+        transport = PagingTransport(30)
+        sp = Spotify(auth="TOKEN", transport=transport)
+
+        pages = list(sp.iter_pages("current_user_saved_tracks", limit=20))
+
+        self.assertEqual([len(page["items"]) for page in pages], [20, 10])
+
+    def test_nested_paging_objects(self):
+        transport = PagingTransport(120)
+        sp = Spotify(auth="TOKEN", transport=transport)
+
+        items = list(sp.iter_items(sp.search, "abba", type="track"))
+
+        self.assertEqual(len(items), 120)
+        self.assertEqual(len(transport.requests), 3)
+
+    def test_prefetches_next_page(self):
+        transport = PagingTransport(100)
+        sp = Spotify(auth="TOKEN", transport=transport)
+        pages = sp.iter_pages(sp.album_tracks, "album")
+
+        next(pages)
+        for _ in range(100):
+            if len(transport.requests) == 2:
+                break
+            threading.Event().wait(0.01)
+
+        self.assertEqual(len(transport.requests), 2)
+        self.assertEqual(next(pages)["offset"], 50)
+        self.assertEqual(len(list(pages)), 0)
+
+    def test_without_prefetch(self):
+        transport = PagingTransport(100)
+        sp = Spotify(auth="TOKEN", transport=transport)
+        pages = sp.iter_pages(sp.album_tracks, "album", prefetch=False)
+
+        next(pages)
+        threading.Event().wait(0.05)
+
+        self.assertEqual(len(transport.requests), 1)
+        self.assertEqual(len(list(pages)), 1)
+
+
+class FetchAllTest(unittest.TestCase):
+
+    def test_fetches_remaining_offsets(self):
+        transport = PagingTransport(1050)
+        sp = Spotify(auth="TOKEN", transport=transport)
+
+        items = sp.fetch_all(sp.playlist_items, "pl", max_workers=5)
+
+        self.assertEqual(items, [{"n": n} for n in range(1050)])
+        self.assertEqual(sorted(offset for _, _, offset in transport.requests),
+                         list(range(0, 1100, 100)))
+
+    def test_starts_at_offset(self):
+        transport = PagingTransport(230)
+        sp = Spotify(auth="TOKEN", transport=transport)
+
+        items = sp.fetch_all("artist_albums", "artist", offset=100)
+
+        self.assertEqual(items, [{"n": n} for n in range(100, 230)])
+
+    def test_search_is_capped(self):
+        transport = PagingTransport(5000)
+        sp = Spotify(auth="TOKEN", transport=transport)
+
+        items = sp.fetch_all(sp.search, "abba", type="album")
+
+        self.assertEqual(len(items), 1000)
+        self.assertTrue(all(path.endswith("/search") for path, _, _ in transport.requests))
+
+    def test_single_page(self):
+        transport = PagingTransport(3)
+        sp = Spotify(auth="TOKEN", transport=transport)
+
+        self.assertEqual(len(sp.fetch_all(sp.current_user_saved_shows)), 3)
+        self.assertEqual(len(transport.requests), 1)
+
+    def test_cursor_paged_methods_are_rejected(self):
+        sp = Spotify(auth="TOKEN", transport=PagingTransport(3))
+        with self.assertRaises(ValueError):
+            sp.fetch_all(sp.current_user_followed_artists)
+
+
+class AsyncIterPagesTest(unittest.TestCase):
+
+    def test_iter_items(self):
+        transport = AsyncAdapter(PagingTransport(120))
+
+        async def main():
+            sp = AsyncSpotify(auth="TOKEN", transport=transport)
+            return [item async for item in sp.iter_items(sp.show_episodes, "show")]
+
+        self.assertEqual(asyncio.run(main()), [{"n": n} for n in range(120)])
+        self.assertEqual([offset for _, _, offset in transport.requests], [0, 50, 100])
+
+    def test_closing_early_cancels_prefetch(self):
+        transport = AsyncAdapter(PagingTransport(500))
+
+        async def main():
+            sp = AsyncSpotify(auth="TOKEN", transport=transport)
+            pages = sp.iter_pages(sp.show_episodes, "show")
+            page = await pages.__anext__()
+            await pages.aclose()
+            return page
+
+        self.assertEqual(asyncio.run(main())["offset"], 0)
+        self.assertLessEqual(len(transport.requests), 2)
+
+    def test_fetch_all(self):
+        transport = AsyncAdapter(PagingTransport(420))
+
+        async def main():
+            sp = AsyncSpotify(auth="TOKEN", transport=transport)
+            return await sp.fetch_all(sp.playlist_items, "pl")
+
+        self.assertEqual(asyncio.run(main()), [{"n": n} for n in range(420)])
+        self.assertEqual(len(transport.requests), 5)
+
+
+class CursorTransport(Transport):
+    """ Serves followed artists by `after` artist ID, and recently played
+        tracks by `after` timestamp, newest first
+    """
+
+    def __init__(self, artists=(), plays=()):
+        self.artists = list(artists)
+        self.plays = list(plays)
+        self.requests = []
+
+    def request(self, method, url, params=None, **kwargs):
+        params = {k: v for k, v in (params or {}).items() if v is not None}
+        self.requests.append(params)
+        limit, after = int(params["limit"]), params.get("after")
+        if url.endswith("me/following"):
+            start = self.artists.index(after) + 1 if after else 0
+            items = [{"id": a} for a in self.artists[start:start + limit]]
+            more = start + limit < len(self.artists)
+            body = {"artists": {
+                "items": items,
+                "next": f"{url}?type=artist&after={items[-1]['id']}" if more else None,
+                "cursors": {"after": items[-1]["id"] if more else None},
+            }}
+        else:
+            newer = [p for p in self.plays if after is None or p[0] > int(after)]
+            items = [{"played_at": at, "track": {"id": track}}
+                     for _, at, track in sorted(newer, reverse=True)[:limit]]
+            body = {"items": items, "next": None, "cursors": None}
+        return Response(200, {}, json.dumps(body).encode(), url)
+
+
+PLAYS = [
+    (1481661844589, "2016-12-13T20:44:04.589Z", "first"),
+    (1481661900000, "2016-12-13T20:45:00Z", "second"),
+    (1481662000123, "2016-12-13T20:46:40.123Z", "third"),
+]
+
+
+class CursorStreamTest(unittest.TestCase):
+
+    def test_followed_artists_resume(self):
+        artists = [f"artist{i:03d}" for i in range(120)]
+        transport = CursorTransport(artists=artists)
+        sp = Spotify(auth="TOKEN", transport=transport)
+
+        stream = sp.cursor_stream(sp.current_user_followed_artists)
+        self.assertIsNone(stream.resume_token)
+        first = [artist["id"] for _, artist in zip(range(70), stream)]
+        token = stream.resume_token
+
+        resumed = sp.cursor_stream("current_user_followed_artists", resume_token=token)
+        rest = [artist["id"] for artist in resumed]
+
+        self.assertEqual(first + rest, artists)
+        self.assertEqual([r.get("after") for r in transport.requests],
+                         [None, "artist049", "artist069"])
+
+    def test_recently_played_oldest_first_and_resume(self):
+        transport = CursorTransport(plays=PLAYS[:2])
+        sp = Spotify(auth="TOKEN", transport=transport)
+
+        stream = sp.cursor_stream(sp.current_user_recently_played)
+        self.assertEqual([p["track"]["id"] for p in stream], ["first", "second"])
+        token = stream.resume_token
+
+        transport.plays = PLAYS
+        resumed = sp.cursor_stream(sp.current_user_recently_played, resume_token=token)
+
+        self.assertEqual([p["track"]["id"] for p in resumed], ["third"])
+        self.assertEqual(transport.requests[2]["after"], PLAYS[1][0])
+
+    def test_invalid_tokens(self):
+        sp = Spotify(auth="TOKEN", transport=CursorTransport())
+        stream = sp.cursor_stream(sp.current_user_recently_played)
+        stream._after = 1
+        with self.assertRaises(ValueError):
+            sp.cursor_stream(sp.current_user_followed_artists, resume_token=stream.resume_token)
+        with self.assertRaises(ValueError):
+            sp.cursor_stream(sp.current_user_followed_artists, resume_token="garbage")
+        with self.assertRaises(ValueError):
+            sp.cursor_stream(sp.playlist_items, "pl")
+
+    def test_async(self):
+        transport = CursorTransport(artists=[f"a{i}" for i in range(60)])
+
+        class Async(AsyncTransport):
+            async def request(self, *args, **kwargs):
+                return transport.request(*args, **kwargs)
+
+        async def main():
+            sp = AsyncSpotify(auth="TOKEN", transport=Async())
+            return [a["id"] async for a in sp.cursor_stream(sp.current_user_followed_artists)]
+
+        self.assertEqual(asyncio.run(main()), [f"a{i}" for i in range(60)])
+
+
+class PagedSequenceTest(unittest.TestCase):
+
+    def setUp(self):
+        self.transport = PagingTransport(1234)
+        self.sp = Spotify(auth="TOKEN", transport=self.transport)
+        self.items = self.sp.paged(self.sp.playlist_items, "pl")
+
+    def test_len_is_a_single_small_request(self):
+        self.assertEqual(len(self.items), 1234)
+        self.assertEqual(len(self.items), 1234)
+        self.assertEqual(self.transport.requests, [("/v1/playlists/pl/tracks", 1, 0)])
+
+    def test_index_fetches_one_page(self):
+        self.assertEqual(self.items[250], {"n": 250})
+        self.assertEqual(self.items[299], {"n": 299})
+        self.assertEqual(self.transport.requests, [("/v1/playlists/pl/tracks", 100, 200)])
+
+    def test_negative_index_and_tail_slice(self):
+        self.assertEqual(self.items[-1], {"n": 1233})
+        self.assertEqual(self.items[-40:], [{"n": n} for n in range(1194, 1234)])
+        self.assertEqual([(limit, offset) for _, limit, offset in self.transport.requests],
+                         [(1, 0), (100, 1200), (100, 1100)])
+
+    def test_slice_with_step(self):
+        self.assertEqual(self.items[10:700:300], [{"n": 10}, {"n": 310}, {"n": 610}])
+        self.assertEqual(sorted(offset for _, _, offset in self.transport.requests[1:]),
+                         [0, 300, 600])
+
+    def test_index_errors(self):
+        with self.assertRaises(IndexError):
+            self.items[1234]
+        with self.assertRaises(IndexError):
+            self.items[-1235]
+
+    def test_page_cache_bound(self):
+        items = self.sp.paged(self.sp.playlist_items, "pl", max_pages=2)
+        items[0], items[100], items[200], items[0]
+        self.assertEqual([offset for _, _, offset in self.transport.requests],
+                         [0, 100, 200, 0])
+
+    def test_iteration_and_sequence_methods(self):
+        items = self.sp.paged(self.sp.album_tracks, "album")
+        self.assertEqual(list(items), [{"n": n} for n in range(1234)])
+        self.assertIn({"n": 5}, items)
+        self.assertEqual(len(self.transport.requests), 1 + 25)
+
+    def test_async(self):
+        transport = AsyncAdapter(PagingTransport(500))
+
+        async def main():
+            sp = AsyncSpotify(auth="TOKEN", transport=transport)
+            items = sp.paged(sp.show_episodes, "show")
+            return await items.length(), await items[-3:], await items[7]
+
+        self.assertEqual(asyncio.run(main()),
+                         (500, [{"n": 497}, {"n": 498}, {"n": 499}], {"n": 7}))
@@ -0,0 +1,222 @@
+import asyncio
+import threading
+import unittest
+import unittest.mock as mock
+
+from redis import RedisError
+
+from spotipy import AsyncSpotify, Spotify
+from spotipy.rate_limit import (AsyncRedisRateLimiter, RedisRateLimiter,
+                                TokenBucket)
+from spotipy.transport import AsyncTransport, Response, Transport
+from tests.unit.helpers import FakeClock
+
+try:
+    import fakeredis
+    import lupa  # noqa: F401 (fakeredis runs Lua scripts with it)
+except ImportError:
+    fakeredis = None
+
+
+class TokenBucketTest(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def test_spaces_requests_evenly(self):
+        bucket = TokenBucket(10, per=1, clock=self.clock)
+        delays = [bucket.reserve() for _ in range(4)]
+        for delay, expected in zip(delays, [0, 0.1, 0.2, 0.3]):
+            self.assertAlmostEqual(delay, expected)
+
+    def test_burst(self):
+        bucket = TokenBucket(10, per=1, burst=3, clock=self.clock)
+        delays = [bucket.reserve() for _ in range(5)]
+        for delay, expected in zip(delays, [0, 0, 0, 0.1, 0.2]):
+            self.assertAlmostEqual(delay, expected)
+
+    def test_refills_over_time(self):
+        bucket = TokenBucket(10, per=1, burst=3, clock=self.clock)
+        for _ in range(3):
+            bucket.reserve()
+        self.clock.now += 0.2
+        for expected in [0, 0, 0.1]:
+            self.assertAlmostEqual(bucket.reserve(), expected)
+
+    def test_never_exceeds_rate_in_window(self):
+        bucket = TokenBucket(30, per=30, clock=self.clock)
+        starts = [self.clock.now + bucket.reserve() for _ in range(100)]
+        for i in range(len(starts) - 30):
+            self.assertGreaterEqual(starts[i + 30] - starts[i], 30 - 1e-9)
+
+    def test_cost(self):
+        bucket = TokenBucket(10, per=1, burst=2, clock=self.clock)
+        self.assertEqual(bucket.reserve(cost=2), 0)
+        self.assertAlmostEqual(bucket.reserve(), 0.1)
+        self.assertAlmostEqual(bucket.reserve(cost=3), 0.4)
+
+    def test_pause_holds_back_everyone(self):
+        bucket = TokenBucket(10, per=1, burst=5, clock=self.clock)
+        bucket.pause(3)
+        self.assertEqual(bucket.paused_for, 3)
+        delays = [bucket.reserve() for _ in range(3)]
+        self.assertEqual(delays, [3, 3, 3])
+        self.clock.now += 3
+        self.assertEqual(bucket.paused_for, 0)
+
+    def test_shared_between_threads(self):
+        bucket = TokenBucket(1000, per=1, clock=self.clock)
+        delays = []
+        lock = threading.Lock()
+
+        def reserve():
+            for _ in range(50):
+                delay = bucket.reserve()
+                with lock:
+                    delays.append(delay)
+
+        threads = [threading.Thread(target=reserve) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(round(d * 1000) for d in delays), list(range(200)))
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            TokenBucket(0)
+
+
+class RateLimitedTransport(Transport):
+    """ Answers with 429 and a Retry-After for the first `limited` requests """
+
+    def __init__(self, limited=1):
+        self.limited = limited
+        self.requests = 0
+
+    def request(self, method, url, **kwargs):
+        self.requests += 1
+        if self.requests <= self.limited:
+            return Response(429, {"Retry-After": "2"}, b"", url)
+        return Response(200, {}, b'{"id": "abc"}', url)
+
+
+class ClientRateLimitTest(unittest.TestCase):
+
+    def test_waits_for_limiter(self):
+        clock = FakeClock()
+        limiter = TokenBucket(2, per=1, clock=clock)
+        sp = Spotify(auth="TOKEN", transport=RateLimitedTransport(0), rate_limiter=limiter)
+
+        with mock.patch("spotipy.client.time.sleep") as sleep:
+            sp.track("abc")
+            sp.track("abc")
+
+        sleep.assert_called_once_with(0.5)
+
+    def test_retry_after_pauses_limiter(self):
+        clock = FakeClock()
+        limiter = TokenBucket(100, per=1, clock=clock)
+        sp = Spotify(auth="TOKEN", transport=RateLimitedTransport(1), rate_limiter=limiter)
+
+        with mock.patch("spotipy.client.time.sleep") as sleep:
+            self.assertEqual(sp.track("abc"), {"id": "abc"})
+
+        self.assertEqual(limiter.paused_for, 2)
+        # the retry waits for the Retry-After, and then for the paused limiter
+        self.assertEqual([c.args[0] for c in sleep.call_args_list], [2, 2])
+
+    def test_async(self):
+        clock = FakeClock()
+        limiter = TokenBucket(1, per=1, clock=clock)
+        transport = RateLimitedTransport(0)
+
+        class Async(AsyncTransport):
+            async def request(self, *args, **kwargs):
+                return transport.request(*args, **kwargs)
+
+        async def main():
+            sp = AsyncSpotify(auth="TOKEN", transport=Async(), rate_limiter=limiter)
+            return await asyncio.gather(sp.track("a"), sp.track("b"), sp.track("c"))
+
+        with mock.patch("spotipy.async_client.asyncio.sleep") as sleep:
+            asyncio.run(main())
+
+        self.assertEqual(sorted(c.args[0] for c in sleep.await_args_list), [1, 2])
+
+
+@unittest.skipIf(fakeredis is None, "fakeredis or lupa is not installed")
+class RedisRateLimiterTest(unittest.TestCase):
+    # fakeredis uses the real clock, so delays are only compared roughly
+
+    def setUp(self):
+        self.redis = fakeredis.FakeRedis()
+
+    def test_spaces_requests_evenly(self):
+        limiter = RedisRateLimiter(self.redis, 10, per=1, burst=2)
+        delays = [limiter.reserve() for _ in range(4)]
+        for delay, expected in zip(delays, [0, 0, 0.1, 0.2]):
+            self.assertAlmostEqual(delay, expected, delta=0.05)
+
+    def test_shared_by_limiters_with_the_same_prefix(self):
+        first = RedisRateLimiter(self.redis, 10, per=1)
+        second = RedisRateLimiter(self.redis, 10, per=1)
+        other = RedisRateLimiter(self.redis, 10, per=1, prefix="other:")
+
+        first.reserve()
+        self.assertAlmostEqual(second.reserve(), 0.1, delta=0.05)
+        self.assertEqual(other.reserve(), 0)
+
+    def test_pause_is_broadcast(self):
+        first = RedisRateLimiter(self.redis, 10, per=1)
+        second = RedisRateLimiter(self.redis, 10, per=1)
+        pubsub = self.redis.pubsub()
+        pubsub.subscribe(first.channel)
+        self.assertEqual(pubsub.get_message()["type"], "subscribe")
+
+        first.pause(3)
+        # a shorter pause doesn't cut the current one short
+        second.pause(1)
+
+        self.assertAlmostEqual(second.paused_for, 3, delta=0.05)
+        self.assertAlmostEqual(second.reserve(), 3, delta=0.05)
+        self.assertEqual(pubsub.get_message()["data"], b"3000000")
+        self.assertIsNone(pubsub.get_message())
+
+    def test_lets_requests_through_without_redis(self):
+        redis = mock.Mock()
+        redis.register_script.return_value.side_effect = RedisError("down")
+        limiter = RedisRateLimiter(redis, 10, per=1)
+
+        with self.assertLogs("spotipy.rate_limit", "WARNING"):
+            self.assertEqual(limiter.reserve(), 0)
+            limiter.pause(1)
+
+    def test_client_pauses_everyone_on_retry_after(self):
+        first = RedisRateLimiter(self.redis, 100, per=1)
+        second = RedisRateLimiter(self.redis, 100, per=1)
+        sp = Spotify(auth="TOKEN", transport=RateLimitedTransport(1), rate_limiter=first)
+
+        with mock.patch("spotipy.client.time.sleep"):
+            sp.track("abc")
+
+        self.assertAlmostEqual(second.reserve(), 2, delta=0.05)
+
+    def test_async(self):
+        limiter = AsyncRedisRateLimiter(fakeredis.FakeAsyncRedis(), 100, per=1)
+        transport = RateLimitedTransport(1)
+
+        class Async(AsyncTransport):
+            async def request(self, *args, **kwargs):
+                return transport.request(*args, **kwargs)
+
+        async def main():
+            sp = AsyncSpotify(auth="TOKEN", transport=Async(), rate_limiter=limiter)
+            return await sp.track("abc"), await limiter.paused_for
+
+        with mock.patch("spotipy.async_client.asyncio.sleep"):
+            track, paused_for = asyncio.run(main())
+
+        self.assertEqual(track, {"id": "abc"})
+        self.assertAlmostEqual(paused_for, 2, delta=0.05)
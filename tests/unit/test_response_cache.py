@@ -0,0 +1,522 @@
+import asyncio
+import os
+import sqlite3
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from redis import RedisError
+
+from spotipy import AsyncSpotify, Spotify, SpotifyException
+from spotipy.response_cache import (AsyncRedisResponseCache, CachePolicy,
+                                    ETagCache, MemoryResponseCache,
+                                    RedisResponseCache, SQLiteResponseCache,
+                                    bypass_cache, make_cache_key)
+from spotipy.transport import Response, Transport
+from tests.unit.helpers import AsyncAdapter, EntityTransport
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import fakeredis
+except ImportError:
+    fakeredis = None
+
+
+class ScriptedTransport(Transport):
+    """ Returns the given responses in order and records the requests """
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def request(self, method, url, params=None, headers=None, **kwargs):
+        self.requests.append((method, url, params, headers))
+        status, body, response_headers = self.responses.pop(0)
+        return Response(status, response_headers, body, url)
+
+
+class MakeCacheKeyTest(unittest.TestCase):
+
+    def test_normalizes_params(self):
+        self.assertEqual(
+            make_cache_key("GET", "https://API.spotify.com/v1/albums?offset=20",
+                           {"limit": 20, "market": None}),
+            make_cache_key("GET", "https://api.spotify.com/v1/albums",
+                           {"offset": "20", "limit": "20"}),
+        )
+
+    def test_distinguishes_requests(self):
+        url = "https://api.spotify.com/v1/albums/abc"
+        keys = {
+            make_cache_key("GET", url),
+            make_cache_key("GET", url, {"market": "DE"}),
+            make_cache_key("GET", url, language="de"),
+            make_cache_key("DELETE", url),
+            make_cache_key("GET", url, authorization="Bearer A"),
+            make_cache_key("GET", url, authorization="Bearer B"),
+        }
+        self.assertEqual(len(keys), 6)
+
+
+class ETagCacheTest(unittest.TestCase):
+
+    def test_evicts_least_recently_used(self):
+        cache = ETagCache(maxsize=2)
+        cache.set("a", '"1"', b"{}")
+        cache.set("b", '"2"', b"{}")
+        cache.get("a")
+        cache.set("c", '"3"', b"{}")
+
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(len(cache), 2)
+
+    def test_revalidates_with_if_none_match(self):
+        cache = ETagCache()
+        transport = ScriptedTransport(
+            (200, b'{"id": "pl", "name": "Old"}', {"ETag": '"v1"'}),
+            (304, b"", {"ETag": '"v1"'}),
+            (200, b'{"id": "pl", "name": "New"}', {"ETag": '"v2"'}),
+        )
+        sp = Spotify(auth="TOKEN", transport=transport, etag_cache=cache)
+
+        first = sp.playlist("pl")
+        first["name"] = "changed by the caller"
+        self.assertEqual(sp.playlist("pl"), {"id": "pl", "name": "Old"})
+        self.assertEqual(sp.playlist("pl"), {"id": "pl", "name": "New"})
+
+        sent = [headers.get("If-None-Match") for _, _, _, headers in transport.requests]
+        self.assertEqual(sent, [None, '"v1"', '"v1"'])
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertEqual(cache.get(next(iter(cache._entries)))[0], '"v2"')
+
+    def test_ignores_other_methods_and_responses_without_etag(self):
+        cache = ETagCache()
+        transport = ScriptedTransport(
+            (200, b'{"id": "abc"}', {}),
+            (200, b'{"snapshot_id": "s"}', {"ETag": '"v1"'}),
+        )
+        sp = Spotify(auth="TOKEN", transport=transport, etag_cache=cache)
+
+        sp.track("abc")
+        sp.playlist_add_items("pl", ["spotify:track:abc"])
+
+        self.assertEqual(len(cache), 0)
+
+
+class MemoryResponseCacheTest(unittest.TestCase):
+
+    def test_expires_entries(self):
+        cache = MemoryResponseCache()
+        with mock.patch("spotipy.response_cache.time.monotonic", return_value=100):
+            cache.set("a", b"{}", 10)
+            self.assertEqual(cache.get("a"), b"{}")
+        with mock.patch("spotipy.response_cache.time.monotonic", return_value=110):
+            self.assertIsNone(cache.get("a"))
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.stats(), {"hits": 1, "misses": 1, "hit_ratio": 0.5})
+
+    def test_evicts_least_recently_used(self):
+        cache = MemoryResponseCache(maxsize=2)
+        cache.set_many({"a": b"1", "b": b"2"}, 60)
+        cache.get("a")
+        cache.set("c", b"3", 60)
+
+        self.assertEqual(cache.get_many(["a", "b", "c"]), {"a": b"1", "c": b"3"})
+
+    def test_policies(self):
+        cache = MemoryResponseCache(default_ttl=30)
+
+        self.assertEqual(cache.policy_for("markets").ttl, 24 * 60 * 60)
+        self.assertEqual(cache.policy_for("recommendations/available-genre-seeds").ttl,
+                         24 * 60 * 60)
+        self.assertEqual(cache.policy_for("albums/abc").ttl, 60 * 60)
+        self.assertEqual(cache.policy_for("me/player/currently-playing").ttl, 5)
+        self.assertTrue(cache.policy_for("me/tracks").per_user)
+        self.assertEqual(cache.policy_for("search").ttl, 30)
+
+        custom = MemoryResponseCache(policies=[(r"^search$", 0)], default_ttl=10)
+        self.assertEqual(custom.policy_for("search").ttl, 0)
+        self.assertEqual(custom.policy_for("markets"), CachePolicy(None, 10))
+
+    def test_is_per_user(self):
+        cache = MemoryResponseCache()
+        url = "https://api.spotify.com/v1/"
+
+        self.assertTrue(cache.is_per_user("me/tracks", url + "me/tracks", {}))
+        self.assertFalse(cache.is_per_user("tracks/abc", url + "tracks/abc", {}))
+        self.assertTrue(cache.is_per_user("tracks/abc", url + "tracks/abc",
+                                          {"market": "from_token"}))
+        self.assertTrue(cache.is_per_user("albums/", url + "albums/?market=from_token", {}))
+        self.assertTrue(cache.is_per_user("shows/abc", url + "shows/abc", {"market": None}))
+        self.assertFalse(cache.is_per_user("shows/abc", url + "shows/abc", {"market": "DE"}))
+        self.assertTrue(cache.is_per_user("episodes/abc/", url + "episodes/abc", {}))
+
+
+class ClientResponseCacheTest(unittest.TestCase):
+
+    def _make_client(self, cache, count=10, **kwargs):
+        transport = ScriptedTransport(
+            *((200, b'{"n": %d}' % i, {}) for i in range(count))
+        )
+        return Spotify(transport=transport, response_cache=cache, **kwargs), transport
+
+    def test_serves_repeat_calls_from_cache(self):
+        cache = MemoryResponseCache()
+        sp, transport = self._make_client(cache, auth="TOKEN")
+
+        self.assertEqual(sp.artist("abc"), {"n": 0})
+        self.assertEqual(sp.artist("spotify:artist:abc"), {"n": 0})
+        self.assertEqual(sp.album("abc", market="DE"), {"n": 1})
+        self.assertEqual(sp.album("abc", market="SE"), {"n": 2})
+        self.assertEqual(sp.album("abc", market="DE"), {"n": 1})
+
+        self.assertEqual(len(transport.requests), 3)
+        self.assertEqual(cache.stats()["hits"], 2)
+
+    def test_bypass(self):
+        cache = MemoryResponseCache()
+        sp, transport = self._make_client(cache, auth="TOKEN")
+
+        sp.artist("abc")
+        with bypass_cache():
+            self.assertEqual(sp.artist("abc"), {"n": 1})
+        # the response fetched while bypassing replaced the cached one
+        self.assertEqual(sp.artist("abc"), {"n": 1})
+        self.assertEqual(len(transport.requests), 2)
+
+    def test_per_user_endpoints_are_cached_per_token(self):
+        cache = MemoryResponseCache(policies=[CachePolicy(r"^me(/|$)", 60, per_user=True)])
+        sp, transport = self._make_client(cache, auth="ALICE")
+        sp.current_user()
+        sp.set_auth("BOB")
+
+        self.assertEqual(sp.current_user(), {"n": 1})
+        sp.set_auth("ALICE")
+        self.assertEqual(sp.current_user(), {"n": 0})
+        self.assertEqual(len(transport.requests), 2)
+
+    def test_reads_after_writes_by_default(self):
+        transport = ScriptedTransport(
+            (200, b'[false]', {}),
+            (200, b'', {}),
+            (200, b'[true]', {}),
+        )
+        sp = Spotify(auth="TOKEN", transport=transport, response_cache=MemoryResponseCache())
+
+        self.assertEqual(sp.current_user_saved_tracks_contains(["abc"]), [False])
+        sp.current_user_saved_tracks_add(["abc"])
+
+        self.assertEqual(sp.current_user_saved_tracks_contains(["abc"]), [True])
+
+    def test_user_markets_are_cached_per_token(self):
+        cache = MemoryResponseCache()
+        sp, transport = self._make_client(cache, auth="ALICE")
+        sp.track("abc", market="from_token")
+        sp.show("abc")
+        sp.set_auth("BOB")
+
+        self.assertEqual(sp.track("abc", market="from_token"), {"n": 2})
+        self.assertEqual(sp.show("abc"), {"n": 3})
+        sp.set_auth("ALICE")
+        self.assertEqual(sp.track("abc", market="from_token"), {"n": 0})
+
+    def test_only_caches_successful_gets(self):
+        cache = MemoryResponseCache()
+        transport = ScriptedTransport(
+            (201, b'{"snapshot_id": "s"}', {}),
+            (404, b'{"error": {"message": "nope"}}', {}),
+        )
+        sp = Spotify(auth="TOKEN", transport=transport, response_cache=cache)
+
+        sp.playlist_add_items("pl", ["spotify:track:abc"])
+        with self.assertRaises(SpotifyException):
+            sp.track("abc")
+
+        self.assertEqual(len(cache), 0)
+
+
+class SQLiteResponseCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "responses.db")
+
+    def _make_cache(self, **kwargs):
+        cache = SQLiteResponseCache(self.path, **kwargs)
+        self.addCleanup(cache.close)
+        return cache
+
+    def test_survives_restarts(self):
+        self._make_cache().set_many({"a": b'{"n": 1}', "b": b'{"n": 2}'}, 60)
+
+        cache = self._make_cache()
+        self.assertEqual(cache.get_many(["a", "b", "c"]), {"a": b'{"n": 1}', "b": b'{"n": 2}'})
+        self.assertEqual(cache.stats(), {"hits": 2, "misses": 1, "hit_ratio": 2 / 3})
+
+    def test_expires_entries(self):
+        cache = self._make_cache()
+        with mock.patch("spotipy.response_cache.time.time", return_value=1000):
+            cache.set("a", b"{}", 10)
+            cache.set("b", b"{}", 100)
+        with mock.patch("spotipy.response_cache.time.time", return_value=1010):
+            self.assertIsNone(cache.get("a"))
+            cache.evict()
+        self.assertEqual(len(cache), 1)
+
+    def test_evicts_oldest_beyond_max_bytes(self):
+        cache = self._make_cache(max_bytes=25, evict_interval=1)
+        for key in "abcd":
+            with mock.patch("spotipy.response_cache.time.time", return_value=ord(key)):
+                cache.set(key, b"x" * 10, 10 ** 10)
+
+        self.assertEqual(sorted(cache.get_many(list("abcd"))), ["c", "d"])
+
+    def test_concurrent_writers(self):
+        errors = []
+
+        def write(name):
+            cache = SQLiteResponseCache(self.path, timeout=10, write_timeout=10)
+            try:
+                for i in range(50):
+                    cache.set(f"{name}-{i}", b"{}", 60)
+                    cache.get(f"{name}-{i}")
+            except Exception as error:
+                errors.append(error)
+            finally:
+                cache.close()
+
+        threads = [threading.Thread(target=write, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(len(self._make_cache()), 200)
+
+    def test_locked_database_skips_writes(self):
+        cache = self._make_cache(write_timeout=0.01)
+        cache.set("a", b"{}", 60)
+        writer = sqlite3.connect(self.path, isolation_level=None)
+        self.addCleanup(writer.close)
+        writer.execute("BEGIN IMMEDIATE")
+
+        transport = ScriptedTransport((200, b'{"id": "abc"}', {}))
+        sp = Spotify(auth="TOKEN", transport=transport, response_cache=cache)
+        with self.assertLogs("spotipy.response_cache", "WARNING"):
+            self.assertEqual(sp.artist("abc"), {"id": "abc"})
+            cache.evict()
+        self.assertEqual(cache.get("a"), b"{}")
+
+        writer.execute("ROLLBACK")
+        cache.set("b", b"{}", 60)
+        self.assertEqual(len(cache), 2)
+
+    def test_errors_are_misses(self):
+        cache = self._make_cache()
+        cache.set("a", b"{}", 60)
+        cache._connect().execute("DROP TABLE responses")
+
+        with self.assertLogs("spotipy.response_cache", "WARNING"):
+            self.assertIsNone(cache.get("a"))
+
+    @unittest.skipIf(zstandard is None, "zstandard is not installed")
+    def test_compression(self):
+        cache = self._make_cache(compress=True)
+        body = b'{"items": [%s]}' % b",".join([b'{"id": "abc"}'] * 100)
+        cache.set("a", body, 60)
+
+        self.assertEqual(self._make_cache().get("a"), body)
+
+    def test_used_by_client(self):
+        transport = ScriptedTransport((200, b'{"id": "abc"}', {}))
+        Spotify(auth="TOKEN", transport=transport,
+                response_cache=self._make_cache()).artist("abc")
+
+        sp = Spotify(auth="TOKEN", transport=transport, response_cache=self._make_cache())
+        self.assertEqual(sp.artist("abc"), {"id": "abc"})
+        self.assertEqual(len(transport.requests), 1)
+
+
+@unittest.skipIf(fakeredis is None, "fakeredis is not installed")
+class RedisResponseCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.redis = fakeredis.FakeRedis()
+        self.cache = RedisResponseCache(self.redis)
+
+    def test_round_trip(self):
+        self.cache.set_many({"a": b"1", "b": b"2"}, 60)
+
+        self.assertEqual(self.cache.get_many(["a", "b", "c"]), {"a": b"1", "b": b"2"})
+        self.assertLessEqual(self.redis.pttl("spotipy:response:a"), 60000)
+
+    def test_clear_only_deletes_own_keys(self):
+        self.redis.set("token_info", "{}")
+        self.cache.set("a", b"1", 60)
+
+        self.cache.clear()
+
+        self.assertEqual(self.redis.keys(), [b"token_info"])
+
+    def test_errors_are_misses(self):
+        redis = mock.Mock()
+        redis.mget.side_effect = RedisError("down")
+        redis.pipeline.side_effect = RedisError("down")
+        cache = RedisResponseCache(redis)
+
+        with self.assertLogs("spotipy.response_cache", level="WARNING"):
+            cache.set("a", b"1", 60)
+        with self.assertLogs("spotipy.response_cache", level="WARNING"):
+            self.assertIsNone(cache.get("a"))
+
+
+@unittest.skipIf(fakeredis is None, "fakeredis is not installed")
+class AsyncRedisResponseCacheTest(unittest.TestCase):
+
+    def test_round_trip(self):
+        redis = fakeredis.FakeAsyncRedis()
+        cache = AsyncRedisResponseCache(redis)
+
+        async def main():
+            await cache.set_many({"a": b"1", "b": b"2"}, 60)
+            found = await cache.get_many(["a", "b", "c"])
+            await cache.clear()
+            return found, await cache.get("a")
+
+        self.assertEqual(asyncio.run(main()), ({"a": b"1", "b": b"2"}, None))
+        self.assertEqual(cache.stats()["hits"], 2)
+
+    def test_async_client(self):
+        transport = AsyncAdapter(EntityTransport())
+        redis = fakeredis.FakeAsyncRedis()
+        sp = AsyncSpotify(auth="TOKEN", transport=transport,
+                          response_cache=AsyncRedisResponseCache(redis))
+
+        async def main():
+            await sp.track("a")
+            await sp.tracks(["a", "b"])
+            return await sp.track("b"), await sp.tracks(["b", "a"])
+
+        self.assertEqual(asyncio.run(main()),
+                         ({"id": "b"}, {"tracks": [{"id": "b"}, {"id": "a"}]}))
+        self.assertEqual([url.split("/v1/")[1] for url, params in transport.requests],
+                         ["tracks/a", "tracks/?ids=b"])
+
+    def test_errors_are_misses(self):
+        redis = mock.Mock()
+        redis.mget = mock.AsyncMock(side_effect=RedisError("down"))
+        redis.pipeline.side_effect = RedisError("down")
+        cache = AsyncRedisResponseCache(redis)
+
+        with self.assertLogs("spotipy.response_cache", level="WARNING"):
+            asyncio.run(cache.set("a", b"1", 60))
+        with self.assertLogs("spotipy.response_cache", level="WARNING"):
+            self.assertIsNone(asyncio.run(cache.get("a")))
+
+
+class BulkCacheTest(unittest.TestCase):
+
+    def _make_client(self, cache):
+        transport = EntityTransport()
+        return Spotify(auth="TOKEN", transport=transport, response_cache=cache), transport
+
+    @unittest.skipIf(fakeredis is None, "fakeredis is not installed")
+    def test_tracks_only_fetches_misses(self):
+        redis = fakeredis.FakeRedis()
+        sp, transport = self._make_client(RedisResponseCache(redis))
+        sp.track("b")
+
+        with mock.patch.object(redis, "mget", wraps=redis.mget) as mget:
+            result = sp.tracks(["a", "b", "missing", "c"])
+
+        self.assertEqual(result, {"tracks": [{"id": "a"}, {"id": "b"}, None, {"id": "c"}]})
+        self.assertEqual(mget.call_count, 1)
+        self.assertTrue(transport.requests[-1][0].endswith("tracks/?ids=a,missing,c"))
+
+        # entities fetched in bulk are cached like single ones
+        sp.track("a")
+        sp.tracks(["c", "a"])
+        self.assertEqual(len(transport.requests), 2)
+
+    @unittest.skipIf(fakeredis is None, "fakeredis is not installed")
+    def test_one_lookup_for_all_chunks(self):
+        redis = fakeredis.FakeRedis()
+        sp, transport = self._make_client(RedisResponseCache(redis))
+        ids = [f"t{i}" for i in range(120)]
+        sp.tracks(ids[:60])
+
+        with mock.patch.object(redis, "mget", wraps=redis.mget) as mget:
+            result = sp.tracks(ids)
+
+        self.assertEqual(result, {"tracks": [{"id": i} for i in ids]})
+        self.assertEqual(mget.call_count, 1)
+        # only the 60 misses are requested, in two chunks
+        urls = [url for url, params in transport.requests[2:]]
+        self.assertEqual(sorted(len(url.split("?ids=")[1].split(",")) for url in urls),
+                         [10, 50])
+        self.assertFalse(any("t59" in url.split("?ids=")[1].split(",") for url in urls))
+
+    def test_artists(self):
+        sp, transport = self._make_client(MemoryResponseCache())
+        sp.artists(["a", "b"])
+
+        self.assertEqual(sp.artists(["b", "a", "b"]),
+                         {"artists": [{"id": "b"}, {"id": "a"}, {"id": "b"}]})
+        self.assertEqual(len(transport.requests), 1)
+
+    def test_market_is_part_of_the_key(self):
+        sp, transport = self._make_client(MemoryResponseCache())
+        sp.tracks(["a"], market="DE")
+        sp.tracks(["a"], market="SE")
+
+        self.assertEqual(len(transport.requests), 2)
+
+    def test_user_markets_are_cached_per_token(self):
+        sp, transport = self._make_client(MemoryResponseCache())
+        sp.tracks(["a"], market="from_token")
+        sp.set_auth("BOB")
+        sp.tracks(["a"], market="from_token")
+
+        self.assertEqual(len(transport.requests), 2)
+
+    def test_without_cache(self):
+        sp = Spotify(auth="TOKEN", transport=EntityTransport())
+        self.assertEqual(sp.tracks(["a", "b"]), {"tracks": [{"id": "a"}, {"id": "b"}]})
+
+
+class AsyncBulkCacheTest(unittest.TestCase):
+
+    def test_tracks(self):
+        transport = AsyncAdapter(EntityTransport())
+        sp = AsyncSpotify(auth="TOKEN", transport=transport,
+                          response_cache=MemoryResponseCache())
+
+        async def main():
+            await sp.tracks(["a", "b"])
+            return await sp.tracks(["b", "a"])
+
+        self.assertEqual(asyncio.run(main()), {"tracks": [{"id": "b"}, {"id": "a"}]})
+        self.assertEqual(len(transport.transport.requests), 1)
+
+    def test_chunks_only_misses(self):
+        transport = AsyncAdapter(EntityTransport())
+        sp = AsyncSpotify(auth="TOKEN", transport=transport,
+                          response_cache=MemoryResponseCache())
+        ids = [f"t{i}" for i in range(70)]
+
+        async def main():
+            await sp.tracks(ids[:30])
+            return await sp.tracks(ids)
+
+        self.assertEqual(asyncio.run(main()), {"tracks": [{"id": i} for i in ids]})
+        self.assertEqual(len(transport.requests), 2)
+        self.assertTrue(transport.requests[-1][0].endswith(
+            "tracks/?ids=" + ",".join(ids[30:])))
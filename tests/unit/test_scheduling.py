@@ -0,0 +1,251 @@
+import asyncio
+import json
+import threading
+import time
+import unittest
+import urllib.parse as urllibparse
+
+from spotipy import AsyncSpotify, Spotify, SpotifyOverloadedError
+from spotipy.scheduling import (BULK, INTERACTIVE, AsyncPriorityScheduler,
+                                Lane, PriorityScheduler, for_tenant, priority)
+from spotipy.transport import AsyncTransport, Response, Transport
+
+
+def wait_until(condition, timeout=1):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("timed out")
+        time.sleep(0.001)
+
+
+class PrioritySchedulerTest(unittest.TestCase):
+
+    def test_interactive_goes_ahead_of_queued_bulk(self):
+        scheduler = PriorityScheduler(max_in_flight=1)
+        order = []
+
+        def request(lane):
+            with scheduler.slot(lane):
+                order.append(lane)
+
+        with scheduler.slot(BULK):
+            threads = []
+            for lane in [BULK, BULK, INTERACTIVE]:
+                thread = threading.Thread(target=request, args=(lane,))
+                thread.start()
+                threads.append(thread)
+                wait_until(lambda: scheduler.queued == len(threads))
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(order, [INTERACTIVE, BULK, BULK])
+        stats = scheduler.stats()
+        self.assertEqual(stats[BULK]["dispatched"], 3)
+        self.assertEqual(stats[INTERACTIVE]["dispatched"], 1)
+        self.assertGreater(stats[BULK]["max_wait_time"], 0)
+        self.assertEqual(stats[BULK]["in_flight"], 0)
+
+    def test_admits_up_to_max_in_flight(self):
+        scheduler = PriorityScheduler(max_in_flight=2)
+        with scheduler.slot(), scheduler.slot(BULK):
+            self.assertEqual(scheduler.in_flight, 2)
+            self.assertEqual(scheduler.queued, 0)
+        self.assertEqual(scheduler.in_flight, 0)
+
+    def test_full_queue_fails_fast(self):
+        scheduler = PriorityScheduler(
+            max_in_flight=1, lanes=[Lane(INTERACTIVE), Lane(BULK, max_queued=0)]
+        )
+        with scheduler.slot():
+            with self.assertRaises(SpotifyOverloadedError) as context:
+                with scheduler.slot(BULK):
+                    pass
+
+        self.assertEqual(context.exception.lane, BULK)
+        self.assertEqual(scheduler.stats()[BULK]["rejected"], 1)
+
+    def test_sheds_requests_waiting_too_long(self):
+        scheduler = PriorityScheduler(
+            max_in_flight=1, lanes=[Lane(INTERACTIVE, max_wait=0.01)]
+        )
+        with scheduler.slot():
+            with self.assertRaises(SpotifyOverloadedError):
+                with scheduler.slot():
+                    pass
+
+        stats = scheduler.stats()[INTERACTIVE]
+        self.assertEqual((stats["shed"], stats["queued"], stats["dispatched"]), (1, 0, 1))
+
+    def test_unknown_lane(self):
+        with self.assertRaises(ValueError):
+            with PriorityScheduler().slot("urgent"):
+                pass
+
+
+class AsyncPrioritySchedulerTest(unittest.TestCase):
+
+    def test_interactive_goes_ahead_of_queued_bulk(self):
+        scheduler = AsyncPriorityScheduler(max_in_flight=1)
+        order = []
+
+        async def request(lane):
+            async with scheduler.slot(lane):
+                order.append(lane)
+                await asyncio.sleep(0)
+
+        async def main():
+            await asyncio.gather(*(request(lane) for lane in [BULK, BULK, BULK, INTERACTIVE]))
+
+        asyncio.run(main())
+        self.assertEqual(order, [BULK, INTERACTIVE, BULK, BULK])
+
+    def test_sheds_requests_waiting_too_long(self):
+        scheduler = AsyncPriorityScheduler(max_in_flight=1, lanes=[Lane(BULK, max_wait=0.01)],
+                                           default_lane=BULK)
+
+        async def main():
+            async with scheduler.slot():
+                with self.assertRaises(SpotifyOverloadedError):
+                    async with scheduler.slot():
+                        pass
+
+        asyncio.run(main())
+        self.assertEqual(scheduler.stats()[BULK]["shed"], 1)
+        self.assertEqual(scheduler.queued, 0)
+
+    def test_cancelled_request_leaves_queue(self):
+        scheduler = AsyncPriorityScheduler(max_in_flight=1)
+
+        async def main():
+            async with scheduler.slot():
+                task = asyncio.ensure_future(scheduler.slot().__aenter__())
+                await asyncio.sleep(0)
+                self.assertEqual(scheduler.queued, 1)
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+            self.assertEqual((scheduler.queued, scheduler.in_flight), (0, 0))
+
+        asyncio.run(main())
+
+
+class FairShareTest(unittest.TestCase):
+
+    def dispatch_order(self, scheduler, tenants):
+        """ Returns the order in which requests for `tenants`, queued in
+            that order, are dispatched
+        """
+        order = []
+
+        async def request(tenant):
+            async with scheduler.slot(BULK, tenant):
+                order.append(tenant)
+                await asyncio.sleep(0)
+
+        async def main():
+            async with scheduler.slot(BULK, "first"):
+                tasks = [asyncio.ensure_future(request(tenant)) for tenant in tenants]
+                await asyncio.sleep(0)
+            await asyncio.gather(*tasks)
+
+        asyncio.run(main())
+        return order
+
+    def test_tenants_take_turns(self):
+        scheduler = AsyncPriorityScheduler(max_in_flight=1)
+        order = self.dispatch_order(scheduler, ["heavy"] * 5 + ["light"] * 2)
+        self.assertEqual(order, ["heavy", "light", "heavy", "light", "heavy", "heavy", "heavy"])
+
+    def test_weights(self):
+        scheduler = AsyncPriorityScheduler(max_in_flight=1, weights={"gold": 2})
+        order = self.dispatch_order(scheduler, ["basic"] * 6 + ["gold"] * 6)
+        self.assertEqual(order[:6].count("gold"), 4)
+        self.assertEqual(order[:9].count("gold"), 6)
+
+    def test_tenant_stats(self):
+        scheduler = AsyncPriorityScheduler(max_in_flight=1)
+        self.dispatch_order(scheduler, ["a", "b", "a"])
+        stats = scheduler.tenant_stats()
+        self.assertEqual(set(stats), {"first", "a", "b"})
+        self.assertEqual(stats["a"]["dispatched"], 2)
+        self.assertEqual((stats["a"]["queued"], stats["a"]["in_flight"]), (0, 0))
+
+    def test_tenant_queue_bound(self):
+        scheduler = PriorityScheduler(max_in_flight=1, max_queued_per_tenant=0)
+        with scheduler.slot(tenant="a"):
+            with self.assertRaises(SpotifyOverloadedError):
+                with scheduler.slot(tenant="a"):
+                    pass
+        self.assertEqual(scheduler.tenant_stats()["a"]["rejected"], 1)
+
+
+class LaneTransport(Transport):
+    """ Records the lane each request was sent in """
+
+    def __init__(self, scheduler):
+        self.scheduler = scheduler
+        self.lanes = []
+
+    def request(self, method, url, params=None, **kwargs):
+        stats = self.scheduler.stats()
+        self.lanes.append(next(lane for lane in stats if stats[lane]["in_flight"]))
+        query = dict(urllibparse.parse_qsl(urllibparse.urlsplit(url).query), **(params or {}))
+        if "ids" in query:
+            body = {"tracks": [{"id": i} for i in query["ids"].split(",")]}
+        else:
+            body = {"id": "abc"}
+        return Response(200, {}, json.dumps(body).encode(), url)
+
+
+class ClientSchedulingTest(unittest.TestCase):
+
+    def setUp(self):
+        self.scheduler = PriorityScheduler(max_in_flight=1)
+        self.transport = LaneTransport(self.scheduler)
+
+    def test_default_lane(self):
+        sp = Spotify(auth="TOKEN", transport=self.transport, scheduler=self.scheduler)
+        sp.track("abc")
+        self.assertEqual(self.transport.lanes, [INTERACTIVE])
+
+    def test_client_lane(self):
+        sp = Spotify(auth="TOKEN", transport=self.transport, scheduler=self.scheduler, lane=BULK)
+        sp.track("abc")
+        with priority(INTERACTIVE):
+            sp.track("abc")
+        self.assertEqual(self.transport.lanes, [BULK, INTERACTIVE])
+
+    def test_priority_applies_to_chunks(self):
+        sp = Spotify(auth="TOKEN", transport=self.transport, scheduler=self.scheduler)
+        with priority(BULK):
+            sp.tracks([f"id{i}" for i in range(120)])
+        self.assertEqual(self.transport.lanes, [BULK, BULK, BULK])
+
+    def test_async(self):
+        scheduler = AsyncPriorityScheduler()
+        transport = LaneTransport(scheduler)
+
+        class Async(AsyncTransport):
+            async def request(self, *args, **kwargs):
+                return transport.request(*args, **kwargs)
+
+        async def main():
+            sp = AsyncSpotify(auth="TOKEN", transport=Async(), scheduler=scheduler)
+            with priority(BULK):
+                await sp.track("abc")
+
+        asyncio.run(main())
+        self.assertEqual(transport.lanes, [BULK])
+        self.assertEqual(scheduler.in_flight, 0)
+
+    def test_tenants(self):
+        sp = Spotify(auth="TOKEN", transport=self.transport, scheduler=self.scheduler,
+                     tenant="acme")
+        sp.track("abc")
+        with for_tenant("globex"):
+            sp.track("abc")
+            sp.track("abc")
+
+        stats = self.scheduler.tenant_stats()
+        self.assertEqual(stats["acme"]["dispatched"], 1)
+        self.assertEqual(stats["globex"]["dispatched"], 2)
@@ -0,0 +1,266 @@
+import asyncio
+import socket
+import time
+import unittest
+import unittest.mock as mock
+
+import requests
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+from spotipy import (AsyncSpotify, Spotify, SpotifyDeadlineExceededError,
+                     SpotifyException)
+from spotipy.timeouts import (AdaptiveTimeout, LatencyTracker,
+                              current_deadline, deadline)
+from spotipy.transport import (AsyncTransport, HTTPXTransport,
+                               RequestsTransport, Response, Transport,
+                               Urllib3Transport)
+
+
+class DeadlineTest(unittest.TestCase):
+
+    def test_nested_deadlines_only_shorten(self):
+        self.assertIsNone(current_deadline())
+        with deadline(1):
+            outer = current_deadline()
+            self.assertAlmostEqual(outer, time.monotonic() + 1, delta=0.05)
+            with deadline(10):
+                self.assertEqual(current_deadline(), outer)
+            with deadline(0.5):
+                self.assertLess(current_deadline(), outer)
+        self.assertIsNone(current_deadline())
+
+
+class AdaptiveTimeoutTest(unittest.TestCase):
+
+    def test_percentile(self):
+        tracker = LatencyTracker(window=100)
+        for i in range(1, 101):
+            tracker.record("tracks/{id}", i / 100)
+        self.assertEqual(tracker.percentile("tracks/{id}", 0.5), 0.5)
+        self.assertEqual(tracker.percentile("tracks/{id}", 0.99), 0.99)
+        self.assertIsNone(tracker.percentile("albums/{id}", 0.5))
+
+    def test_window(self):
+        tracker = LatencyTracker(window=10)
+        for i in range(20):
+            tracker.record("tracks/{id}", i)
+        self.assertEqual(tracker.count("tracks/{id}"), 10)
+        self.assertEqual(tracker.percentile("tracks/{id}", 0), 10)
+
+    def test_timeout_for(self):
+        timeout = AdaptiveTimeout(percentile=0.9, factor=2, minimum=0.1, min_samples=10)
+        for _ in range(9):
+            timeout.record("tracks/{id}", 0.2)
+        self.assertIsNone(timeout.timeout_for("tracks/{id}"))
+        timeout.record("tracks/{id}", 0.2)
+        self.assertAlmostEqual(timeout.timeout_for("tracks/{id}"), 0.4)
+        for _ in range(10):
+            timeout.record("albums/{id}", 0.01)
+        self.assertEqual(timeout.timeout_for("albums/{id}"), 0.1)
+
+
+class ScriptedTransport(RequestsTransport):
+    """ Answers with the scripted responses in turn, raising exceptions,
+        and records the timeout of each request
+    """
+
+    def __init__(self, *script):
+        self.script = list(script)
+        self.timeouts = []
+
+    def request(self, method, url, timeout=None, **kwargs):
+        self.timeouts.append(timeout)
+        outcome = self.script.pop(0) if len(self.script) > 1 else self.script[0]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return Response(outcome, {"Retry-After": "2"}, b'{"id": "abc"}', url)
+
+
+class ClientDeadlineTest(unittest.TestCase):
+
+    def test_retries_get_on_read_timeout(self):
+        transport = ScriptedTransport(requests.exceptions.ReadTimeout(), 200)
+        sp = Spotify(auth="TOKEN", transport=transport)
+
+        with mock.patch("spotipy.client.time.sleep"):
+            self.assertEqual(sp.track("abc"), {"id": "abc"})
+
+        self.assertEqual(len(transport.timeouts), 2)
+
+    def test_read_timeout_retries_are_bounded(self):
+        transport = ScriptedTransport(requests.exceptions.ReadTimeout())
+        sp = Spotify(auth="TOKEN", transport=transport, retries=2)
+
+        with mock.patch("spotipy.client.time.sleep"):
+            with self.assertRaises(requests.exceptions.ReadTimeout):
+                sp.track("abc")
+
+        self.assertEqual(len(transport.timeouts), 3)
+
+    def test_does_not_retry_writes_on_read_timeout(self):
+        transport = ScriptedTransport(requests.exceptions.ReadTimeout(), 200)
+        sp = Spotify(auth="TOKEN", transport=transport)
+
+        with self.assertRaises(requests.exceptions.ReadTimeout):
+            sp.playlist_change_details("abc", name="name")
+
+        self.assertEqual(len(transport.timeouts), 1)
+
+    def test_retries_failed_connections(self):
+        transport = ScriptedTransport(requests.exceptions.ConnectTimeout(), 200)
+        sp = Spotify(auth="TOKEN", transport=transport)
+
+        with mock.patch("spotipy.client.time.sleep"):
+            sp.playlist_change_details("abc", name="name")
+
+        self.assertEqual(len(transport.timeouts), 2)
+
+    def test_no_connection_retry_past_the_deadline(self):
+        transport = ScriptedTransport(requests.exceptions.ConnectTimeout())
+        sp = Spotify(auth="TOKEN", transport=transport, deadline=0.5, backoff_factor=1)
+
+        with mock.patch("spotipy.client.time.sleep") as sleep:
+            with self.assertRaises(requests.exceptions.ConnectTimeout):
+                sp.track("abc")
+
+        self.assertEqual(len(transport.timeouts), 2)
+        sleep.assert_called_once_with(0)
+
+    def test_no_retry_past_the_deadline(self):
+        transport = ScriptedTransport(503, 200)
+        sp = Spotify(auth="TOKEN", transport=transport, deadline=0.5)
+
+        with mock.patch("spotipy.client.time.sleep") as sleep:
+            with self.assertRaises(SpotifyException) as context:
+                sp.track("abc")
+
+        self.assertEqual(context.exception.http_status, 503)
+        sleep.assert_not_called()
+
+    def test_call_deadline_takes_precedence(self):
+        transport = ScriptedTransport(503, 200)
+        sp = Spotify(auth="TOKEN", transport=transport, deadline=0.5)
+
+        with mock.patch("spotipy.client.time.sleep"), deadline(5):
+            self.assertEqual(sp.track("abc"), {"id": "abc"})
+
+    def test_expired_deadline(self):
+        transport = ScriptedTransport(200)
+        sp = Spotify(auth="TOKEN", transport=transport)
+
+        with deadline(0):
+            with self.assertRaises(SpotifyDeadlineExceededError):
+                sp.track("abc")
+
+        self.assertEqual(transport.timeouts, [])
+
+    def test_attempt_timeout_is_capped(self):
+        transport = ScriptedTransport(200)
+        sp = Spotify(auth="TOKEN", transport=transport, requests_timeout=(3, 5), deadline=1)
+        sp.track("abc")
+        connect, read = transport.timeouts[0]
+        self.assertLessEqual(connect, 1)
+        self.assertLessEqual(read, 1)
+
+    def test_adaptive_timeout(self):
+        transport = ScriptedTransport(200)
+        timeout = AdaptiveTimeout(factor=2, minimum=0, min_samples=3)
+        for latency in [0.1, 0.2, 0.3]:
+            timeout.record("tracks/{id}", latency)
+        sp = Spotify(auth="TOKEN", transport=transport, adaptive_timeout=timeout)
+
+        sp.track("abc")
+        sp.album("abc")
+
+        self.assertAlmostEqual(transport.timeouts[0], 0.6)
+        self.assertEqual(transport.timeouts[1], 5)
+        self.assertEqual(timeout.tracker.count("tracks/{id}"), 4)
+
+    def test_endpoint(self):
+        sp = Spotify(auth="TOKEN")
+        for url, endpoint in [
+            ("albums/abc/tracks", "albums/{id}/tracks"),
+            ("me/tracks/contains", "me/tracks/contains"),
+            ("users/spotify/playlists", "users/{id}/playlists"),
+            ("tracks/", "tracks/"),
+            ("https://api.spotify.com/v1/me/player/devices", "me/player/devices"),
+        ]:
+            self.assertEqual(sp._endpoint(sp.prefix + url if "://" not in url else url),
+                             endpoint)
+
+
+class AsyncTimeoutTransport(AsyncTransport):
+
+    def __init__(self):
+        self.requests = 0
+
+    async def request(self, method, url, **kwargs):
+        self.requests += 1
+        if self.requests == 1:
+            raise asyncio.TimeoutError()
+        return Response(200, {}, b'{"id": "abc"}', url)
+
+    def is_read_timeout(self, error):
+        return isinstance(error, asyncio.TimeoutError)
+
+
+class AsyncClientDeadlineTest(unittest.TestCase):
+
+    def test_retries_get_on_read_timeout(self):
+        transport = AsyncTimeoutTransport()
+
+        async def main():
+            sp = AsyncSpotify(auth="TOKEN", transport=transport, deadline=5)
+            return await sp.track("abc")
+
+        with mock.patch("spotipy.async_client.asyncio.sleep"):
+            self.assertEqual(asyncio.run(main()), {"id": "abc"})
+        self.assertEqual(transport.requests, 2)
+
+    def test_expired_deadline(self):
+        transport = AsyncTimeoutTransport()
+
+        async def main():
+            sp = AsyncSpotify(auth="TOKEN", transport=transport)
+            with deadline(0):
+                await sp.track("abc")
+
+        with self.assertRaises(SpotifyDeadlineExceededError):
+            asyncio.run(main())
+        self.assertEqual(transport.requests, 0)
+
+
+class TransportTest(unittest.TestCase):
+
+    def test_is_read_timeout(self):
+        self.assertTrue(RequestsTransport().is_read_timeout(requests.exceptions.ReadTimeout()))
+        self.assertFalse(RequestsTransport().is_read_timeout(requests.exceptions.ConnectTimeout()))
+        self.assertFalse(Transport().is_read_timeout(requests.exceptions.ReadTimeout()))
+
+    def test_is_connect_error(self):
+        refused = MaxRetryError(None, "/", NewConnectionError(None, "Connection refused"))
+        transport = RequestsTransport()
+        self.assertTrue(transport.is_connect_error(requests.exceptions.ConnectionError(refused)))
+        self.assertTrue(transport.is_connect_error(requests.exceptions.ConnectTimeout()))
+        self.assertFalse(transport.is_connect_error(requests.exceptions.ConnectionError()))
+        self.assertFalse(transport.is_connect_error(requests.exceptions.ReadTimeout()))
+        self.assertTrue(Urllib3Transport().is_connect_error(refused))
+
+    def test_only_the_client_retries_failed_connections(self):
+        # a port nothing listens on
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        for transport, connect in [
+            (Urllib3Transport(), "urllib3.util.connection.create_connection"),
+            (HTTPXTransport(), "httpcore._backends.sync.socket.create_connection"),
+        ]:
+            sp = Spotify(auth="TOKEN", transport=transport, retries=2, backoff_factor=0)
+            sp.prefix = f"http://127.0.0.1:{port}/v1/"
+            with mock.patch(connect, side_effect=ConnectionRefusedError) as attempts:
+                with self.assertRaises(Exception) as raised, \
+                        self.assertLogs("spotipy.client", level="WARNING"):
+                    sp.track("abc")
+
+            self.assertTrue(transport.is_connect_error(raised.exception))
+            self.assertEqual(attempts.call_count, 3)
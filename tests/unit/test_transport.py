@@ -0,0 +1,252 @@
+import json
+import threading
+import unittest
+import unittest.mock as mock
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import requests
+
+from spotipy import Spotify, SpotifyClientCredentials, SpotifyException
+from spotipy.cache_handler import MemoryCacheHandler
+from spotipy.exceptions import SpotifyOauthError
+from spotipy.transport import (HTTPXTransport, RequestsTransport, Transport,
+                               Urllib3Transport, merge_params)
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    import h2
+except ImportError:
+    h2 = None
+
+
+class EchoHandler(BaseHTTPRequestHandler):
+    """ Responds with the request it received, and with the status code
+        given by a `status` query parameter
+    """
+
+    def _respond(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.dumps({
+            "method": self.command,
+            "path": self.path,
+            "content_type": self.headers.get("Content-Type"),
+            "body": self.rfile.read(length).decode(),
+        }).encode()
+        status = 200
+        if "status=" in self.path:
+            status = int(self.path.split("status=")[1][:3])
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = _respond
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TransportTestMixin:
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = HTTPServer(("127.0.0.1", 0), EchoHandler)
+        cls.url = f"http://127.0.0.1:{cls.server.server_port}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.transport = self.make_transport()
+
+    def tearDown(self):
+        self.transport.close()
+
+    def test_get_merges_params(self):
+        response = self.transport.request(
+            "GET", self.url + "/v1/search?type=track", params={"q": "a b", "market": None},
+            timeout=5,
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["path"], "/v1/search?type=track&q=a+b")
+
+    def test_post_form_encodes_dict(self):
+        response = self.transport.request(
+            "POST", self.url + "/api/token", data={"grant_type": "client_credentials"},
+        )
+        body = response.json()
+        self.assertEqual(body["body"], "grant_type=client_credentials")
+        self.assertEqual(body["content_type"], "application/x-www-form-urlencoded")
+
+    def test_post_sends_string_body(self):
+        response = self.transport.request(
+            "POST", self.url + "/v1/me", data='{"a": 1}',
+            headers={"Content-Type": "application/json"}, timeout=(5, 5),
+        )
+        self.assertEqual(response.json()["body"], '{"a": 1}')
+
+    def test_error_status_is_returned(self):
+        response = self.transport.request("GET", self.url + "/v1/me", params={"status": 404})
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.headers["content-type"], "application/json")
+        self.assertIn("/v1/me", response.text)
+
+    def test_client(self):
+        sp = Spotify(auth="TOKEN", transport=self.transport)
+        sp.prefix = self.url + "/v1/"
+        self.assertEqual(sp.track("abc")["path"], "/v1/tracks/abc")
+
+
+class RequestsTransportTest(TransportTestMixin, unittest.TestCase):
+
+    def make_transport(self):
+        return RequestsTransport()
+
+
+class Urllib3TransportTest(TransportTestMixin, unittest.TestCase):
+
+    def make_transport(self):
+        return Urllib3Transport()
+
+
+@unittest.skipIf(httpx is None, "httpx is not installed")
+class HTTPXTransportTest(TransportTestMixin, unittest.TestCase):
+
+    def make_transport(self):
+        return HTTPXTransport()
+
+
+@unittest.skipIf(httpx is None or h2 is None, "httpx or h2 is not installed")
+class HTTP2TransportTest(TransportTestMixin, unittest.TestCase):
+    """ Without TLS to negotiate HTTP/2 with, requests fall back to HTTP/1.1 """
+
+    def make_transport(self):
+        return HTTPXTransport(http2=True)
+
+
+class FakeResponse:
+
+    def __init__(self, status_code, body=None, headers=None):
+        self.status_code = status_code
+        self.content = json.dumps(body).encode() if body is not None else b""
+        self.headers = headers or {}
+        self.url = "https://api.spotify.com/v1/artists/abc"
+
+    @property
+    def text(self):
+        return self.content.decode()
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class FakeTransport(Transport):
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def request(self, method, url, **kwargs):
+        self.requests.append((method, url, kwargs))
+        return self.responses.pop(0)
+
+
+class ClientRetryTest(unittest.TestCase):
+
+    def test_retries_bad_status_codes(self):
+        transport = FakeTransport(
+            FakeResponse(503, headers={"Retry-After": "0"}),
+            FakeResponse(200, {"id": "abc"}),
+        )
+        sp = Spotify(auth="TOKEN", transport=transport, backoff_factor=0)
+
+        self.assertEqual(sp.artist("abc"), {"id": "abc"})
+        self.assertEqual(len(transport.requests), 2)
+        method, url, kwargs = transport.requests[0]
+        self.assertEqual(url, "https://api.spotify.com/v1/artists/abc")
+        self.assertEqual(kwargs["headers"]["Authorization"], "Bearer TOKEN")
+        self.assertEqual(kwargs["timeout"], 5)
+
+    def test_max_retries(self):
+        transport = FakeTransport(*(FakeResponse(500) for _ in range(3)))
+        sp = Spotify(auth="TOKEN", transport=transport, status_retries=2, backoff_factor=0)
+
+        with self.assertRaises(SpotifyException) as error:
+            sp.artist("abc")
+
+        self.assertEqual(error.exception.http_status, 429)
+        self.assertIn("Max Retries", error.exception.msg)
+        self.assertEqual(transport.responses, [])
+
+    def test_maps_errors(self):
+        transport = FakeTransport(
+            FakeResponse(404, {"error": {"message": "Non existing id", "reason": "NOPE"}})
+        )
+        sp = Spotify(auth="TOKEN", transport=transport)
+
+        with self.assertRaises(SpotifyException) as error:
+            sp.artist("abc")
+
+        self.assertEqual(error.exception.http_status, 404)
+        self.assertEqual(error.exception.reason, "NOPE")
+
+    def test_default_session_leaves_retries_to_the_client(self):
+        sp = Spotify(auth="TOKEN")
+        retry = sp._session.get_adapter("https://").max_retries
+
+        self.assertEqual(retry.total, 0)
+        self.assertFalse(retry.is_retry("GET", 503, True))
+
+    def test_sessions_passed_in_keep_their_retry_policy(self):
+        session = requests.Session()
+        for requests_session in [session, False]:
+            sp = Spotify(auth="TOKEN", requests_session=requests_session)
+            target = session if requests_session else requests.api
+            with mock.patch.object(target, "request", return_value=FakeResponse(503)) as request:
+                with self.assertRaises(SpotifyException) as error:
+                    sp.artist("abc")
+
+            self.assertEqual(error.exception.http_status, 503)
+            self.assertEqual(request.call_count, 1)
+
+
+class AuthManagerTransportTest(unittest.TestCase):
+
+    def test_token_request(self):
+        transport = FakeTransport(
+            FakeResponse(200, {"access_token": "ACCESS", "expires_in": 3600})
+        )
+        creds = SpotifyClientCredentials(
+            "ID", "SECRET", transport=transport, cache_handler=MemoryCacheHandler()
+        )
+
+        self.assertEqual(creds.get_access_token(as_dict=False), "ACCESS")
+        method, url, kwargs = transport.requests[0]
+        self.assertEqual((method, url), ("POST", creds.OAUTH_TOKEN_URL))
+        self.assertEqual(kwargs["data"], {"grant_type": "client_credentials"})
+
+    def test_error_response(self):
+        transport = FakeTransport(FakeResponse(400, {"error": "invalid_client"}))
+        creds = SpotifyClientCredentials(
+            "ID", "SECRET", transport=transport, cache_handler=MemoryCacheHandler()
+        )
+
+        with self.assertRaises(SpotifyOauthError) as error:
+            creds.get_access_token(check_cache=False)
+        self.assertEqual(error.exception.error, "invalid_client")
+
+
+class MergeParamsTest(unittest.TestCase):
+
+    def test_merge_params(self):
+        self.assertEqual(merge_params("https://x/a", None), "https://x/a")
+        self.assertEqual(merge_params("https://x/a", {"b": None}), "https://x/a")
+        self.assertEqual(merge_params("https://x/a?b=1", {"c": 2}), "https://x/a?b=1&c=2")